@@ -23,8 +23,9 @@ from starlette.responses import HTMLResponse
 
 from api import middleware
 from api.scheduler import setup_scheduler
-from db import crud, database, schemas
+from db import catalog_index, crud, database, schemas
 from db.config import settings
+from db.local_cache import local_cache
 from db.redis_database import REDIS_ASYNC_CLIENT
 from db.schemas import SortingOption
 from kodi.routes import kodi_router
@@ -42,7 +43,7 @@ from utils.lock import (
     release_scheduler_lock,
 )
 from utils.network import get_request_namespace, get_user_public_ip, get_user_data
-from utils.parser import generate_manifest
+from utils.parser import generate_manifest, render_streams_json
 from utils.runtime_const import (
     DELETE_ALL_META,
     DELETE_ALL_META_ITEM,
@@ -66,6 +67,7 @@ async def lifespan(_: FastAPI):
     # Startup logic
     await database.init()
     await torrent.init_best_trackers()
+    local_cache_listener = asyncio.create_task(local_cache.listen_for_invalidations())
     scheduler = None
     scheduler_lock = None
 
@@ -92,6 +94,7 @@ async def lifespan(_: FastAPI):
         finally:
             await release_scheduler_lock(scheduler_lock)
 
+    local_cache_listener.cancel()
     await REDIS_ASYNC_CLIENT.aclose()
 
 
@@ -159,6 +162,8 @@ async def configure(
     secret_str: str = None,
 ):
     response.headers.update(const.NO_CACHE_HEADERS)
+    # The middleware shares UserData between requests, mask secrets on a copy
+    user_data = user_data.model_copy(deep=True)
 
     configured_fields = []
     mdblist_configured_lists = []
@@ -354,16 +359,27 @@ async def get_catalog(
             raise HTTPException(404, "MDBList ID not found.")
         cache_key += f"_{list_config.sort}_{list_config.order}"
 
+    # Materialised catalogs are read fresh from the catalog index
+    is_page_cached = cache_key and not catalog_index.is_materialized(
+        catalog_type, catalog_id
+    )
     if cache_key:
         response.headers.update(const.CACHE_HEADERS)
-        if cached_data := await REDIS_ASYNC_CLIENT.get(cache_key):
+    else:
+        response.headers.update(const.NO_CACHE_HEADERS)
+
+    if is_page_cached:
+        cached_data = local_cache.get(cache_key)
+        if cached_data is None:
+            cached_data = await REDIS_ASYNC_CLIENT.get(cache_key)
+            if cached_data:
+                local_cache.set(cache_key, cached_data, len(cached_data))
+        if cached_data:
             try:
                 metas = schemas.Metas.model_validate_json(cached_data)
                 return await update_rpdb_posters(metas, user_data, catalog_type)
             except ValidationError:
                 pass
-    else:
-        response.headers.update(const.NO_CACHE_HEADERS)
 
     metas = await fetch_metas(
         catalog_type,
@@ -377,7 +393,7 @@ async def get_catalog(
         background_tasks,
     )
 
-    if cache_key:
+    if is_page_cached:
         await REDIS_ASYNC_CLIENT.set(
             cache_key,
             metas.model_dump_json(exclude_none=True, by_alias=True),
@@ -679,7 +695,12 @@ async def get_streams(
             video_id, get_request_namespace(request), user_data
         )
 
-    return {"streams": fetched_streams}
+    # Torrent streams are already rendered to JSON, skip the response model
+    return Response(
+        content=render_streams_json(fetched_streams),
+        media_type="application/json",
+        headers=response.headers,
+    )
 
 
 @app.post("/encrypt-user-data", tags=["user_data"])
@@ -14,12 +14,14 @@ from apscheduler.triggers.cron import CronTrigger
 from dramatiq.middleware import Retries as OriginalRetries, Shutdown, SkipMessage
 from fastapi.requests import Request
 from fastapi.responses import Response
+from prometheus_client import Counter
 from pydantic import ValidationError
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 from starlette.routing import Match
 
 from db.config import settings
+from db.local_cache import LocalCache
 from db.redis_database import REDIS_SYNC_CLIENT, REDIS_ASYNC_CLIENT
 from db.schemas import UserData
 from utils import const
@@ -62,13 +64,68 @@ class SecureLoggingMiddleware(BaseHTTPMiddleware):
         )
 
 
+# A secret_str always decodes to the same config (updates mint a new one), so
+# the validated UserData can be shared until it expires. Endpoints must copy it
+# before modifying it.
+user_data_cache = LocalCache(
+    "user_data",
+    max_bytes=settings.user_data_cache_max_bytes,
+    ttl=settings.user_data_cache_ttl,
+    require_listener=False,
+)
+user_data_cache_saved_seconds = Counter(
+    "user_data_cache_saved_seconds_total",
+    "Estimated middleware time saved by the decrypted UserData cache",
+)
+
+
+class UserDataDecryptTimer:
+    """Moving average of the cost of decrypting & validating a secret_str."""
+
+    def __init__(self, smoothing: float = 0.1):
+        self.smoothing = smoothing
+        self.average = 0.0
+        self.saved_seconds = 0.0
+
+    def record(self, seconds: float):
+        if not self.average:
+            self.average = seconds
+        else:
+            self.average += self.smoothing * (seconds - self.average)
+
+    def record_hit(self):
+        self.saved_seconds += self.average
+        user_data_cache_saved_seconds.inc(self.average)
+
+
+user_data_decrypt_timer = UserDataDecryptTimer()
+
+
+async def get_user_data_from_secret(secret_str: str | None) -> UserData:
+    if not secret_str:
+        return await crypto_utils.decrypt_user_data(secret_str)
+
+    cache_key = hashlib.blake2b(secret_str.encode(), digest_size=16).hexdigest()
+    user_data = user_data_cache.get(cache_key)
+    if user_data is not None:
+        user_data_decrypt_timer.record_hit()
+        return user_data
+
+    start_time = time.perf_counter()
+    user_data = await crypto_utils.decrypt_user_data(secret_str)
+    user_data_decrypt_timer.record(time.perf_counter() - start_time)
+    # Rough in-memory size of a validated UserData
+    user_data_cache.set(cache_key, user_data, len(secret_str) * 4 + 2048)
+    return user_data
+
+
 class UserDataMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: Callable):
         endpoint = await find_route_handler(request.app, request)
         secret_str = request.path_params.get("secret_str")
         # Decrypt and parse the UserData from secret_str
         try:
-            user_data = await crypto_utils.decrypt_user_data(secret_str)
+            user_data = await get_user_data_from_secret(secret_str)
         except (ValueError, ValidationError):
             # check if the endpoint is for /streams
             if endpoint and endpoint.__name__ == "get_streams":
@@ -1,6 +1,7 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from db.catalog_stats import reconcile_catalog_stats
 from db.config import settings
 from mediafusion_scrapy.task import run_spider
 from scrapers.background_scraper import run_background_search
@@ -230,6 +231,15 @@ def setup_scheduler(scheduler: AsyncIOScheduler):
         },
     )
 
+    scheduler.add_job(
+        reconcile_catalog_stats.send,
+        CronTrigger.from_crontab(settings.reconcile_catalog_stats_crontab),
+        name="reconcile_catalog_stats",
+        kwargs={
+            "crontab_expression": settings.reconcile_catalog_stats_crontab,
+        },
+    )
+
     scheduler.add_job(
         run_background_search.send,
         CronTrigger.from_crontab(settings.background_search_crontab),
@@ -1,6 +1,6 @@
 import asyncio
 
-from db import database
+from db import catalog_index, catalog_stats, database, episode_organizer
 
 from utils import torrent
 
@@ -0,0 +1,127 @@
+"""
+Benchmark the debrid cache layouts.
+
+Fills a scratch service with random info hashes in both the legacy hash and
+the compact bucketed layout, then reports Redis memory per million hashes and
+the lookup latency of 500 hash batches (half of them cached).
+
+Usage: python -m benchmarks.debrid_cache [--hashes 1000000] [--rounds 200]
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+from benchmarks.stream_cache import get_arg
+from db.redis_database import REDIS_ASYNC_CLIENT
+from streaming_providers import cache_helpers
+from streaming_providers.compact_cache import (
+    KEY_PREFIX,
+    compact_debrid_cache,
+    current_day,
+)
+
+SERVICE = "benchmark"
+BATCH_SIZE = 500
+WRITE_CHUNK_SIZE = 10000
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+async def used_memory() -> int:
+    return (await REDIS_ASYNC_CLIENT.info("memory"))["used_memory"]
+
+
+async def clear_benchmark_keys():
+    await REDIS_ASYNC_CLIENT.delete(f"{cache_helpers.CACHE_KEY_PREFIX}{SERVICE}")
+    async for key in REDIS_ASYNC_CLIENT.scan_iter(
+        f"{KEY_PREFIX}{SERVICE}:*", count=10000
+    ):
+        await REDIS_ASYNC_CLIENT.unlink(key)
+    await REDIS_ASYNC_CLIENT.srem(f"{KEY_PREFIX}services", SERVICE)
+
+
+async def fill_legacy(info_hashes: list[str]):
+    timestamp = int(time.time()) + cache_helpers.EXPIRY_DAYS * 86400
+    for start in range(0, len(info_hashes), WRITE_CHUNK_SIZE):
+        await REDIS_ASYNC_CLIENT.hset(
+            f"{cache_helpers.CACHE_KEY_PREFIX}{SERVICE}",
+            mapping={
+                info_hash: timestamp
+                for info_hash in info_hashes[start : start + WRITE_CHUNK_SIZE]
+            },
+        )
+
+
+async def fill_compact(info_hashes: list[str]):
+    expiry_day = current_day() + cache_helpers.EXPIRY_DAYS
+    for start in range(0, len(info_hashes), WRITE_CHUNK_SIZE):
+        await compact_debrid_cache.store(
+            SERVICE,
+            {
+                info_hash: expiry_day
+                for info_hash in info_hashes[start : start + WRITE_CHUNK_SIZE]
+            },
+        )
+
+
+async def time_lookups(lookup, batches: list[list[str]]) -> list[float]:
+    timings = []
+    for batch in batches:
+        start = time.perf_counter()
+        await lookup(SERVICE, batch)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def benchmark_layout(name, fill, lookup, info_hashes, batches) -> dict:
+    await clear_benchmark_keys()
+    before = await used_memory()
+    await fill(info_hashes)
+    memory = await used_memory() - before
+    timings = await time_lookups(lookup, batches)
+    await clear_benchmark_keys()
+    return {
+        "layout": name,
+        "bytes_per_million": memory * 1_000_000 / len(info_hashes),
+        "median_ms": statistics.median(timings),
+        "p95_ms": statistics.quantiles(timings, n=20)[-1],
+    }
+
+
+async def legacy_lookup(service: str, info_hashes: list[str]):
+    # Mirror the legacy HMGET path without touching the layout setting
+    return await REDIS_ASYNC_CLIENT.hmget(
+        f"{cache_helpers.CACHE_KEY_PREFIX}{service}", info_hashes
+    )
+
+
+async def main(total_hashes: int, rounds: int):
+    info_hashes = [os.urandom(20).hex() for _ in range(total_hashes)]
+    batches = [
+        [
+            *(info_hashes[(i * BATCH_SIZE + j) % total_hashes] for j in range(250)),
+            *(os.urandom(20).hex() for _ in range(BATCH_SIZE - 250)),
+        ]
+        for i in range(rounds)
+    ]
+
+    for name, fill, lookup in (
+        ("legacy", fill_legacy, legacy_lookup),
+        ("compact", fill_compact, compact_debrid_cache.get_status),
+    ):
+        result = await benchmark_layout(name, fill, lookup, info_hashes, batches)
+        logger.info(
+            "%(layout)s: %(bytes_per_million).0f bytes per million hashes, "
+            "500 hash lookup median %(median_ms).2fms p95 %(p95_ms).2fms",
+            result,
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(get_arg("--hashes", 1_000_000), get_arg("--rounds", 200)))
@@ -0,0 +1,116 @@
+"""
+Benchmark the torrent stream cache formats.
+
+Compares the legacy TorrentStreamsList JSON payload with the compact stream
+snapshot for the titles with the most streams: decode time per request and
+Redis memory per cached title.
+
+Usage: python -m benchmarks.stream_cache [--titles 20] [--rounds 50]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+from db import database
+from db.models import MediaFusionMetaData, TorrentStreams
+from db.redis_database import REDIS_ASYNC_CLIENT
+from db.schemas import TorrentStreamsList
+from db.stream_snapshot import decode_streams_snapshot, encode_streams_snapshot
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def get_arg(name: str, default: int) -> int:
+    if name in sys.argv:
+        return int(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def time_decode(decode, payload, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        decode(payload)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+async def redis_memory_usage(key: str, payload: bytes | str) -> int:
+    await REDIS_ASYNC_CLIENT.set(key, payload, ex=60)
+    usage = await REDIS_ASYNC_CLIENT.memory_usage(key)
+    await REDIS_ASYNC_CLIENT.delete(key)
+    return usage or 0
+
+
+async def benchmark_title(meta_id: str, rounds: int) -> dict:
+    streams = await TorrentStreams.find(
+        {"meta_id": meta_id, "is_blocked": False}
+    ).to_list()
+
+    json_payload = TorrentStreamsList(streams=streams).model_dump_json(
+        exclude_none=True, exclude={"streams": {"__all__": {"torrent_file"}}}
+    )
+    snapshot_payload = encode_streams_snapshot(streams)
+
+    return {
+        "meta_id": meta_id,
+        "streams": len(streams),
+        "json_decode_ms": time_decode(
+            TorrentStreamsList.model_validate_json, json_payload, rounds
+        ),
+        "snapshot_decode_ms": time_decode(
+            decode_streams_snapshot, snapshot_payload, rounds
+        ),
+        "json_redis_bytes": await redis_memory_usage(
+            f"benchmark:json:{meta_id}", json_payload
+        ),
+        "snapshot_redis_bytes": await redis_memory_usage(
+            f"benchmark:snapshot:{meta_id}", snapshot_payload
+        ),
+    }
+
+
+async def main(titles: int, rounds: int):
+    await database.init()
+    top_titles = (
+        await MediaFusionMetaData.get_motor_collection()
+        .find({"type": {"$in": ["movie", "series"]}}, {"_id": 1})
+        .sort("total_streams", -1)
+        .limit(titles)
+        .to_list(None)
+    )
+
+    results = []
+    for title in top_titles:
+        result = await benchmark_title(title["_id"], rounds)
+        results.append(result)
+        logger.info(
+            "%(meta_id)s (%(streams)d streams): decode %(json_decode_ms).2fms -> "
+            "%(snapshot_decode_ms).2fms, redis %(json_redis_bytes)d -> "
+            "%(snapshot_redis_bytes)d bytes",
+            result,
+        )
+
+    if not results:
+        logger.warning("No titles found to benchmark")
+        return
+
+    for metric in (
+        "json_decode_ms",
+        "snapshot_decode_ms",
+        "json_redis_bytes",
+        "snapshot_redis_bytes",
+    ):
+        logger.info(
+            "%s: median %.2f",
+            metric,
+            statistics.median(result[metric] for result in results),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(get_arg("--titles", 20), get_arg("--rounds", 50)))
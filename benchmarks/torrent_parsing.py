@@ -0,0 +1,103 @@
+"""
+Benchmark torrent file parsing.
+
+Parses every .torrent file of a corpus directory and reports parses per
+second for the info hash alone (bencodepy decode and re-encode versus the
+single pass decoder) and for the full extract_torrent_metadata, inline and
+through the torrent parsing process pool.
+
+Usage: python -m benchmarks.torrent_parsing --corpus path/to/torrents
+    [--rounds 5] [--workers 4]
+"""
+
+import asyncio
+import hashlib
+import logging
+import sys
+import time
+from pathlib import Path
+
+import bencodepy
+
+from benchmarks.stream_cache import get_arg
+from db.config import settings
+from utils import torrent
+from utils.bencode import decode_torrent
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def legacy_info_hash(content: bytes) -> str:
+    info = bencodepy.decode(content)[b"info"]
+    return hashlib.sha1(bencodepy.encode(info)).hexdigest()
+
+
+def single_pass_info_hash(content: bytes) -> str:
+    return decode_torrent(content)[1]
+
+
+def time_inline(parse, corpus: list[bytes], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content in corpus:
+            parse(content)
+    return rounds * len(corpus) / (time.perf_counter() - start)
+
+
+async def time_pool(corpus: list[bytes], rounds: int) -> float:
+    # Warm up the worker processes before timing
+    await asyncio.gather(
+        *(torrent.extract_torrent_metadata_async(content) for content in corpus)
+    )
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(
+            *(torrent.extract_torrent_metadata_async(content) for content in corpus)
+        )
+    return rounds * len(corpus) / (time.perf_counter() - start)
+
+
+async def main(corpus_dir: Path, rounds: int, workers: int):
+    corpus = [path.read_bytes() for path in sorted(corpus_dir.glob("*.torrent"))]
+    if not corpus:
+        logger.error("No .torrent files found in %s", corpus_dir)
+        return
+    logger.info("Loaded %s torrent files from %s", len(corpus), corpus_dir)
+
+    mismatches = sum(
+        legacy_info_hash(content) != single_pass_info_hash(content)
+        for content in corpus
+    )
+    if mismatches:
+        # Non canonical torrents, re-encoding changes their info bytes
+        logger.warning("%s torrents hash differently after re-encoding", mismatches)
+
+    for name, parse in (
+        ("info hash, bencodepy", legacy_info_hash),
+        ("info hash, single pass", single_pass_info_hash),
+        ("metadata, inline", torrent.extract_torrent_metadata),
+    ):
+        logger.info("%s: %.1f parses/sec", name, time_inline(parse, corpus, rounds))
+
+    settings.torrent_parse_workers = workers
+    logger.info(
+        "metadata, %s process pool workers: %.1f parses/sec",
+        workers,
+        await time_pool(corpus, rounds),
+    )
+    torrent.get_parse_executor().shutdown()
+
+
+if __name__ == "__main__":
+    if "--corpus" not in sys.argv:
+        sys.exit(__doc__)
+    asyncio.run(
+        main(
+            Path(sys.argv[sys.argv.index("--corpus") + 1]),
+            get_arg("--rounds", 5),
+            get_arg("--workers", 4),
+        )
+    )
@@ -0,0 +1,340 @@
+"""
+Materialised movie and series catalogs.
+
+Every catalog keeps an ordered list of its titles in a Redis ZSET scored by
+the catalog's `last_stream_added`. The ZSETs are updated incrementally with
+the catalog stats when streams are inserted, removed or blocked, and rebuilt
+from the metadata collection by the nightly catalog stats reconciliation.
+Titles updated while a rebuild runs are recorded and replayed on the rebuilt
+ZSETs once they are swapped in.
+
+Catalog pages are range reads of the ZSET, hydrated with a batched `$in`
+lookup that applies the genre and parental filters. Stremio paginates with
+`skip`, so the position after each served page is stored as a keyset cursor
+for the next page. Pages without a cursor skip the first `skip` matching
+titles of the ZSET. Titles with the same score are ordered by descending id,
+the order of the aggregation used while the index is not ready.
+"""
+
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable
+
+import dramatiq
+from prometheus_client import Counter
+
+from db.config import settings
+from db.models import MediaFusionMetaData
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+KEY_PREFIX = "catalog_index:"
+READY_KEY = f"{KEY_PREFIX}ready"
+REBUILD_LOCK_KEY = f"{KEY_PREFIX}rebuild_lock"
+REBUILD_TOUCHED_KEY = f"{KEY_PREFIX}rebuild_touched"
+REBUILD_STALE_KEY = f"{KEY_PREFIX}rebuild_stale"
+REBUILD_TIMEOUT = 60 * 60
+CURSOR_TTL = 3600
+SCAN_CHUNK_SIZE = 200
+MAX_SCAN_CHUNKS = 10
+MAX_SKIP_CHUNKS = 50
+CATALOG_TYPES = ("movie", "series")
+
+catalog_index_pages = Counter(
+    "catalog_index_pages_total",
+    "Catalog pages requested from the catalog index, labeled by result",
+    labelnames=["result"],
+)
+
+
+def get_key(catalog_type: str, catalog: str) -> str:
+    return f"{KEY_PREFIX}{catalog_type}:{catalog}"
+
+
+def get_cursor_key(match_filter: dict, skip: int) -> str:
+    # The filter covers the catalog, genre and parental filter combination
+    scope = hashlib.md5(
+        json.dumps(match_filter, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{KEY_PREFIX}cursor:{scope}:{skip}"
+
+
+def get_score(last_stream_added: datetime) -> float:
+    # Mongo returns naive UTC datetimes
+    if last_stream_added.tzinfo is None:
+        last_stream_added = last_stream_added.replace(tzinfo=timezone.utc)
+    return last_stream_added.timestamp()
+
+
+def is_materialized(catalog_type: str, catalog_id: str) -> bool:
+    """Whether pages of a catalog are served from the catalog index"""
+    return (
+        settings.catalog_materialization_enabled
+        and catalog_type in CATALOG_TYPES
+        and not catalog_id.startswith("mdblist")
+        and "_watchlist_" not in catalog_id
+    )
+
+
+async def update_titles(
+    meta_ids: Iterable[str], stale_catalogs: dict[str, set[str]] | None = None
+):
+    """
+    Sync the catalog positions of titles with their current catalog stats.
+    `stale_catalogs` lists catalogs per title that may have lost their last
+    stream, these are removed when the title has no streams left in them.
+    """
+    meta_ids = list(meta_ids)
+    if not settings.catalog_materialization_enabled or not meta_ids:
+        return
+    stale_catalogs = stale_catalogs or {}
+
+    try:
+        is_rebuilding = await REDIS_ASYNC_CLIENT.exists(REBUILD_LOCK_KEY)
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            if is_rebuilding:
+                # The rebuild swaps in its own ZSETs, these updates are
+                # replayed on top of them
+                pipe.sadd(REBUILD_TOUCHED_KEY, *meta_ids)
+                pipe.expire(REBUILD_TOUCHED_KEY, REBUILD_TIMEOUT * 2)
+                stale_members = [
+                    json.dumps([meta_id, catalog])
+                    for meta_id, catalogs in stale_catalogs.items()
+                    for catalog in catalogs
+                ]
+                if stale_members:
+                    pipe.sadd(REBUILD_STALE_KEY, *stale_members)
+                    pipe.expire(REBUILD_STALE_KEY, REBUILD_TIMEOUT * 2)
+            async for meta in MediaFusionMetaData.get_motor_collection().find(
+                {"_id": {"$in": meta_ids}, "type": {"$in": CATALOG_TYPES}},
+                projection={"type": 1, "catalog_stats": 1},
+            ):
+                active_catalogs = set()
+                for stat in meta.get("catalog_stats") or []:
+                    if not stat.get("total_streams") or not stat.get(
+                        "last_stream_added"
+                    ):
+                        continue
+                    active_catalogs.add(stat["catalog"])
+                    pipe.zadd(
+                        get_key(meta["type"], stat["catalog"]),
+                        {meta["_id"]: get_score(stat["last_stream_added"])},
+                    )
+                for catalog in stale_catalogs.get(meta["_id"], set()) - active_catalogs:
+                    pipe.zrem(get_key(meta["type"], catalog), meta["_id"])
+            await pipe.execute()
+    except Exception as e:
+        logging.error(f"Error updating catalog index: {e}")
+
+
+async def get_start_rank(key: str, cursor: list) -> int:
+    score, meta_id = cursor
+    if await REDIS_ASYNC_CLIENT.zscore(key, meta_id) == score:
+        rank = await REDIS_ASYNC_CLIENT.zrevrank(key, meta_id)
+        if rank is not None:
+            return rank + 1
+    # The title moved or left the catalog, resume after its previous score
+    return await REDIS_ASYNC_CLIENT.zcount(key, f"({score}", "+inf")
+
+
+async def skip_titles(key: str, match_filter: dict, skip: int) -> int | None:
+    """
+    Rank after the first `skip` titles of the catalog that match the filter,
+    or None when they are too far down the catalog.
+    """
+    position = 0
+    for _ in range(MAX_SKIP_CHUNKS):
+        entries = await REDIS_ASYNC_CLIENT.zrevrange(
+            key, position, position + SCAN_CHUNK_SIZE - 1
+        )
+        if not entries:
+            return position
+        meta_ids = [meta_id.decode() for meta_id in entries]
+        matches = {
+            meta["_id"]
+            async for meta in MediaFusionMetaData.get_motor_collection().find(
+                {**match_filter, "_id": {"$in": meta_ids}}, projection={"_id": 1}
+            )
+        }
+        for meta_id in meta_ids:
+            position += 1
+            if meta_id in matches:
+                skip -= 1
+                if not skip:
+                    return position
+        if len(entries) < SCAN_CHUNK_SIZE:
+            return position
+    return None
+
+
+async def hydrate(meta_ids: list[str], match_filter: dict, poster_path: str) -> dict:
+    pipeline = [
+        {"$match": {**match_filter, "_id": {"$in": meta_ids}}},
+        {"$set": {"poster": {"$concat": [poster_path, "$_id", ".jpg"]}}},
+    ]
+    return {
+        meta["_id"]: meta
+        async for meta in MediaFusionMetaData.get_motor_collection().aggregate(pipeline)
+    }
+
+
+async def get_page(
+    catalog_type: str,
+    catalog: str,
+    match_filter: dict,
+    skip: int,
+    limit: int,
+    poster_path: str,
+) -> list[dict] | None:
+    """
+    Metadata documents of a catalog page in catalog order, or None when the
+    page can't be served from the index.
+    """
+    if not await REDIS_ASYNC_CLIENT.exists(READY_KEY):
+        await schedule_rebuild()
+        catalog_index_pages.labels(result="not_ready").inc()
+        return None
+
+    key = get_key(catalog_type, catalog)
+    position = 0
+    result = "hit"
+    if skip:
+        cursor = await REDIS_ASYNC_CLIENT.get(get_cursor_key(match_filter, skip))
+        if cursor:
+            position = await get_start_rank(key, json.loads(cursor))
+        else:
+            position = await skip_titles(key, match_filter, skip)
+            result = "no_cursor"
+            if position is None:
+                catalog_index_pages.labels(result="scan_limit").inc()
+                return None
+
+    page = []
+    last_entry = None
+    for _ in range(MAX_SCAN_CHUNKS):
+        entries = await REDIS_ASYNC_CLIENT.zrevrange(
+            key, position, position + SCAN_CHUNK_SIZE - 1, withscores=True
+        )
+        if not entries:
+            break
+        metas = await hydrate(
+            [meta_id.decode() for meta_id, _ in entries], match_filter, poster_path
+        )
+        for meta_id, score in entries:
+            position += 1
+            if meta := metas.get(meta_id.decode()):
+                page.append(meta)
+                last_entry = [score, meta["_id"]]
+                if len(page) == limit:
+                    break
+        if len(page) == limit or len(entries) < SCAN_CHUNK_SIZE:
+            break
+    else:
+        # Filters too selective for this catalog, let the aggregation handle it
+        catalog_index_pages.labels(result="scan_limit").inc()
+        return None
+
+    if last_entry:
+        await REDIS_ASYNC_CLIENT.set(
+            get_cursor_key(match_filter, skip + len(page)),
+            json.dumps(last_entry),
+            ex=CURSOR_TTL,
+        )
+    catalog_index_pages.labels(result=result).inc()
+    return page
+
+
+async def store_cursor(
+    catalog_type: str, catalog: str, match_filter: dict, skip: int, meta_id: str
+):
+    """Store the cursor after a page served by the aggregation"""
+    score = await REDIS_ASYNC_CLIENT.zscore(get_key(catalog_type, catalog), meta_id)
+    if score is not None:
+        await REDIS_ASYNC_CLIENT.set(
+            get_cursor_key(match_filter, skip),
+            json.dumps([score, meta_id]),
+            ex=CURSOR_TTL,
+        )
+
+
+async def schedule_rebuild():
+    if await REDIS_ASYNC_CLIENT.set(REBUILD_LOCK_KEY, 1, nx=True, ex=REBUILD_TIMEOUT):
+        rebuild_catalog_index.send()
+
+
+async def replay_rebuild_updates():
+    """Apply the title updates made while the rebuild ran to the new ZSETs"""
+    async with REDIS_ASYNC_CLIENT.pipeline(transaction=True) as pipe:
+        pipe.smembers(REBUILD_TOUCHED_KEY)
+        pipe.smembers(REBUILD_STALE_KEY)
+        pipe.delete(REBUILD_TOUCHED_KEY, REBUILD_STALE_KEY)
+        touched_ids, stale_members, _ = await pipe.execute()
+
+    stale_catalogs = defaultdict(set)
+    for member in stale_members:
+        meta_id, catalog = json.loads(member)
+        stale_catalogs[meta_id].add(catalog)
+    await update_titles((meta_id.decode() for meta_id in touched_ids), stale_catalogs)
+    if touched_ids:
+        logging.info(
+            "Replayed %s catalog index updates made during the rebuild",
+            len(touched_ids),
+        )
+
+
+@dramatiq.actor(
+    time_limit=60 * 60 * 1000,  # 60 minutes
+    priority=10,
+)
+async def rebuild_catalog_index(batch_size: int = 1000, **kwargs):
+    """Rebuild the catalog ZSETs from the catalog stats of all titles"""
+    logging.info("Rebuilding catalog index")
+    # Held for the whole rebuild, also when the actor was sent directly
+    await REDIS_ASYNC_CLIENT.set(REBUILD_LOCK_KEY, 1, ex=REBUILD_TIMEOUT)
+    cursor = MediaFusionMetaData.get_motor_collection().find(
+        {"type": {"$in": CATALOG_TYPES}, "catalog_stats.total_streams": {"$gt": 0}},
+        projection={"type": 1, "catalog_stats": 1},
+    )
+
+    keys = set()
+    titles = 0
+    try:
+        while batch := await cursor.to_list(batch_size):
+            async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+                for meta in batch:
+                    for stat in meta.get("catalog_stats") or []:
+                        if not stat.get("total_streams") or not stat.get(
+                            "last_stream_added"
+                        ):
+                            continue
+                        key = get_key(meta["type"], stat["catalog"])
+                        keys.add(key)
+                        pipe.zadd(
+                            f"{key}:rebuild",
+                            {meta["_id"]: get_score(stat["last_stream_added"])},
+                        )
+                await pipe.execute()
+            titles += len(batch)
+
+        # Swap in the rebuilt catalogs and drop the ones without titles left
+        existing_keys = {
+            key.decode()
+            async for key in REDIS_ASYNC_CLIENT.scan_iter(
+                match=f"{KEY_PREFIX}*:*", count=1000
+            )
+            if key.decode().count(":") == 2
+        }
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=True) as pipe:
+            for key in keys:
+                pipe.rename(f"{key}:rebuild", key)
+            for key in existing_keys - keys:
+                pipe.delete(key)
+            pipe.set(READY_KEY, 1)
+            await pipe.execute()
+    finally:
+        await REDIS_ASYNC_CLIENT.delete(REBUILD_LOCK_KEY)
+        await replay_rebuild_updates()
+
+    logging.info("Catalog index rebuilt: %s titles in %s catalogs", titles, len(keys))
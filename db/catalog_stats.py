@@ -0,0 +1,325 @@
+"""
+Batched maintenance of the stream statistics stored on metadata documents:
+total_streams, last_stream_added, catalog_stats and the series episode list.
+
+Inserted streams are folded into per meta_id / catalog deltas, removed streams
+trigger a recount of the affected titles, and everything is flushed to the
+metadata collection with a single bulk_write. A periodic reconciliation job
+recomputes the statistics from TorrentStreams to correct any drift.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable
+
+import dramatiq
+from pymongo import UpdateOne
+
+from db import catalog_index
+from db.config import settings
+from db.models import (
+    MediaFusionMetaData,
+    MediaFusionSeriesMetaData,
+    SeriesEpisode,
+    TorrentStreams,
+)
+
+
+class CatalogStatsBatch:
+    """
+    Accumulates stream inserts and removals and applies the resulting metadata
+    updates in one round trip on flush().
+    """
+
+    def __init__(self):
+        self._added: dict[str, list[TorrentStreams]] = defaultdict(list)
+        self._removed: dict[str, set[str]] = defaultdict(set)
+        self._removed_catalogs: dict[str, set[str]] = defaultdict(set)
+        self._episode_updates: dict[str, list[TorrentStreams]] = defaultdict(list)
+        self._organized_stream_ids: set[str] = set()
+
+    def add(self, stream: TorrentStreams, organized: bool = False):
+        """
+        Add a new stream. The series episodes of `organized` streams are
+        numbered and pushed by the episode organizer.
+        """
+        self._added[stream.meta_id].append(stream)
+        if organized:
+            self._organized_stream_ids.add(stream.id)
+
+    def add_episodes(self, stream: TorrentStreams):
+        """Sync the series episodes of an existing stream with new episode files."""
+        self._episode_updates[stream.meta_id].append(stream)
+
+    def remove(self, stream: TorrentStreams):
+        self._removed[stream.meta_id].add(stream.id)
+        self._removed_catalogs[stream.meta_id].update(stream.catalog or [])
+
+    async def flush(self):
+        if not self._added and not self._removed and not self._episode_updates:
+            return
+
+        operations = []
+        removed_stream_ids = set().union(*self._removed.values())
+        if self._removed:
+            stats = await compute_stream_stats(
+                list(self._removed), excluded_stream_ids=removed_stream_ids
+            )
+            operations.extend(
+                UpdateOne({"_id": meta_id}, {"$set": meta_stats})
+                for meta_id, meta_stats in stats.items()
+            )
+
+        for meta_id, streams in self._added.items():
+            # Titles with removals were fully recounted above
+            if meta_id not in self._removed:
+                operations.extend(build_increment_operations(meta_id, streams))
+
+        new_episodes = await self._get_new_episodes()
+        operations.extend(
+            UpdateOne({"_id": meta_id}, {"$push": {"episodes": {"$each": episodes}}})
+            for meta_id, episodes in new_episodes.items()
+        )
+
+        if operations:
+            await MediaFusionMetaData.get_motor_collection().bulk_write(
+                operations, ordered=True
+            )
+        await catalog_index.update_titles(
+            self._added.keys() | self._removed.keys(), self._removed_catalogs
+        )
+        logging.info(
+            "Updated stream stats for %s titles (%s added, %s removed streams)",
+            len(self._added.keys() | self._removed.keys()),
+            sum(len(streams) for streams in self._added.values()),
+            len(removed_stream_ids),
+        )
+        self._added.clear()
+        self._removed.clear()
+        self._removed_catalogs.clear()
+        self._episode_updates.clear()
+        self._organized_stream_ids.clear()
+
+    async def _get_new_episodes(self) -> dict[str, list[dict]]:
+        """Series episodes referenced by the added streams but not in metadata."""
+        episode_streams = defaultdict(list)
+        for updates in (self._added, self._episode_updates):
+            for meta_id, streams in updates.items():
+                episode_streams[meta_id].extend(
+                    stream
+                    for stream in streams
+                    if stream.episode_files
+                    and stream.id not in self._organized_stream_ids
+                )
+        episode_streams = {
+            meta_id: streams for meta_id, streams in episode_streams.items() if streams
+        }
+        if not episode_streams:
+            return {}
+
+        existing_episodes = {
+            series["_id"]: {
+                (ep["season_number"], ep["episode_number"])
+                for ep in series.get("episodes", [])
+            }
+            async for series in MediaFusionSeriesMetaData.get_motor_collection().find(
+                {"_id": {"$in": list(episode_streams)}, "type": "series"},
+                projection={
+                    "episodes.season_number": 1,
+                    "episodes.episode_number": 1,
+                },
+            )
+        }
+
+        new_episodes = {}
+        for meta_id, streams in episode_streams.items():
+            if meta_id not in existing_episodes:
+                continue
+            seen = existing_episodes[meta_id]
+            episodes = []
+            for stream in streams:
+                for ep in stream.episode_files:
+                    key = (ep.season_number, ep.episode_number)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    episodes.append(
+                        SeriesEpisode(
+                            season_number=ep.season_number,
+                            episode_number=ep.episode_number,
+                            title=ep.title or f"Episode {ep.episode_number}",
+                            released=ep.released or stream.created_at,
+                            overview=ep.overview,
+                            thumbnail=ep.thumbnail,
+                        ).model_dump()
+                    )
+            if episodes:
+                new_episodes[meta_id] = episodes
+        return new_episodes
+
+
+def build_increment_operations(
+    meta_id: str, streams: list[TorrentStreams]
+) -> list[UpdateOne]:
+    """Operations adding the given new streams to the stats of one title."""
+    catalogs: dict[str, tuple[int, datetime]] = {}
+    for stream in streams:
+        for catalog in stream.catalog:
+            count, last_added = catalogs.get(catalog, (0, stream.created_at))
+            catalogs[catalog] = (count + 1, max(last_added, stream.created_at))
+
+    operations = []
+    for catalog, (count, last_added) in catalogs.items():
+        # Create the catalog entry if missing, then increment it (ordered write)
+        operations.append(
+            UpdateOne(
+                {"_id": meta_id, "catalog_stats.catalog": {"$ne": catalog}},
+                {
+                    "$push": {
+                        "catalog_stats": {
+                            "catalog": catalog,
+                            "total_streams": 0,
+                            "last_stream_added": last_added,
+                        }
+                    }
+                },
+            )
+        )
+        operations.append(
+            UpdateOne(
+                {"_id": meta_id, "catalog_stats.catalog": catalog},
+                {
+                    "$inc": {"catalog_stats.$.total_streams": count},
+                    "$max": {"catalog_stats.$.last_stream_added": last_added},
+                },
+            )
+        )
+
+    operations.append(
+        UpdateOne(
+            {"_id": meta_id},
+            {
+                "$inc": {"total_streams": len(streams)},
+                "$max": {
+                    "last_stream_added": max(stream.created_at for stream in streams)
+                },
+            },
+        )
+    )
+    return operations
+
+
+async def compute_stream_stats(
+    meta_ids: list[str], excluded_stream_ids: Iterable[str] = ()
+) -> dict[str, dict]:
+    """
+    Recount total_streams, last_stream_added and catalog_stats of the given
+    titles from the non-blocked TorrentStreams.
+    """
+    match = {"meta_id": {"$in": meta_ids}, "is_blocked": False}
+    excluded_stream_ids = list(excluded_stream_ids)
+    if excluded_stream_ids:
+        match["_id"] = {"$nin": excluded_stream_ids}
+
+    stats = {
+        meta_id: {"total_streams": 0, "last_stream_added": None, "catalog_stats": []}
+        for meta_id in meta_ids
+    }
+
+    totals = TorrentStreams.get_motor_collection().aggregate(
+        [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": "$meta_id",
+                    "total_streams": {"$sum": 1},
+                    "last_stream_added": {"$max": "$created_at"},
+                }
+            },
+        ]
+    )
+    async for total in totals:
+        stats[total["_id"]]["total_streams"] = total["total_streams"]
+        stats[total["_id"]]["last_stream_added"] = total["last_stream_added"]
+
+    per_catalog = TorrentStreams.get_motor_collection().aggregate(
+        [
+            {"$match": match},
+            {"$unwind": "$catalog"},
+            {
+                "$group": {
+                    "_id": {"meta_id": "$meta_id", "catalog": "$catalog"},
+                    "total_streams": {"$sum": 1},
+                    "last_stream_added": {"$max": "$created_at"},
+                }
+            },
+            {"$sort": {"_id.catalog": 1}},
+        ]
+    )
+    async for stat in per_catalog:
+        stats[stat["_id"]["meta_id"]]["catalog_stats"].append(
+            {
+                "catalog": stat["_id"]["catalog"],
+                "total_streams": stat["total_streams"],
+                "last_stream_added": stat["last_stream_added"],
+            }
+        )
+
+    return stats
+
+
+def _normalize_stats(stats: dict) -> tuple:
+    def timestamp(value: datetime | None):
+        # Mongo drops tz info and sub-millisecond precision
+        return value.replace(tzinfo=None, microsecond=0) if value else None
+
+    return (
+        stats.get("total_streams") or 0,
+        timestamp(stats.get("last_stream_added")),
+        sorted(
+            (
+                stat["catalog"],
+                stat.get("total_streams", 0),
+                timestamp(stat.get("last_stream_added")),
+            )
+            for stat in stats.get("catalog_stats") or []
+        ),
+    )
+
+
+@dramatiq.actor(
+    time_limit=60 * 60 * 1000,  # 60 minutes
+    priority=10,
+)
+async def reconcile_catalog_stats(batch_size: int = 500, **kwargs):
+    """
+    Recompute the stream statistics of all movies and series from
+    TorrentStreams and correct the titles that drifted.
+    """
+    logging.info("Reconciling catalog stats")
+    collection = MediaFusionMetaData.get_motor_collection()
+    cursor = collection.find(
+        {"type": {"$in": ["movie", "series"]}},
+        projection={"total_streams": 1, "last_stream_added": 1, "catalog_stats": 1},
+    )
+
+    checked = corrected = 0
+    while batch := await cursor.to_list(batch_size):
+        current_stats = {meta["_id"]: meta for meta in batch}
+        stats = await compute_stream_stats(list(current_stats))
+        operations = [
+            UpdateOne({"_id": meta_id}, {"$set": meta_stats})
+            for meta_id, meta_stats in stats.items()
+            if _normalize_stats(meta_stats) != _normalize_stats(current_stats[meta_id])
+        ]
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+        checked += len(batch)
+        corrected += len(operations)
+
+    logging.info(
+        "Catalog stats reconciled: %s titles checked, %s corrected", checked, corrected
+    )
+    if settings.catalog_materialization_enabled:
+        await catalog_index.schedule_rebuild()
@@ -48,6 +48,13 @@ class Settings(BaseSettings):
     db_max_connections: int = 50
     redis_url: str = "redis://redis-service:6379"
     redis_max_connections: int = 100
+    local_cache_max_bytes: int = 67108864  # 64 MB per worker, 0 disables it
+    local_cache_ttl: int = 60
+    user_data_cache_max_bytes: int = 16777216  # 16 MB per worker, 0 disables it
+    user_data_cache_ttl: int = 300
+    scraped_dedupe_capacity: int = 1000000
+    scraped_dedupe_error_rate: float = 0.001
+    scraped_dedupe_use_redisbloom: bool = False
 
     # External Service URLs
     requests_proxy_url: str | None = None
@@ -79,6 +86,9 @@ class Settings(BaseSettings):
     mediafusion_search_interval_days: int = 3
     mediafusion_url: str = "https://mediafusion.elfhosted.com"
     sync_debrid_cache_streams: bool = False
+    debrid_cache_status_deadline: float = 5.0
+    debrid_cache_compact_layout: bool = False
+    debrid_cache_buckets: int = 16384
 
     # Zilean Settings
     is_scrap_from_zilean: bool = False
@@ -107,6 +117,18 @@ class Settings(BaseSettings):
 
     background_search_interval_hours: int = 72
     background_search_crontab: str = "*/3 * * * *"
+    background_search_batch_size: int = 10
+    background_search_lease_seconds: int = 3600
+    background_search_popularity_weight: int = 3600
+    background_search_concurrency: int = 4
+    background_search_indexer_concurrency: int = 2
+    background_search_indexer_rate_per_minute: int = 30
+    indexer_registry_ttl: int = 60
+    indexer_registry_stale_ttl: int = 600
+    indexer_stats_window: int = 100
+    live_search_deadline: float = 12.0
+    live_search_stats_window: int = 50
+    live_search_demote_min_unique: float = 1.0
 
     # Premiumize Settings
     premiumize_oauth_client_id: str | None = None
@@ -128,7 +150,15 @@ class Settings(BaseSettings):
     store_stremthru_magnet_cache: bool = False
     is_scrap_from_yts: bool = True
     scrape_with_aka_titles: bool = True
+    metadata_title_index_enabled: bool = True
+    metadata_title_index_ttl: int = 3600  # 1 hour in seconds
+    catalog_materialization_enabled: bool = True
     enable_fetching_torrent_metadata_from_p2p: bool = True
+    torrent_parse_workers: int = 2
+    ptt_cache_size: int = 100000
+    ptt_redis_cache: bool = False
+    ptt_redis_cache_ttl: int = 604800  # 7 days in seconds
+    ptt_process_pool_threshold: int = 200
 
     # Content Filtering
     adult_content_regex_keywords: str = (
@@ -140,6 +170,9 @@ class Settings(BaseSettings):
 
     # Time-related Settings
     meta_cache_ttl: int = 1800  # 30 minutes in seconds
+    metadata_cache_ttl: int = 86400  # 1 day in seconds
+    metadata_cache_negative_ttl: int = 21600  # 6 hours in seconds
+    metadata_cache_stale_ttl: int = 604800  # 7 days in seconds
     worker_max_tasks_per_child: int = 20
 
     # Global Scheduler Settings
@@ -182,6 +215,7 @@ class Settings(BaseSettings):
     disable_jackett_feed_scraper: bool = False
     cleanup_expired_scraper_task_crontab: str = "0 * * * *"
     cleanup_expired_cache_task_crontab: str = "0 0 * * *"
+    reconcile_catalog_stats_crontab: str = "30 2 * * *"
 
     @model_validator(mode="after")
     def default_poster_host_url(self) -> "Settings":
@@ -1,7 +1,9 @@
 import asyncio
+import functools
 import json
 import logging
 import re
+import time
 from datetime import datetime, timezone
 from typing import Optional, Type, Literal
 from uuid import uuid4
@@ -10,13 +12,18 @@ import humanize
 from apscheduler.triggers.cron import CronTrigger
 from beanie import BulkWriter
 from beanie.exceptions import RevisionIdWasChanged
+from beanie.odm.utils.dump import get_dict
 from beanie.operators import Set
 from fastapi import BackgroundTasks
-from pymongo.errors import DuplicateKeyError
+from prometheus_client import Counter, Histogram
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from db import schemas
+from db import catalog_index, schemas
+from db.catalog_stats import CatalogStatsBatch, compute_stream_stats
 from db.config import settings
 from db.enums import NudityStatus
+from db.episode_organizer import organize_episodes
 from db.models import (
     EpisodeFile,
     MediaFusionEventsMetaData,
@@ -24,12 +31,19 @@ from db.models import (
     MediaFusionMovieMetaData,
     MediaFusionSeriesMetaData,
     MediaFusionTVMetaData,
+    TorrentFile,
     TorrentStreams,
     TVStreams,
-    SeriesEpisode,
 )
+from db.local_cache import local_cache, invalidate_local_cache
 from db.redis_database import REDIS_ASYNC_CLIENT
-from db.schemas import Stream, TorrentStreamsList
+from db.schemas import Stream
+from db.stream_snapshot import (
+    StreamSnapshot,
+    decode_streams_snapshot,
+    encode_streams_snapshot,
+)
+from db.title_index import metadata_title_index
 from scrapers.dlhd import dlhd_schedule_service
 from scrapers.mdblist import initialize_mdblist_scraper
 from scrapers.scraper_tasks import run_scrapers, meta_fetcher
@@ -42,6 +56,7 @@ from utils.const import (
 from utils.lock import acquire_redis_lock, release_redis_lock
 from utils.network import CircuitBreaker, batch_process_with_circuit_breaker
 from utils.parser import (
+    RenderedStream,
     fetch_downloaded_info_hashes,
     parse_stream_data,
     parse_tv_stream_data,
@@ -49,6 +64,7 @@ from utils.parser import (
     create_exception_stream,
     create_content_warning_message,
 )
+from utils.singleflight import SingleFlight, redis_single_flight
 from utils.validation_helper import (
     validate_parent_guide_nudity,
     get_filter_certification_values,
@@ -85,6 +101,53 @@ def apply_parental_guide_filters(
             match_filter["$or"] = cert_filters
 
 
+def get_meta_list_pipeline(
+    match_filter: dict,
+    catalog: str,
+    skip: int,
+    limit: int,
+    poster_path: str,
+    is_materialized: bool,
+) -> list[dict]:
+    """
+    Aggregation of a catalog page. Materialised catalogs are sorted like the
+    catalog index, by the catalog's own last_stream_added and the id, so pages
+    served by either one line up. No index covers that sort, so only the ids
+    and sort keys are sorted and the page is hydrated afterwards.
+    """
+    if not is_materialized:
+        return [
+            {"$match": match_filter},
+            {"$sort": {"catalog_stats.last_stream_added": -1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$set": {"poster": {"$concat": [poster_path, "$_id", ".jpg"]}}},
+        ]
+    return [
+        {"$match": match_filter},
+        {
+            "$project": {
+                "catalog_last_stream_added": {
+                    "$max": {
+                        "$map": {
+                            "input": {
+                                "$filter": {
+                                    "input": "$catalog_stats",
+                                    "cond": {"$eq": ["$$this.catalog", catalog]},
+                                }
+                            },
+                            "in": "$$this.last_stream_added",
+                        }
+                    }
+                }
+            }
+        },
+        {"$sort": {"catalog_last_stream_added": -1, "_id": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+    ]
+
+
 async def get_meta_list(
     user_data: schemas.UserData,
     catalog_type: str,
@@ -114,7 +177,7 @@ async def get_meta_list(
         # First get meta_ids from TorrentStreams
         meta_ids = await TorrentStreams.distinct(
             "meta_id",
-            {"_id": {"$in": downloaded_info_hashes}, "is_blocked": {"$ne": True}},
+            {"_id": {"$in": downloaded_info_hashes}, "is_blocked": False},
         )
 
         if not meta_ids:
@@ -144,21 +207,37 @@ async def get_meta_list(
 
     apply_parental_guide_filters(user_data, match_filter)
 
-    # Define the pipeline
-    pipeline = [
-        {"$match": match_filter},
-        {"$sort": {f"catalog_stats.last_stream_added": -1}},
-        {"$skip": skip},
-        {"$limit": limit},
-        {"$set": {"poster": {"$concat": [poster_path, "$_id", ".jpg"]}}},
-    ]
+    is_materialized = not is_watchlist_catalog and catalog_index.is_materialized(
+        catalog_type, catalog
+    )
+    if is_materialized:
+        meta_list_raw = await catalog_index.get_page(
+            catalog_type, catalog, match_filter, skip, limit, poster_path
+        )
+        if meta_list_raw is not None:
+            return [schemas.Meta.model_validate(doc) for doc in meta_list_raw]
 
-    # Execute the aggregation pipeline
+    pipeline = get_meta_list_pipeline(
+        match_filter, catalog, skip, limit, poster_path, is_materialized
+    )
     meta_list_raw = (
         await MediaFusionMetaData.get_motor_collection()
         .aggregate(pipeline)
         .to_list(None)
     )
+    if is_materialized:
+        meta_ids = [doc["_id"] for doc in meta_list_raw]
+        metas = await catalog_index.hydrate(meta_ids, match_filter, poster_path)
+        meta_list_raw = [metas[meta_id] for meta_id in meta_ids if meta_id in metas]
+        if meta_list_raw:
+            # Continue the next page from the catalog index
+            await catalog_index.store_cursor(
+                catalog_type,
+                catalog,
+                match_filter,
+                skip + len(meta_list_raw),
+                meta_list_raw[-1]["_id"],
+            )
     meta_list = [schemas.Meta.model_validate(doc) for doc in meta_list_raw]
     return meta_list
 
@@ -311,7 +390,12 @@ async def get_media_data_by_id(
         Optional[T]: Media metadata object or None if not found
     """
     # Check cache first
-    cached_data = await REDIS_ASYNC_CLIENT.get(f"{media_type}_data:{meta_id}")
+    cache_key = f"{media_type}_data:{meta_id}"
+    cached_data = local_cache.get(cache_key)
+    if cached_data is None:
+        cached_data = await REDIS_ASYNC_CLIENT.get(cache_key)
+        if cached_data:
+            local_cache.set(cache_key, cached_data, len(cached_data))
     if cached_data:
         return model_class.model_validate_json(cached_data)
 
@@ -401,7 +485,7 @@ async def get_media_data_by_id(
     # Cache the data
     if media_data:
         await REDIS_ASYNC_CLIENT.set(
-            f"{media_type}_data:{meta_id}",
+            cache_key,
             media_data.model_dump_json(exclude_none=True),
             ex=86400,  # 1 day
         )
@@ -426,53 +510,146 @@ async def get_tv_data_by_id(tv_id: str) -> Optional[MediaFusionTVMetaData]:
     return tv_data
 
 
+store_streams_latency = Histogram(
+    "store_torrent_streams_seconds", "Latency of a store_new_torrent_streams batch"
+)
+stored_streams = Counter(
+    "stored_torrent_streams_total",
+    "Streams written by store_new_torrent_streams, labeled by result",
+    labelnames=["result"],
+)
+stream_lookups = SingleFlight("torrent_streams")
+live_searches = SingleFlight("live_search")
+
+
+async def read_cached_torrent_streams(
+    cache_key: str,
+) -> list[TorrentStreams | StreamSnapshot] | None:
+    # Try the in-process cache first, then the compact snapshot in Redis
+    streams = local_cache.get(cache_key)
+    if streams is not None:
+        return streams
+
+    cached_data = await REDIS_ASYNC_CLIENT.get(cache_key)
+    streams = decode_streams_snapshot(cached_data) if cached_data else None
+    if streams is not None:
+        local_cache.set(cache_key, streams, len(cached_data))
+    return streams
+
+
 async def get_cached_torrent_streams(
     cache_key: str,
     video_id: str,
     season: Optional[int] = None,
     episode: Optional[int] = None,
-) -> list[TorrentStreams]:
-    # Create a unique key for Redis
-    # Try to get the data from the Redis cache
-    cached_data = await REDIS_ASYNC_CLIENT.get(cache_key)
+) -> list[TorrentStreams | StreamSnapshot]:
+    streams = local_cache.get(cache_key)
+    if streams is not None:
+        return streams
 
-    if cached_data is not None:
-        # If the data is in the cache, deserialize it and return it
-        streams = TorrentStreamsList.model_validate_json(cached_data).streams
-    else:
-        # If the data is not in the cache, query it from the database
-        if season is not None and episode is not None:
-            streams = await TorrentStreams.find(
-                {
-                    "meta_id": video_id,
-                    "is_blocked": {"$ne": True},
-                    "episode_files": {
-                        "$elemMatch": {
-                            "season_number": season,
-                            "episode_number": episode,
-                        }
-                    },
-                }
-            ).to_list()
-        else:
-            streams = await TorrentStreams.find(
-                {"meta_id": video_id, "is_blocked": {"$ne": True}}
-            ).to_list()
+    # Concurrent lookups of the same title share one cache read / DB query
+    return await stream_lookups.do(
+        cache_key,
+        functools.partial(_load_torrent_streams, cache_key, video_id, season, episode),
+    )
 
-        torrent_streams = TorrentStreamsList(streams=streams)
 
-        # Serialize the data and store it in the Redis cache for 30 minutes
-        await REDIS_ASYNC_CLIENT.set(
-            cache_key,
-            torrent_streams.model_dump_json(
-                exclude_none=True, exclude={"streams": {"__all__": {"torrent_file"}}}
-            ),
-            ex=1800,
-        )
+async def _load_torrent_streams(
+    cache_key: str,
+    video_id: str,
+    season: Optional[int] = None,
+    episode: Optional[int] = None,
+) -> list[TorrentStreams | StreamSnapshot]:
+    streams = await read_cached_torrent_streams(cache_key)
+    if streams is not None:
+        return streams
+
+    return await redis_single_flight(
+        f"{cache_key}_query_lock",
+        functools.partial(_query_torrent_streams, cache_key, video_id, season, episode),
+        functools.partial(read_cached_torrent_streams, cache_key),
+        name=stream_lookups.name,
+        timeout=30,
+    )
+
+
+def get_stream_lookup_filter(
+    video_id: str, season: Optional[int] = None, episode: Optional[int] = None
+) -> dict:
+    # Equality on is_blocked lets the lookup use the partial stream indexes
+    query = {"meta_id": video_id, "is_blocked": False}
+    if season is not None and episode is not None:
+        query["episode_files"] = {
+            "$elemMatch": {"season_number": season, "episode_number": episode}
+        }
+    return query
+
+
+async def _query_torrent_streams(
+    cache_key: str,
+    video_id: str,
+    season: Optional[int] = None,
+    episode: Optional[int] = None,
+) -> list[schemas.TorrentStreamsProjection]:
+    streams = await TorrentStreams.find(
+        get_stream_lookup_filter(video_id, season, episode),
+        projection_model=schemas.TorrentStreamsProjection,
+    ).to_list()
+
+    # Store the compact snapshot in the Redis cache for 30 minutes
+    snapshot = encode_streams_snapshot(streams, season, episode)
+    await REDIS_ASYNC_CLIENT.set(cache_key, snapshot, ex=1800)
+    local_cache.set(cache_key, streams, len(snapshot))
 
     return streams
 
 
+async def live_search_torrent_streams(
+    cache_key: str,
+    video_id: str,
+    metadata,
+    content_type: str,
+    background_tasks: BackgroundTasks,
+    season: int | None = None,
+    episode: int | None = None,
+) -> list[TorrentStreams | StreamSnapshot]:
+    """
+    Merge the cached streams with a fresh scraper run. The merged list is
+    written to the stream cache right away so coalesced callers on other
+    workers can read it while the new streams are stored in the background.
+    """
+    cached_streams = await get_cached_torrent_streams(
+        cache_key, video_id, season, episode
+    )
+
+    scraper_args = [metadata, content_type]
+    if content_type == "series":
+        scraper_args.extend([season, episode])
+
+    new_streams = await run_scrapers(
+        *scraper_args,
+        on_late_streams=functools.partial(store_late_torrent_streams, cache_key),
+    )
+    if not new_streams:
+        return cached_streams
+
+    all_streams = list(set(cached_streams).union(new_streams))
+    await REDIS_ASYNC_CLIENT.set(
+        cache_key, encode_streams_snapshot(all_streams, season, episode), ex=1800
+    )
+    await invalidate_local_cache(cache_key)
+    background_tasks.add_task(store_new_torrent_streams, new_streams)
+    return all_streams
+
+
+async def store_late_torrent_streams(cache_key: str, streams: set[TorrentStreams]):
+    """Store streams of scrapers that missed the live search deadline"""
+    await store_new_torrent_streams(streams)
+    # The next lookup reads them back from the DB
+    await REDIS_ASYNC_CLIENT.delete(cache_key)
+    await invalidate_local_cache(cache_key)
+
+
 async def get_streams_base(
     user_data,
     secret_str: str,
@@ -484,7 +661,7 @@ async def get_streams_base(
     background_tasks: BackgroundTasks,
     season: int | None = None,
     episode: int | None = None,
-) -> list[Stream]:
+) -> list[Stream | RenderedStream]:
     """
     Base function for fetching streams for both movies and series.
 
@@ -546,38 +723,34 @@ async def get_streams_base(
         cache_key_parts.extend([str(season), str(episode)])
 
     cache_key = f"torrent_streams:{':'.join(cache_key_parts)}"
-    lock_key = f"{cache_key}_lock" if live_search_streams else None
-    redis_lock = None
-
-    if lock_key:
-        _, redis_lock = await acquire_redis_lock(lock_key, timeout=60, block=True)
-
-    # Get cached streams
-    cached_streams = await get_cached_torrent_streams(
-        cache_key,
-        video_id,
-        season,
-        episode,
-    )
 
-    # Handle live search and stream updates
     if live_search_streams:
-        scraper_args = [metadata, content_type]
-        if content_type == "series":
-            scraper_args.extend([season, episode])
-
-        new_streams = await run_scrapers(*scraper_args)
-        all_streams = list(set(cached_streams).union(new_streams))
-
-        if new_streams:
-            await REDIS_ASYNC_CLIENT.delete(cache_key)
-            background_tasks.add_task(
-                store_new_torrent_streams, new_streams, redis_lock=redis_lock
-            )
-        else:
-            await release_redis_lock(redis_lock)
+        # Concurrent live searches of the same title share one scraper run
+        live_search = functools.partial(
+            live_search_torrent_streams,
+            cache_key,
+            video_id,
+            metadata,
+            content_type,
+            background_tasks,
+            season,
+            episode,
+        )
+        all_streams = await live_searches.do(
+            cache_key,
+            functools.partial(
+                redis_single_flight,
+                f"{cache_key}_lock",
+                live_search,
+                functools.partial(read_cached_torrent_streams, cache_key),
+                name=live_searches.name,
+                timeout=60,
+            ),
+        )
     else:
-        all_streams = cached_streams
+        all_streams = await get_cached_torrent_streams(
+            cache_key, video_id, season, episode
+        )
 
     # Parse and return results
     parsed_results = await parse_stream_data(
@@ -598,7 +771,7 @@ async def get_movie_streams(
     video_id: str,
     user_ip: str | None,
     background_tasks: BackgroundTasks,
-) -> list[Stream]:
+) -> list[Stream | RenderedStream]:
     """Get streams for a movie."""
     movie_metadata = await get_movie_data_by_id(video_id)
     return await get_streams_base(
@@ -621,7 +794,7 @@ async def get_series_streams(
     episode: int,
     user_ip: str | None,
     background_tasks: BackgroundTasks,
-) -> list[Stream]:
+) -> list[Stream | RenderedStream]:
     """Get streams for a series episode."""
     series_metadata = await get_series_data_by_id(video_id)
     return await get_streams_base(
@@ -639,56 +812,116 @@ async def get_series_streams(
 
 
 async def store_new_torrent_streams(
-    streams: list[TorrentStreams] | set[TorrentStreams], redis_lock=None
-):
+    streams: list[TorrentStreams] | set[TorrentStreams],
+    redis_lock=None,
+    organized: bool = False,
+) -> dict:
+    """
+    Bulk ingest scraped streams: existing torrents get their seeders refreshed
+    and new episode files merged, new torrents are inserted. Everything goes
+    to Mongo in one unordered bulk_write after a single $in lookup. The series
+    episodes of `organized` streams are left to the episode organizer.
+    """
     if not streams:
-        return
-    bulk_writer = BulkWriter()
+        return {}
+    start_time = time.perf_counter()
+    streams_by_id = {stream.id: stream for stream in streams}
 
-    for stream in streams:
-        try:
-            existing_stream = await TorrentStreams.get(stream.id)
-            if existing_stream:
-                update_data = {"seeders": stream.seeders, "updated_at": datetime.now()}
-
-                if stream.episode_files:
-                    # Get existing episode numbers
-                    existing_episodes = {
-                        (ep.season_number, ep.episode_number)
-                        for ep in (existing_stream.episode_files or [])
-                    }
+    existing_episodes = {
+        doc["_id"]: {
+            (ep["season_number"], ep["episode_number"])
+            for ep in doc.get("episode_files") or []
+        }
+        async for doc in TorrentStreams.get_motor_collection().find(
+            {"_id": {"$in": list(streams_by_id)}},
+            projection={
+                "episode_files.season_number": 1,
+                "episode_files.episode_number": 1,
+            },
+        )
+    }
 
-                    # Find new episodes
-                    new_episodes = [
-                        ep
-                        for ep in stream.episode_files
-                        if (ep.season_number, ep.episode_number)
-                        not in existing_episodes
-                    ]
+    operations = []
+    new_streams = {}
+    merged_streams = []
+    for stream in streams_by_id.values():
+        if stream.id not in existing_episodes:
+            new_streams[len(operations)] = stream
+            operations.append(
+                InsertOne(get_dict(stream, to_db=True, exclude={"torrent_file"}))
+            )
+            continue
 
-                    if new_episodes:
-                        logging.info(
-                            "Adding new %s episodes to stream %s",
-                            len(new_episodes),
-                            stream.id,
-                        )
-                        update_data["episode_files"] = (
-                            existing_stream.episode_files or []
-                        ) + new_episodes
-
-                await existing_stream.update(Set(update_data), bulk_writer=bulk_writer)
-                logging.info("Updated stream %s for %s", stream.id, stream.meta_id)
-            else:
-                await TorrentStreams.insert(stream)
-        except DuplicateKeyError:
-            logging.warning(
-                "Duplicate stream found: %s for %s", stream.id, stream.meta_id
+        update = {"$set": {"seeders": stream.seeders, "updated_at": datetime.now()}}
+        new_episodes = [
+            ep.model_dump()
+            for ep in stream.episode_files or []
+            if (ep.season_number, ep.episode_number) not in existing_episodes[stream.id]
+        ]
+        if new_episodes:
+            logging.info(
+                "Adding new %s episodes to stream %s", len(new_episodes), stream.id
             )
+            update["$addToSet"] = {"episode_files": {"$each": new_episodes}}
+            merged_streams.append(stream)
+        operations.append(UpdateOne({"_id": stream.id}, update))
 
-    await bulk_writer.commit()
+    failed_indexes = set()
+    try:
+        await TorrentStreams.get_motor_collection().bulk_write(
+            operations, ordered=False
+        )
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            failed_indexes.add(error["index"])
+            if error.get("code") == 11000:
+                logging.warning("Duplicate stream found: %s", error.get("keyValue"))
+            else:
+                logging.error("Failed to store stream: %s", error.get("errmsg"))
+
+    # Metadata stats are updated for the whole batch instead of per stream hooks
+    stats_batch = CatalogStatsBatch()
+    inserted_count = 0
+    torrent_files = []
+    for index, stream in new_streams.items():
+        if index not in failed_indexes:
+            stats_batch.add(stream, organized)
+            inserted_count += 1
+            if stream.torrent_file:
+                torrent_files.append(stream)
+    for stream in merged_streams:
+        stats_batch.add_episodes(stream)
+    await stats_batch.flush()
+    await store_torrent_files(torrent_files)
+
+    await invalidate_local_cache(
+        *{
+            prefix
+            for stream in streams_by_id.values()
+            for prefix in (
+                f"torrent_streams:{stream.meta_id}",
+                f"torrent_streams:{stream.meta_id}:",
+            )
+        }
+    )
     if redis_lock:
         await release_redis_lock(redis_lock)
 
+    elapsed = time.perf_counter() - start_time
+    result = {
+        "inserted": inserted_count,
+        "updated": len(existing_episodes),
+        "merged": len(merged_streams),
+        "failed": len(failed_indexes),
+    }
+    store_streams_latency.observe(elapsed)
+    for name, count in result.items():
+        stored_streams.labels(result=name).inc(count)
+    logging.info(
+        "Stored %s streams in %.1fms: %s", len(streams_by_id), elapsed * 1000, result
+    )
+    return result
+
 
 async def get_tv_streams(video_id: str, namespace: str, user_data) -> list[Stream]:
     tv_streams = await TVStreams.find(
@@ -795,6 +1028,11 @@ async def get_existing_metadata(
     if isinstance(year, str):
         year = int(year)
 
+    media_type = "movie" if issubclass(model, MediaFusionMovieMetaData) else "series"
+    if settings.metadata_title_index_enabled:
+        if best_match := await metadata_title_index.find(media_type, title, year):
+            return best_match
+
     # Create a list of filters to try in order
     filters = []
 
@@ -860,6 +1098,11 @@ async def get_existing_metadata(
 
         # Return the match if it meets our threshold (95%)
         if best_match and best_ratio >= 95:
+            if settings.metadata_title_index_enabled:
+                # Created by another worker after the index was loaded
+                metadata_doc = await model.get(best_match.id)
+                if metadata_doc:
+                    metadata_title_index.add_metadata(metadata_doc)
             return best_match
 
     return None
@@ -952,65 +1195,15 @@ async def get_or_create_metadata(
                 await new_data.create()
             except DuplicateKeyError:
                 logging.warning("Duplicate %s found: %s", media_type, new_data.title)
+            else:
+                if settings.metadata_title_index_enabled:
+                    metadata_title_index.add_metadata(new_data)
     else:
         metadata["id"] = existing_data.id
 
     return metadata
 
 
-async def organize_episodes(series_id):
-    """Organize episodes by release date and assign sequential numbers"""
-    # Fetch all torrent streams for this series
-    torrent_streams = await TorrentStreams.find({"meta_id": series_id}).to_list()
-    series_data = await MediaFusionSeriesMetaData.get(series_id)
-
-    # Flatten all episodes from all streams and sort by release date
-    all_episodes = sorted(
-        (episode for stream in torrent_streams for episode in stream.episode_files),
-        key=lambda e: (
-            e.released.date() or datetime.min.date(),
-            e.filename or "",
-        ),
-    )
-
-    # Assign episode numbers, ensuring the same title across different qualities gets the same number
-    season_episode_map = {}
-    series_episodes = []
-
-    for episode in all_episodes:
-        season = episode.season_number
-        if season not in season_episode_map:
-            season_episode_map[season] = {}
-
-        title_key = episode.title or episode.filename
-        if title_key not in season_episode_map[season]:
-            episode_number = len(season_episode_map[season]) + 1
-            season_episode_map[season][title_key] = episode_number
-
-            # Create SeriesEpisode for MediaFusionSeriesMetaData
-            series_episodes.append(
-                SeriesEpisode(
-                    season_number=season,
-                    episode_number=episode_number,
-                    title=episode.title or f"Episode {episode_number}",
-                    released=episode.released,
-                )
-            )
-
-        episode.episode_number = season_episode_map[season][title_key]
-
-    # Update episodes in each torrent stream
-    for stream in torrent_streams:
-        if stream.episode_files:
-            stream.episode_files.sort(key=lambda e: (e.season_number, e.episode_number))
-            await stream.save()
-
-    # Update series metadata with organized episodes
-    await series_data.update(Set({"episodes": series_episodes}))
-
-    logging.info(f"Organized episodes for series {series_id}")
-
-
 async def save_metadata(
     metadata: dict, media_type: str, is_search_imdb_title: bool = True
 ):
@@ -1074,9 +1267,12 @@ async def save_metadata(
             return
         new_stream.episode_files = episodes
 
-    await new_stream.create()
     if should_organize_episodes:
-        await organize_episodes(metadata["id"])
+        # The episode numbers are provisional until the organizer numbers them
+        await store_new_torrent_streams([new_stream], organized=True)
+        await organize_episodes(metadata["id"], [new_stream.id])
+    else:
+        await new_stream.create()
     logging.info(
         "Added stream for %s %s (%s), info_hash: %s",
         media_type,
@@ -1239,12 +1435,37 @@ async def process_tv_search_query(search_query: str, namespace: str) -> dict:
 
 
 async def get_stream_by_info_hash(info_hash: str) -> TorrentStreams | None:
-    stream = await TorrentStreams.find_one(
-        {"_id": info_hash, "is_blocked": {"$ne": True}}
-    )
+    stream = await TorrentStreams.find_one({"_id": info_hash, "is_blocked": False})
     return stream
 
 
+async def store_torrent_files(streams: list[TorrentStreams]):
+    """Store the .torrent files of streams outside the stream documents"""
+    if not streams:
+        return
+    await TorrentFile.get_motor_collection().bulk_write(
+        [
+            UpdateOne(
+                {"_id": stream.id},
+                {
+                    "$set": {
+                        "content": stream.torrent_file,
+                        "created_at": datetime.now(),
+                    }
+                },
+                upsert=True,
+            )
+            for stream in streams
+        ],
+        ordered=False,
+    )
+
+
+async def get_torrent_file(info_hash: str) -> bytes | None:
+    torrent_file = await TorrentFile.get(info_hash)
+    return torrent_file.content if torrent_file else None
+
+
 async def is_torrent_stream_exists(info_hash: str) -> bool:
     stream = await TorrentStreams.find_one({"_id": info_hash}).count()
     return stream > 0
@@ -1652,6 +1873,7 @@ async def update_metadata(imdb_ids: list[str], metadata_type: str):
         cache_keys = await REDIS_ASYNC_CLIENT.keys(f"{metadata_type}_{meta_id}_meta*")
         cache_keys.append(f"{metadata_type}_data:{meta_id}")
         await REDIS_ASYNC_CLIENT.delete(*cache_keys)
+        await invalidate_local_cache(f"{metadata_type}_data:{meta_id}")
 
 
 async def fetch_metadata(imdb_ids: list[str], metadata_type: str):
@@ -1677,71 +1899,25 @@ async def update_meta_stream(meta_id: str, is_update_data_only: bool = False) ->
     Update stream-related metadata for a given meta_id.
     """
     # Get TorrentStream counts & last stream added date per catalog
-    pipeline = [
-        {"$match": {"meta_id": meta_id, "is_blocked": {"$ne": True}}},
-        {"$unwind": "$catalog"},
-        {
-            "$group": {
-                "_id": "$catalog",
-                "total_streams": {"$sum": 1},
-                "last_stream_added": {"$max": "$created_at"},
-            }
-        },
-    ]
-
-    catalog_stats = await TorrentStreams.aggregate(pipeline).to_list(None)
-
-    # Calculate overall stats
-    total_streams = sum(stat["total_streams"] for stat in catalog_stats)
-    last_stream_added = (
-        max([stat["last_stream_added"] for stat in catalog_stats])
-        if catalog_stats
-        else None
-    )
-
+    stats = await compute_stream_stats([meta_id])
     update_data = {
-        "total_streams": total_streams,
-        "last_stream_added": last_stream_added,
+        **stats[meta_id],
         "last_updated_at": datetime.now(tz=timezone.utc),
-        "catalog_stats": [
-            {
-                "catalog": stat["_id"],
-                "total_streams": stat["total_streams"],
-                "last_stream_added": stat["last_stream_added"],
-            }
-            for stat in catalog_stats
-        ],
     }
 
     if is_update_data_only:
         return update_data
 
-    if catalog_stats:
-        # Remove old catalog_stats and add new ones
-        await MediaFusionMetaData.get_motor_collection().update_one(
-            {"_id": meta_id},
-            {
-                "$set": {
-                    "total_streams": update_data["total_streams"],
-                    "last_stream_added": update_data["last_stream_added"],
-                    "last_updated_at": update_data["last_updated_at"],
-                    "catalog_stats": update_data["catalog_stats"],
-                }
-            },
-        )
-    else:
-        # If no streams, clear all stats
-        await MediaFusionMetaData.get_motor_collection().update_one(
-            {"_id": meta_id},
-            {
-                "$set": {
-                    "total_streams": 0,
-                    "last_stream_added": None,
-                    "last_updated_at": update_data["last_updated_at"],
-                    "catalog_stats": [],
-                }
-            },
-        )
+    await MediaFusionMetaData.get_motor_collection().update_one(
+        {"_id": meta_id}, {"$set": update_data}
+    )
+    await catalog_index.update_titles([meta_id])
 
+    await invalidate_local_cache(
+        f"torrent_streams:{meta_id}",
+        f"torrent_streams:{meta_id}:",
+        f"movie_data:{meta_id}",
+        f"series_data:{meta_id}",
+    )
     logging.info(f"Updated stream metadata for {meta_id}")
     return update_data
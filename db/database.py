@@ -9,8 +9,10 @@ from db.models import (
     MediaFusionSeriesMetaData,
     MediaFusionMovieMetaData,
     TorrentStreams,
+    TorrentFile,
     TVStreams,
     MediaFusionTVMetaData,
+    SeriesEpisodeIndex,
 )
 
 logging.getLogger("pymongo").setLevel(logging.WARNING)
@@ -32,7 +34,9 @@ async def init(allow_index_dropping: bool = False):
                     MediaFusionSeriesMetaData,
                     MediaFusionTVMetaData,
                     TorrentStreams,
+                    TorrentFile,
                     TVStreams,
+                    SeriesEpisodeIndex,
                 ],
                 multiprocessing_mode=True,
                 allow_index_dropping=allow_index_dropping,
@@ -0,0 +1,213 @@
+"""
+Episode numbering for series whose torrents carry no episode numbers, such as
+event series (F1, WWE, UFC) built from scraped torrents.
+
+Episodes are numbered per season in release order and the same title across
+torrents shares one number. The assignments are persisted in
+SeriesEpisodeIndex, so new torrents only number their new titles and update
+their own episode files instead of rewriting the whole series. A full rebuild
+renumbers everything from scratch and stays available as a maintenance task.
+The store paths leave the series episodes of organized streams to this
+module, their provisional episode numbers are never pushed.
+"""
+
+import logging
+from datetime import datetime
+from typing import Iterable
+
+import dramatiq
+from pymongo import UpdateOne
+
+from db.models import (
+    EpisodeFile,
+    EpisodeIndexEntry,
+    MediaFusionSeriesMetaData,
+    SeriesEpisode,
+    SeriesEpisodeIndex,
+    TorrentStreams,
+)
+from utils.lock import acquire_redis_lock, release_redis_lock
+
+# Seconds a series stays locked while its episodes are numbered
+ORGANIZE_LOCK_TIMEOUT = 300
+
+
+def episode_sort_key(episode: EpisodeFile):
+    return (
+        episode.released.date() if episode.released else datetime.min.date(),
+        episode.filename or "",
+    )
+
+
+def episode_title_key(episode: EpisodeFile) -> str:
+    return episode.title or episode.filename or ""
+
+
+def assign_episode_numbers(
+    streams: list[TorrentStreams], numbers: dict[tuple[int, str], int]
+) -> tuple[list[EpisodeIndexEntry], list[SeriesEpisode]]:
+    """
+    Number the episode files of the given streams in place, extending
+    `numbers` with the titles seen for the first time.
+    """
+    next_numbers = {}
+    for (season, _), episode_number in numbers.items():
+        next_numbers[season] = max(next_numbers.get(season, 0), episode_number)
+
+    new_entries, new_episodes = [], []
+    all_episodes = sorted(
+        (episode for stream in streams for episode in stream.episode_files),
+        key=episode_sort_key,
+    )
+    for episode in all_episodes:
+        key = (episode.season_number, episode_title_key(episode))
+        if key not in numbers:
+            episode_number = next_numbers.get(episode.season_number, 0) + 1
+            next_numbers[episode.season_number] = episode_number
+            numbers[key] = episode_number
+            new_entries.append(
+                EpisodeIndexEntry(
+                    season_number=key[0],
+                    title_key=key[1],
+                    episode_number=episode_number,
+                )
+            )
+            new_episodes.append(
+                SeriesEpisode(
+                    season_number=episode.season_number,
+                    episode_number=episode_number,
+                    title=episode.title or f"Episode {episode_number}",
+                    released=episode.released,
+                )
+            )
+        episode.episode_number = numbers[key]
+    return new_entries, new_episodes
+
+
+async def update_episode_files(streams: list[TorrentStreams]):
+    """Write back the episode files of the given streams with targeted $set."""
+    operations = []
+    for stream in streams:
+        if not stream.episode_files:
+            continue
+        stream.episode_files.sort(key=lambda e: (e.season_number, e.episode_number))
+        operations.append(
+            UpdateOne(
+                {"_id": stream.id},
+                {
+                    "$set": {
+                        "episode_files": [
+                            episode.model_dump() for episode in stream.episode_files
+                        ]
+                    }
+                },
+            )
+        )
+    if operations:
+        await TorrentStreams.get_motor_collection().bulk_write(
+            operations, ordered=False
+        )
+
+
+async def rebuild_episodes(series_id: str):
+    """Renumber every episode of a series and rewrite its episode index."""
+    torrent_streams = await TorrentStreams.find({"meta_id": series_id}).to_list()
+    new_entries, series_episodes = assign_episode_numbers(torrent_streams, {})
+    await update_episode_files(torrent_streams)
+
+    await MediaFusionSeriesMetaData.get_motor_collection().update_one(
+        {"_id": series_id},
+        {"$set": {"episodes": [episode.model_dump() for episode in series_episodes]}},
+    )
+    await SeriesEpisodeIndex.get_motor_collection().replace_one(
+        {"_id": series_id},
+        {
+            "entries": [entry.model_dump() for entry in new_entries],
+            "updated_at": datetime.now(),
+        },
+        upsert=True,
+    )
+    logging.info(f"Rebuilt episodes for series {series_id}")
+
+
+async def organize_episodes(series_id: str, stream_ids: Iterable[str]):
+    """
+    Number the episodes of newly added streams of a series. Titles already in
+    the episode index keep their number, new titles are appended to their
+    season. Series without an index are rebuilt in full.
+    """
+    acquired, lock = await acquire_redis_lock(
+        f"organize_episodes:{series_id}", timeout=ORGANIZE_LOCK_TIMEOUT, block=True
+    )
+    try:
+        index = await SeriesEpisodeIndex.get(series_id)
+        if index is None:
+            await rebuild_episodes(series_id)
+            return
+
+        streams = await TorrentStreams.find(
+            {"_id": {"$in": list(stream_ids)}, "meta_id": series_id}
+        ).to_list()
+        numbers = {
+            (entry.season_number, entry.title_key): entry.episode_number
+            for entry in index.entries
+        }
+        new_entries, new_episodes = assign_episode_numbers(streams, numbers)
+        await update_episode_files(streams)
+
+        if new_entries:
+            await SeriesEpisodeIndex.get_motor_collection().update_one(
+                {"_id": series_id},
+                {
+                    "$push": {
+                        "entries": {
+                            "$each": [entry.model_dump() for entry in new_entries]
+                        }
+                    },
+                    "$set": {"updated_at": datetime.now()},
+                },
+            )
+            await MediaFusionSeriesMetaData.get_motor_collection().update_one(
+                {"_id": series_id},
+                {
+                    "$push": {
+                        "episodes": {
+                            "$each": [episode.model_dump() for episode in new_episodes]
+                        }
+                    }
+                },
+            )
+        logging.info(
+            f"Organized {len(streams)} streams with {len(new_entries)} new episodes "
+            f"for series {series_id}"
+        )
+    finally:
+        if acquired:
+            await release_redis_lock(lock)
+
+
+@dramatiq.actor(
+    time_limit=60 * 60 * 1000,  # 60 minutes
+    priority=10,
+)
+async def rebuild_series_episodes(series_id: str | None = None, **kwargs):
+    """
+    Fully renumber the episodes of one series, or of every series that has an
+    episode index when no series_id is given.
+    """
+    if series_id:
+        series_ids = [series_id]
+    else:
+        series_ids = await SeriesEpisodeIndex.get_motor_collection().distinct("_id")
+
+    for series_id in series_ids:
+        acquired, lock = await acquire_redis_lock(
+            f"organize_episodes:{series_id}", timeout=ORGANIZE_LOCK_TIMEOUT, block=True
+        )
+        try:
+            await rebuild_episodes(series_id)
+        except Exception as e:
+            logging.error(f"Error rebuilding episodes for series {series_id}: {e}")
+        finally:
+            if acquired:
+                await release_redis_lock(lock)
@@ -0,0 +1,175 @@
+"""
+Per-worker in-process (L1) cache in front of Redis for hot lookups.
+
+Entries are bounded by an approximate byte budget (LRU eviction) and a TTL.
+Writers publish key prefixes on a Redis pub/sub channel so every API worker
+drops stale entries as soon as the underlying data changes.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+INVALIDATION_CHANNEL = "local_cache:invalidate"
+
+local_cache_requests = Counter(
+    "local_cache_requests_total",
+    "In-process cache lookups, labeled by cache and result",
+    labelnames=["cache", "result"],
+)
+local_cache_evictions = Counter(
+    "local_cache_evictions_total",
+    "In-process cache entries dropped, labeled by cache and reason",
+    labelnames=["cache", "reason"],
+)
+local_cache_size_bytes = Gauge(
+    "local_cache_size_bytes",
+    "Approximate size of the in-process cache",
+    labelnames=["cache"],
+)
+
+
+class LocalCache:
+    def __init__(
+        self, name: str, max_bytes: int, ttl: int, require_listener: bool = True
+    ):
+        """
+        `require_listener` keeps the cache disabled until the invalidation
+        listener runs. Caches of immutable entries can turn it off.
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.require_listener = require_listener
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.is_listening = False
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        # Without the invalidation listener, entries could outlive a write
+        # by the full TTL, so such caches stay disabled until it is running.
+        return self.max_bytes > 0 and (self.is_listening or not self.require_listener)
+
+    def get(self, key: str) -> Any | None:
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self._record_miss()
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._drop(key, "expired")
+            self._record_miss()
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        local_cache_requests.labels(cache=self.name, result="hit").inc()
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: int | None = None):
+        """
+        Store a value. `size` is the approximate memory cost of the value,
+        usually the length of its serialized Redis payload.
+        """
+        if not self.enabled or size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), size, value)
+        self.size_bytes += size
+
+        while self.size_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._drop(oldest_key, "size")
+        local_cache_size_bytes.labels(cache=self.name).set(self.size_bytes)
+
+    def invalidate_prefixes(self, prefixes: list[str]):
+        prefixes = tuple(prefixes)
+        for key in [key for key in self._entries if key.startswith(prefixes)]:
+            self._drop(key, "invalidated")
+        local_cache_size_bytes.labels(cache=self.name).set(self.size_bytes)
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+        local_cache_size_bytes.labels(cache=self.name).set(0)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0,
+        }
+
+    def _record_miss(self):
+        self.misses += 1
+        local_cache_requests.labels(cache=self.name, result="miss").inc()
+
+    def _drop(self, key: str, reason: str | None = None):
+        _, size, _ = self._entries.pop(key)
+        self.size_bytes -= size
+        if reason:
+            self.evictions += 1
+            local_cache_evictions.labels(cache=self.name, reason=reason).inc()
+
+    async def listen_for_invalidations(self):
+        """Subscribe to invalidation messages. Runs for the worker lifetime."""
+        while True:
+            pubsub = REDIS_ASYNC_CLIENT.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before (re)subscribing may have missed messages.
+                self.clear()
+                self.is_listening = True
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    prefixes = message["data"].decode("utf-8").split("\n")
+                    self.invalidate_prefixes(prefixes)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Local cache invalidation listener failed: {e}")
+                await asyncio.sleep(1)
+            finally:
+                self.is_listening = False
+                self.clear()
+                await pubsub.aclose()
+
+
+async def invalidate_local_cache(*prefixes: str):
+    """Drop matching key prefixes from the in-process cache of every worker."""
+    if not prefixes:
+        return
+    local_cache.invalidate_prefixes(list(prefixes))
+    try:
+        await REDIS_ASYNC_CLIENT.publish(INVALIDATION_CHANNEL, "\n".join(prefixes))
+    except Exception as e:
+        logging.error(f"Failed to publish local cache invalidation: {e}")
+
+
+local_cache = LocalCache(
+    "redis_l1", max_bytes=settings.local_cache_max_bytes, ttl=settings.local_cache_ttl
+)
@@ -1,12 +1,18 @@
 import asyncio
 import logging
+import sys
 from datetime import datetime
 
 from PTT import parse_title
 from pymongo import ASCENDING
 
 from db import database
-from db.crud import update_meta_stream, update_metadata
+from db.crud import (
+    get_meta_list_pipeline,
+    get_stream_lookup_filter,
+    update_meta_stream,
+    update_metadata,
+)
 from db.models import (
     TorrentStreams,
     MediaFusionSeriesMetaData,
@@ -267,6 +273,93 @@ async def migrate_custom_flag():
     logging.info("Migration completed: is_custom field has been set for all documents")
 
 
+async def normalize_blocked_flag():
+    """Set is_blocked on streams missing it, the partial stream indexes need it."""
+    result = await TorrentStreams.get_motor_collection().update_many(
+        {"is_blocked": {"$nin": [True, False]}}, {"$set": {"is_blocked": False}}
+    )
+    logger.info(f"Set is_blocked on {result.modified_count} streams")
+
+
+def find_collection_scans(explain: dict | list) -> bool:
+    """Whether a winning plan of an explain() output scans the whole collection"""
+    if isinstance(explain, list):
+        return any(find_collection_scans(value) for value in explain)
+    if not isinstance(explain, dict):
+        return False
+    if explain.get("stage") == "COLLSCAN":
+        return True
+    return any(
+        find_collection_scans(value)
+        for key, value in explain.items()
+        if key not in ("rejectedPlans", "allPlansExecution")
+    )
+
+
+async def explain_query_plans() -> dict[str, dict]:
+    """explain() the hot stream lookup and catalog queries"""
+    stream_collection = TorrentStreams.get_motor_collection()
+    metadata_collection = MediaFusionMetaData.get_motor_collection()
+    mongo_db = stream_collection.database
+    catalog_match_filter = {
+        "type": "movie",
+        "catalog_stats": {
+            "$elemMatch": {"catalog": "american_movies", "total_streams": {"$gt": 0}}
+        },
+        "genres": {"$nin": ["Adult"]},
+    }
+    queries = {
+        "movie stream lookup": (
+            stream_collection.name,
+            [{"$match": get_stream_lookup_filter("tt0111161")}],
+        ),
+        "series stream lookup": (
+            stream_collection.name,
+            [{"$match": get_stream_lookup_filter("tt0903747", 1, 1)}],
+        ),
+        # The pipelines get_meta_list runs for regular and materialised catalogs
+        "catalog meta list": (
+            metadata_collection.name,
+            get_meta_list_pipeline(
+                catalog_match_filter, "american_movies", 0, 50, "", False
+            ),
+        ),
+        "materialised catalog meta list": (
+            metadata_collection.name,
+            get_meta_list_pipeline(
+                catalog_match_filter, "american_movies", 0, 50, "", True
+            ),
+        ),
+    }
+    return {
+        name: await mongo_db.command(
+            "explain",
+            {"aggregate": collection, "pipeline": pipeline, "cursor": {}},
+            verbosity="queryPlanner",
+        )
+        for name, (collection, pipeline) in queries.items()
+    }
+
+
+async def check_query_plans() -> bool:
+    """Fail when one of the hot queries falls back to a COLLSCAN"""
+    is_valid = True
+    for name, explain in (await explain_query_plans()).items():
+        if find_collection_scans(explain):
+            logger.error(f"Query plan check failed: {name} uses a COLLSCAN")
+            is_valid = False
+        else:
+            logger.info(f"Query plan check passed: {name}")
+    return is_valid
+
+
+async def migrate_indexes() -> bool:
+    """Apply the indexes declared on the models and check the hot query plans."""
+    await database.init(allow_index_dropping=True)
+    await normalize_blocked_flag()
+    return await check_query_plans()
+
+
 async def main():
     logger.info("Starting migration")
     await database.init(allow_index_dropping=True)
@@ -274,8 +367,16 @@ async def main():
     await migrate_custom_flag()
 
     await migrate_series_streams()
+    await normalize_blocked_flag()
+    if not await check_query_plans():
+        sys.exit(1)
     logger.info("Migration completed successfully")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if "--indexes" in sys.argv:
+        # Only sync the indexes and run the query plan check
+        if not asyncio.run(migrate_indexes()):
+            sys.exit(1)
+    else:
+        asyncio.run(main())
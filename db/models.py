@@ -80,12 +80,14 @@ class MediaFusionMetaData(Document):
             IndexModel([("year", ASCENDING), ("end_year", ASCENDING)]),
             IndexModel([("_class_id", ASCENDING)]),
             IndexModel([("type", ASCENDING), ("genres", ASCENDING)]),
+            # Catalog listing of get_meta_list, newest streams first
             IndexModel(
                 [
                     ("type", ASCENDING),
                     ("catalog_stats.catalog", ASCENDING),
-                    ("catalog_stats.total_streams", ASCENDING),
-                ]
+                    ("catalog_stats.last_stream_added", DESCENDING),
+                ],
+                name="type_catalog_last_stream_added",
             ),
         ]
 
@@ -122,151 +124,41 @@ class TorrentStreams(Document):
     seeders: Optional[int] = None
     torrent_type: Optional[TorrentType] = TorrentType.PUBLIC
     is_blocked: Optional[bool] = False
-    torrent_file: bytes | None = None
+    # Stored in the TorrentFile collection, loaded only when adding the torrent
+    torrent_file: bytes | None = Field(default=None, exclude=True)
+
+    def __iter__(self):
+        # Beanie encodes documents for insert(), save() and replace() from
+        # __iter__ and ignores Field(exclude=True), keep the blob out of them
+        for key, value in super().__iter__():
+            if key != "torrent_file":
+                yield key, value
 
     @after_event(Insert)
     async def update_metadata_on_create(self):
         """Update metadata when a new stream is created"""
-        # Initialize update operations for total stream count
-        update_ops = {
-            "$inc": {"total_streams": 1},
-            "$set": {"last_stream_added": self.created_at},
-        }
-
-        # Update catalog_stats array
-        for cat in self.catalog:
-            # Try to update existing catalog stats first
-            result = await MediaFusionMetaData.get_motor_collection().update_one(
-                {"_id": self.meta_id, "catalog_stats.catalog": cat},
-                {
-                    "$inc": {"catalog_stats.$.total_streams": 1},
-                    "$set": {
-                        "catalog_stats.$.last_stream_added": self.created_at,
-                        **update_ops["$set"],
-                    },
-                },
-            )
-
-            # If no existing catalog stats found, add new one
-            if result.modified_count == 0:
-                update_ops["$push"] = update_ops.get("$push", {})
-                update_ops["$push"]["catalog_stats"] = {
-                    "$each": [
-                        {
-                            "catalog": cat,
-                            "total_streams": 1,
-                            "last_stream_added": self.created_at,
-                        }
-                    ]
-                }
-
-        # Handle episode metadata updates for series
-        if self.episode_files:
-            series_data = await MediaFusionSeriesMetaData.get(self.meta_id)
-            if series_data:
-                existing_episodes = {
-                    (ep.season_number, ep.episode_number): ep
-                    for ep in series_data.episodes
-                }
-
-                new_episodes = []
-                for ep in self.episode_files:
-                    key = (ep.season_number, ep.episode_number)
-                    if key not in existing_episodes:
-                        new_episodes.append(
-                            SeriesEpisode(
-                                season_number=ep.season_number,
-                                episode_number=ep.episode_number,
-                                title=ep.title or f"Episode {ep.episode_number}",
-                                released=ep.released or self.created_at,
-                                overview=ep.overview,
-                                thumbnail=ep.thumbnail,
-                            )
-                        )
-
-                if new_episodes:
-                    update_ops["$push"] = update_ops.get("$push", {})
-                    update_ops["$push"]["episodes"] = {
-                        "$each": [ep.model_dump() for ep in new_episodes]
-                    }
+        from db.catalog_stats import CatalogStatsBatch
 
-        await MediaFusionMetaData.get_motor_collection().update_one(
-            {"_id": self.meta_id}, update_ops
-        )
+        stats_batch = CatalogStatsBatch()
+        stats_batch.add(self)
+        await stats_batch.flush()
         logging.info(f"Added stream {self.id} to metadata {self.meta_id}")
 
     @after_event(Delete)
     async def update_metadata_on_delete(self):
         """Update metadata when a stream is deleted"""
-        # Get all remaining streams for this meta_id grouped by catalog
-        pipeline = [
-            {
-                "$match": {
-                    "meta_id": self.meta_id,
-                    "_id": {"$ne": self.id},
-                    "is_blocked": {"$ne": True},
-                }
-            },
-            {"$unwind": "$catalog"},
-            {
-                "$group": {
-                    "_id": "$catalog",
-                    "total_streams": {"$sum": 1},
-                    "last_stream_added": {"$max": "$created_at"},
-                }
-            },
-        ]
-
-        remaining_streams = (
-            await TorrentStreams.get_motor_collection()
-            .aggregate(pipeline)
-            .to_list(None)
-        )
-        remaining_catalogs = {stream["_id"] for stream in remaining_streams}
-
-        # Build update operations
-        update_ops = {
-            "$inc": {"total_streams": -1},
-            "$pull": {
-                "catalog_stats": {
-                    "catalog": {
-                        "$in": [
-                            cat for cat in self.catalog if cat not in remaining_catalogs
-                        ]
-                    }
-                }
-            },
-        }
-
-        # Update remaining catalog stats
-        for stream in remaining_streams:
-            await MediaFusionMetaData.get_motor_collection().update_one(
-                {"_id": self.meta_id, "catalog_stats.catalog": stream["_id"]},
-                {
-                    "$set": {
-                        "catalog_stats.$.total_streams": stream["total_streams"],
-                        "catalog_stats.$.last_stream_added": stream[
-                            "last_stream_added"
-                        ],
-                    }
-                },
-            )
-
-        # Update last_stream_added
-        if remaining_streams:
-            update_ops["$set"] = {
-                "last_stream_added": max(
-                    stream["last_stream_added"] for stream in remaining_streams
-                )
-            }
-        else:
-            update_ops["$set"] = {"last_stream_added": None}
+        from db.catalog_stats import CatalogStatsBatch
 
-        await MediaFusionMetaData.get_motor_collection().update_one(
-            {"_id": self.meta_id}, update_ops
-        )
+        stats_batch = CatalogStatsBatch()
+        stats_batch.remove(self)
+        await stats_batch.flush()
         logging.info(f"Removed stream {self.id} from metadata {self.meta_id}")
 
+    @after_event(Delete)
+    async def delete_torrent_file(self):
+        """Remove the stored .torrent file of a deleted stream"""
+        await TorrentFile.find_one({"_id": self.id}).delete()
+
     @before_event(Update)
     async def update_metadata_on_block(self):
         """Update metadata when a stream is blocked"""
@@ -349,6 +241,21 @@ class TorrentStreams(Document):
             IndexModel([("_class_id", ASCENDING)]),
             IndexModel([("source", ASCENDING)]),
             IndexModel([("uploader", ASCENDING)]),
+            # Stream lookups of get_cached_torrent_streams, blocked streams excluded
+            IndexModel(
+                [("meta_id", ASCENDING), ("created_at", DESCENDING)],
+                partialFilterExpression={"is_blocked": False},
+                name="meta_id_created_at_not_blocked",
+            ),
+            IndexModel(
+                [
+                    ("meta_id", ASCENDING),
+                    ("episode_files.season_number", ASCENDING),
+                    ("episode_files.episode_number", ASCENDING),
+                ],
+                partialFilterExpression={"is_blocked": False},
+                name="meta_id_episode_not_blocked",
+            ),
         ]
 
     def get_episodes(
@@ -366,6 +273,14 @@ class TorrentStreams(Document):
         return sorted(episodes, key=lambda ep: ep.size or 0, reverse=True)
 
 
+class TorrentFile(Document):
+    """Raw .torrent file of a private or semi-private stream"""
+
+    id: str  # info hash
+    content: bytes
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
 class TVStreams(Document):
     meta_id: str
     name: str
@@ -502,3 +417,17 @@ class MediaFusionEventsMetaData(MediaFusionMetaData):
     event_start_timestamp: Optional[int] = None
     logo: Optional[str] = None
     streams: list[TVStreams]
+
+
+class EpisodeIndexEntry(BaseModel):
+    season_number: int
+    title_key: str
+    episode_number: int
+
+
+class SeriesEpisodeIndex(Document):
+    """Persisted title -> episode number assignments of a series"""
+
+    id: str  # series meta_id
+    entries: list[EpisodeIndexEntry] = Field(default_factory=list)
+    updated_at: datetime = Field(default_factory=datetime.now)
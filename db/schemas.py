@@ -1,11 +1,13 @@
 import math
+from datetime import datetime
 from typing import Literal, Optional
 
+import pytz
 from pydantic import BaseModel, Field, field_validator, model_validator, HttpUrl
 
 from db.config import settings
-from db.enums import NudityStatus
-from db.models import TorrentStreams
+from db.enums import NudityStatus, TorrentType
+from db.models import EpisodeFile, TorrentStreams
 from utils import const
 
 
@@ -353,6 +355,58 @@ class MetaSearchProjection(BaseModel):
     aka_titles: Optional[list[str]] = Field(default_factory=list)
 
 
+class TorrentStreamsProjection(BaseModel):
+    """TorrentStreams fields read when listing the streams of a title"""
+
+    id: str = Field(alias="_id")
+    meta_id: str
+    torrent_name: str
+    size: int
+    episode_files: list[EpisodeFile] | None = Field(default_factory=list)
+    filename: Optional[str] = None
+    file_index: Optional[int] = None
+    announce_list: list[str]
+    languages: list[str]
+    source: str
+    uploader: Optional[str] = None
+    catalog: list[str]
+    created_at: datetime
+    resolution: Optional[str] = None
+    codec: Optional[str] = None
+    quality: Optional[str] = None
+    audio: list[str] | str | None = None
+    hdr: list[str] | None = None
+    seeders: Optional[int] = None
+    torrent_type: Optional[TorrentType] = TorrentType.PUBLIC
+    is_blocked: Optional[bool] = False
+
+    @field_validator("created_at", mode="after")
+    def validate_created_at(cls, v):
+        # convert to UTC, same as TorrentStreams
+        return v.astimezone(pytz.utc)
+
+    def get_episodes(
+        self, season_number: int, episode_number: int
+    ) -> list[EpisodeFile]:
+        """Same contract as TorrentStreams.get_episodes."""
+        episodes = [
+            ep
+            for ep in self.episode_files or []
+            if ep.season_number == season_number and ep.episode_number == episode_number
+        ]
+        return sorted(episodes, key=lambda ep: ep.size or 0, reverse=True)
+
+    def __eq__(self, other):
+        return self.id == getattr(other, "id", None)
+
+    def __hash__(self):
+        return hash(self.id)
+
+    class Config:
+        extra = "allow"
+        populate_by_name = True
+
+
 class TVMetaProjection(BaseModel):
     id: str = Field(alias="_id")
     title: str
@@ -0,0 +1,271 @@
+"""
+Compact, versioned snapshot format for the per-title torrent stream cache.
+
+The snapshot stores the stream list column by column, with the repetitive
+strings (languages, codecs, qualities, sources, catalogs...) and the tracker
+lists interned into lookup tables. Decoding builds lightweight StreamSnapshot
+objects instead of validating full TorrentStreams documents.
+
+Layout: MAGIC + version byte + zlib(json(columns)).
+"""
+
+import json
+import logging
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from db.enums import TorrentType
+from db.models import EpisodeFile, TorrentStreams
+
+SNAPSHOT_MAGIC = b"\x00MFS"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION])
+
+_SCALAR_FIELDS = ("id", "torrent_name", "size", "filename", "file_index", "seeders")
+_INTERNED_FIELDS = ("source", "uploader", "resolution", "codec", "quality")
+_INTERNED_LIST_FIELDS = ("languages", "catalog", "hdr")
+
+
+def _to_timestamp(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _from_timestamp(value: float | None) -> datetime | None:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+class _InternTable:
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def add(self, value) -> int | None:
+        if value is None:
+            return None
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+class StreamSnapshot:
+    """
+    Read-only stream record decoded from a snapshot. Exposes the same attributes
+    the stream request path reads from TorrentStreams.
+    """
+
+    __slots__ = (
+        "id",
+        "meta_id",
+        "torrent_name",
+        "size",
+        "filename",
+        "file_index",
+        "announce_list",
+        "languages",
+        "source",
+        "uploader",
+        "catalog",
+        "created_timestamp",
+        "resolution",
+        "codec",
+        "quality",
+        "audio",
+        "hdr",
+        "seeders",
+        "torrent_type",
+        "is_blocked",
+        "_episode_rows",
+    )
+
+    @property
+    def created_at(self) -> datetime | None:
+        return _from_timestamp(self.created_timestamp)
+
+    @property
+    def episode_files(self) -> list[EpisodeFile]:
+        return [self._build_episode(row) for row in self._episode_rows]
+
+    @property
+    def model_fields_set(self) -> set[str]:
+        return {
+            name
+            for name in self.__slots__
+            if not name.startswith("_") and getattr(self, name) is not None
+        }
+
+    @staticmethod
+    def _build_episode(row: list) -> EpisodeFile:
+        (
+            season_number,
+            episode_number,
+            size,
+            filename,
+            file_index,
+            title,
+            released,
+        ) = row
+        return EpisodeFile.model_construct(
+            season_number=season_number,
+            episode_number=episode_number,
+            size=size,
+            filename=filename,
+            file_index=file_index,
+            title=title,
+            released=_from_timestamp(released),
+        )
+
+    def get_episodes(
+        self, season_number: int, episode_number: int
+    ) -> list[EpisodeFile]:
+        """Same contract as TorrentStreams.get_episodes."""
+        episodes = [
+            self._build_episode(row)
+            for row in self._episode_rows
+            if row[0] == season_number and row[1] == episode_number
+        ]
+        return sorted(episodes, key=lambda ep: ep.size or 0, reverse=True)
+
+    def __eq__(self, other):
+        return self.id == getattr(other, "id", None)
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+def encode_streams_snapshot(
+    streams: Iterable[TorrentStreams],
+    season: int | None = None,
+    episode: int | None = None,
+) -> bytes:
+    """
+    Encode streams into the compact snapshot format. When season & episode are
+    given, only the matching episode files are kept since the cache entry is
+    scoped to that episode.
+    """
+    strings = _InternTable()
+    trackers = _InternTable()
+    columns = {
+        name: []
+        for name in (
+            *_SCALAR_FIELDS,
+            *_INTERNED_FIELDS,
+            *_INTERNED_LIST_FIELDS,
+            "meta_id",
+            "announce_list",
+            "audio",
+            "created_at",
+            "torrent_type",
+            "is_blocked",
+            "episode_files",
+        )
+    }
+
+    for stream in streams:
+        for name in _SCALAR_FIELDS:
+            columns[name].append(getattr(stream, name))
+        for name in _INTERNED_FIELDS:
+            columns[name].append(strings.add(getattr(stream, name)))
+        for name in _INTERNED_LIST_FIELDS:
+            values = getattr(stream, name)
+            columns[name].append(
+                None if values is None else [strings.add(value) for value in values]
+            )
+
+        columns["meta_id"].append(strings.add(stream.meta_id))
+        columns["announce_list"].append(trackers.add(tuple(stream.announce_list or ())))
+        audio = stream.audio
+        if isinstance(audio, str):
+            columns["audio"].append(strings.add(audio))
+        elif audio is None:
+            columns["audio"].append(None)
+        else:
+            columns["audio"].append([strings.add(value) for value in audio])
+        columns["created_at"].append(_to_timestamp(stream.created_at))
+        columns["torrent_type"].append(strings.add(stream.torrent_type))
+        columns["is_blocked"].append(bool(stream.is_blocked))
+
+        episode_rows = []
+        for ep in stream.episode_files or []:
+            if season is not None and (
+                ep.season_number != season or ep.episode_number != episode
+            ):
+                continue
+            episode_rows.append(
+                [
+                    ep.season_number,
+                    ep.episode_number,
+                    ep.size,
+                    ep.filename,
+                    ep.file_index,
+                    ep.title,
+                    _to_timestamp(ep.released),
+                ]
+            )
+        columns["episode_files"].append(episode_rows)
+
+    payload = {
+        "strings": strings.values,
+        "trackers": [list(tracker_list) for tracker_list in trackers.values],
+        "columns": columns,
+    }
+    return SNAPSHOT_HEADER + zlib.compress(
+        json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def decode_streams_snapshot(data: bytes) -> list[StreamSnapshot] | None:
+    """
+    Decode a snapshot produced by encode_streams_snapshot.
+    Returns None for snapshots written with an unknown format version.
+    """
+    if data[: len(SNAPSHOT_HEADER)] != SNAPSHOT_HEADER:
+        logging.debug("Skipping stream cache entry with unsupported format")
+        return None
+
+    payload = json.loads(zlib.decompress(data[len(SNAPSHOT_HEADER) :]))
+    strings = payload["strings"]
+    trackers = payload["trackers"]
+    columns = payload["columns"]
+    torrent_types = {}
+
+    def lookup(index: int | None) -> Any:
+        return None if index is None else strings[index]
+
+    def lookup_list(indexes: list[int] | None) -> list | None:
+        return None if indexes is None else [strings[index] for index in indexes]
+
+    streams = []
+    for row in range(len(columns["id"])):
+        stream = StreamSnapshot()
+        for name in _SCALAR_FIELDS:
+            setattr(stream, name, columns[name][row])
+        for name in _INTERNED_FIELDS:
+            setattr(stream, name, lookup(columns[name][row]))
+        for name in _INTERNED_LIST_FIELDS:
+            setattr(stream, name, lookup_list(columns[name][row]))
+
+        stream.meta_id = lookup(columns["meta_id"][row])
+        stream.announce_list = trackers[columns["announce_list"][row]]
+        audio = columns["audio"][row]
+        stream.audio = lookup_list(audio) if isinstance(audio, list) else lookup(audio)
+        stream.created_timestamp = columns["created_at"][row]
+
+        torrent_type = columns["torrent_type"][row]
+        if torrent_type not in torrent_types:
+            value = lookup(torrent_type)
+            torrent_types[torrent_type] = TorrentType(value) if value else None
+        stream.torrent_type = torrent_types[torrent_type]
+        stream.is_blocked = columns["is_blocked"][row]
+        stream._episode_rows = columns["episode_files"][row]
+        streams.append(stream)
+
+    return streams
@@ -0,0 +1,206 @@
+"""
+Per-worker in-memory index of metadata titles for get_existing_metadata.
+
+Titles and aka titles are normalized and mapped to their meta ids, bucketed by
+media type and release year, so the candidates of a scraped title are found
+with dictionary lookups and scored in one rapidfuzz batch instead of the
+exact, regex and text search queries. The index is loaded from
+MediaFusionMetaData on first use and extended when metadata is created or
+found in MongoDB; a miss falls back to the database queries, so entries
+created by other workers are still found. A hit is confirmed with an `_id`
+lookup, so titles deleted by other workers (e.g. by an id migration) are
+dropped instead of returned, and the whole index is reloaded after
+`metadata_title_index_ttl` seconds.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from prometheus_client import Counter
+from rapidfuzz import fuzz, process
+
+from db import schemas
+from db.config import settings
+from db.models import MediaFusionMetaData
+
+title_index_lookups = Counter(
+    "metadata_title_index_lookups_total",
+    "Metadata title index lookups, labeled by media type and result",
+    labelnames=["media_type", "result"],
+)
+
+MIN_SIMILARITY_RATIO = 95
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(title.casefold().split())
+
+
+@dataclass
+class TitleIndexEntry:
+    title: str
+    aka_titles: list[str] = field(default_factory=list)
+    year: int | None = None
+    end_year: int | None = None
+
+
+class MetadataTitleIndex:
+    def __init__(self):
+        # media type -> year -> normalized title -> meta ids
+        self.buckets: dict[str, dict[int | None, dict[str, set[str]]]] = {
+            "movie": {},
+            "series": {},
+        }
+        self.entries: dict[str, TitleIndexEntry] = {}
+        self.loaded_at: float | None = None
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > settings.metadata_title_index_ttl
+        )
+
+    def add(
+        self,
+        media_type: str,
+        meta_id: str,
+        title: str,
+        aka_titles: list[str] | None = None,
+        year: int | None = None,
+        end_year: int | None = None,
+    ):
+        if media_type not in self.buckets:
+            return
+        entry = TitleIndexEntry(title, list(aka_titles or []), year, end_year)
+        self.entries[meta_id] = entry
+        titles = self.buckets[media_type].setdefault(year, {})
+        for name in (entry.title, *entry.aka_titles):
+            if name:
+                titles.setdefault(normalize_title(name), set()).add(meta_id)
+
+    def remove(self, meta_id: str):
+        entry = self.entries.pop(meta_id, None)
+        if entry is None:
+            return
+        for titles in self.buckets.values():
+            meta_ids_by_title = titles.get(entry.year, {})
+            for name in (entry.title, *entry.aka_titles):
+                if name and (meta_ids := meta_ids_by_title.get(normalize_title(name))):
+                    meta_ids.discard(meta_id)
+
+    def add_metadata(self, metadata: MediaFusionMetaData):
+        self.add(
+            metadata.type,
+            metadata.id,
+            metadata.title,
+            metadata.aka_titles,
+            metadata.year,
+            getattr(metadata, "end_year", None),
+        )
+
+    async def load(self):
+        """(Re)load every movie and series title once the index is stale."""
+        async with self._load_lock:
+            if not self.is_stale:
+                return
+            start_time = time.perf_counter()
+            index = MetadataTitleIndex()
+            cursor = MediaFusionMetaData.get_motor_collection().find(
+                {"type": {"$in": list(index.buckets)}},
+                {"title": 1, "aka_titles": 1, "year": 1, "end_year": 1, "type": 1},
+            )
+            async for doc in cursor:
+                index.add(
+                    doc["type"],
+                    doc["_id"],
+                    doc["title"],
+                    doc.get("aka_titles"),
+                    doc.get("year"),
+                    doc.get("end_year"),
+                )
+            self.buckets, self.entries = index.buckets, index.entries
+            self.loaded_at = time.monotonic()
+            logging.info(
+                "Loaded %s titles into the metadata title index in %.2fs",
+                len(self.entries),
+                time.perf_counter() - start_time,
+            )
+
+    def get_candidates(
+        self, media_type: str, normalized_title: str, year: int | None
+    ) -> set[str]:
+        buckets = self.buckets[media_type]
+        if media_type == "movie":
+            return set(buckets.get(year, {}).get(normalized_title, ()))
+
+        # Series active in the given year
+        if year is None:
+            return set()
+        candidates = set()
+        for start_year, titles in buckets.items():
+            if start_year is None or start_year > year:
+                continue
+            for meta_id in titles.get(normalized_title, ()):
+                end_year = self.entries[meta_id].end_year
+                if end_year is None or end_year >= year:
+                    candidates.add(meta_id)
+        return candidates
+
+    async def find(
+        self, media_type: str, title: str, year: int | None
+    ) -> schemas.MetaSearchProjection | None:
+        """Best matching metadata of the title, or None to query MongoDB."""
+        if self.is_stale:
+            try:
+                await self.load()
+            except Exception as e:
+                logging.error(f"Error loading metadata title index: {e}")
+                if self.loaded_at is None:
+                    return None
+
+        candidates = self.get_candidates(media_type, normalize_title(title), year)
+        while candidates:
+            # A reload may have swapped the entries while a hit was confirmed
+            candidates &= self.entries.keys()
+            choices = {
+                (meta_id, position): name.lower()
+                for meta_id in candidates
+                for position, name in enumerate(
+                    (self.entries[meta_id].title, *self.entries[meta_id].aka_titles)
+                )
+            }
+            matches = process.extract(
+                title.lower(),
+                choices,
+                scorer=fuzz.ratio,
+                score_cutoff=MIN_SIMILARITY_RATIO,
+                limit=1,
+            )
+            if not matches:
+                break
+
+            meta_id = matches[0][2][0]
+            entry = self.entries[meta_id]
+            if not await MediaFusionMetaData.get_motor_collection().find_one(
+                {"_id": meta_id}, projection={"_id": 1}
+            ):
+                # Deleted by another worker since it was indexed
+                title_index_lookups.labels(media_type=media_type, result="stale").inc()
+                self.remove(meta_id)
+                candidates.discard(meta_id)
+                continue
+
+            title_index_lookups.labels(media_type=media_type, result="hit").inc()
+            return schemas.MetaSearchProjection(
+                _id=meta_id, title=entry.title, aka_titles=entry.aka_titles
+            )
+
+        title_index_lookups.labels(media_type=media_type, result="miss").inc()
+        return None
+
+
+metadata_title_index = MetadataTitleIndex()
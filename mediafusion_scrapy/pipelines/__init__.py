@@ -8,6 +8,7 @@ from .redis_cache_pipeline import RedisCacheURLPipeline
 from .sport_video_parser_pipeline import SportVideoParserPipeline
 from .sports_parser_pipeline import UFCParserPipeline, WWEParserPipeline
 from .store_pipelines import (
+    BatchedQueueBasedPipeline,
     EventSeriesStorePipeline,
     LiveEventStorePipeline,
     MovieStorePipeline,
@@ -28,6 +29,7 @@ __all__ = [
     "RedisCacheURLPipeline",
     "SportVideoParserPipeline",
     "QueueBasedPipeline",
+    "BatchedQueueBasedPipeline",
     "EventSeriesStorePipeline",
     "TVStorePipeline",
     "MovieStorePipeline",
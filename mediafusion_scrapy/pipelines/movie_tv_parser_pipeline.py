@@ -1,8 +1,8 @@
-import PTT
 from scrapy.exceptions import DropItem
 
 from scrapers.scraper_tasks import meta_fetcher
 from utils.const import QUALITY_GROUPS
+from utils.title_parser import parse_title_async
 
 
 class MovieTVParserPipeline:
@@ -11,7 +11,7 @@ class MovieTVParserPipeline:
         data = item.copy()
         title = data["torrent_title"]
         if "title" not in data:
-            data.update(PTT.parse_title(title, True))
+            data.update(await parse_title_async(title, True))
 
         if not data.get("title"):
             raise DropItem(f"Title not parsed: {title}")
@@ -1,18 +1,21 @@
 import asyncio
 import logging
+import zlib
+from collections import defaultdict
 from uuid import uuid4
 
 from scrapy import signals
 from scrapy.exceptions import DropItem
 
 from db import crud
-from db.crud import organize_episodes
+from db.episode_organizer import organize_episodes
 from db.models import (
     TorrentStreams,
     MediaFusionSeriesMetaData,
 )
 from db.redis_database import REDIS_ASYNC_CLIENT
 from db.schemas import TVMetaData
+from utils.dedupe import get_scraped_dedupe
 
 
 class QueueBasedPipeline:
@@ -54,43 +57,134 @@ class QueueBasedPipeline:
         raise NotImplementedError
 
 
-class EventSeriesStorePipeline(QueueBasedPipeline):
-    def __init__(self):
+class BatchedQueueBasedPipeline(QueueBasedPipeline):
+    """
+    Stores items in batches: items are sharded over `concurrency` workers by
+    group_key(), and each worker drains up to `batch_size` items or waits at
+    most `batch_timeout` seconds before handing them to parse_batch(). Items of
+    the same group always land on the same worker, so batches never race on
+    the same title. Once `max_pending` items are queued, process_item blocks
+    and the Scrapy engine stops feeding new items until the workers catch up.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        batch_timeout: float = 0.5,
+        concurrency: int = 4,
+        max_pending: int = 1000,
+    ):
         super().__init__()
-        self.redis = REDIS_ASYNC_CLIENT
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.queues = [
+            asyncio.Queue(maxsize=max(max_pending // concurrency, batch_size))
+            for _ in range(concurrency)
+        ]
+        self.processing_tasks = []
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        p = cls(
+            batch_size=crawler.settings.getint("STORE_PIPELINE_BATCH_SIZE", 100),
+            batch_timeout=crawler.settings.getint(
+                "STORE_PIPELINE_BATCH_TIMEOUT_MS", 500
+            )
+            / 1000,
+            concurrency=crawler.settings.getint("STORE_PIPELINE_CONCURRENCY", 4),
+            max_pending=crawler.settings.getint("STORE_PIPELINE_MAX_PENDING", 1000),
+        )
+        crawler.signals.connect(p.init, signal=signals.spider_opened)
+        crawler.signals.connect(p.close, signal=signals.spider_closed)
+        return p
+
+    async def init(self):
+        self.processing_tasks = [
+            asyncio.create_task(self.process_queue(queue)) for queue in self.queues
+        ]
 
     async def close(self):
-        await super().close()
-        await self.redis.aclose()
+        await asyncio.gather(*(queue.join() for queue in self.queues))
+        for task in self.processing_tasks:
+            task.cancel()
 
-    async def parse_item(self, item, spider):
-        if "title" not in item:
-            logging.warning(f"title not found in item: {item}")
-            raise DropItem(f"title not found in item: {item}")
+    def group_key(self, item) -> str:
+        return item.get("info_hash", "")
 
-        series = await MediaFusionSeriesMetaData.find_one({"title": item["title"]})
+    async def process_item(self, item, spider):
+        shard = zlib.crc32(self.group_key(item).encode()) % len(self.queues)
+        await self.queues[shard].put((item, spider))
+        return item
 
-        if not series:
-            meta_id = f"mf{uuid4().fields[-1]}"
+    async def next_batch(self, queue: asyncio.Queue) -> list:
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.batch_timeout
+        while len(batch) < self.batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def process_queue(self, queue: asyncio.Queue):
+        logging.info("Starting batched processing queue")
+        while True:
+            batch = await self.next_batch(queue)
+            try:
+                await self.parse_batch([item for item, _ in batch], batch[0][1])
+            except Exception as e:
+                logging.error(
+                    f"Error processing batch of {len(batch)} items: {e}", exc_info=True
+                )
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def parse_batch(self, items: list, spider):
+        raise NotImplementedError
 
-            # Create an initial entry for the series
-            series = MediaFusionSeriesMetaData(
-                id=meta_id,
-                title=item["title"],
-                year=item["year"],
-                poster=item.get("poster"),
-                background=item.get("background"),
-                is_poster_working=bool(item.get("poster")),
-                is_add_title_to_poster=item.get("is_add_title_to_poster", False),
-            )
-            await series.insert()
-            logging.info("Added series %s", series.title)
 
-        torrent_stream = await TorrentStreams.find_one({"_id": item["info_hash"]})
-        if not torrent_stream:
-            torrent_stream = TorrentStreams(
+class EventSeriesStorePipeline(BatchedQueueBasedPipeline):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.redis = REDIS_ASYNC_CLIENT
+
+    async def close(self):
+        await super().close()
+        await self.redis.aclose()
+
+    def group_key(self, item) -> str:
+        return item.get("title", "")
+
+    async def parse_batch(self, items: list, spider):
+        valid_items = []
+        for item in items:
+            if "title" not in item:
+                logging.warning(f"title not found in item: {item}")
+                continue
+            valid_items.append(item)
+        if not valid_items:
+            return
+
+        series_by_title = await self.get_or_create_series(valid_items)
+
+        existing_hashes = {
+            doc["_id"]
+            async for doc in TorrentStreams.get_motor_collection().find(
+                {"_id": {"$in": list({item["info_hash"] for item in valid_items})}},
+                projection={"_id": 1},
+            )
+        }
+        new_streams = {}
+        for item in valid_items:
+            if item["info_hash"] in existing_hashes:
+                continue
+            new_streams[item["info_hash"]] = TorrentStreams(
                 id=item["info_hash"],
-                meta_id=series.id,
+                meta_id=series_by_title[item["title"]].id,
                 torrent_name=item["torrent_name"],
                 announce_list=item["announce_list"],
                 size=item["total_size"],
@@ -107,17 +201,59 @@ class EventSeriesStorePipeline(QueueBasedPipeline):
                 episode_files=item.get("episodes"),
                 seeders=item["seeders"],
             )
-            await torrent_stream.insert()
-            logging.info(
-                "Added torrent stream %s for series %s",
-                torrent_stream.torrent_name,
-                series.title,
+        if new_streams:
+            await crud.store_new_torrent_streams(
+                list(new_streams.values()), organized=True
             )
+            logging.info("Added %s torrent streams", len(new_streams))
+
+        # Number only the episodes of the new streams, once per series
+        stream_ids_by_series = defaultdict(list)
+        for stream in new_streams.values():
+            stream_ids_by_series[stream.meta_id].append(stream.id)
+        await asyncio.gather(
+            *(
+                organize_episodes(series_id, stream_ids)
+                for series_id, stream_ids in stream_ids_by_series.items()
+            )
+        )
+
+        scraped_hashes = defaultdict(set)
+        for item in valid_items:
+            scraped_hashes[item["scraped_info_hash_key"]].add(item["info_hash"])
+        for key, info_hashes in scraped_hashes.items():
+            await get_scraped_dedupe(key).add_many(info_hashes)
+
+    @staticmethod
+    async def get_or_create_series(
+        items: list,
+    ) -> dict[str, MediaFusionSeriesMetaData]:
+        titles = list({item["title"] for item in items})
+        series_by_title = {}
+        async for series in MediaFusionSeriesMetaData.find({"title": {"$in": titles}}):
+            series_by_title.setdefault(series.title, series)
+
+        new_series = []
+        for item in items:
+            if item["title"] in series_by_title:
+                continue
+            # Create an initial entry for the series
+            series = MediaFusionSeriesMetaData(
+                id=f"mf{uuid4().fields[-1]}",
+                title=item["title"],
+                year=item["year"],
+                poster=item.get("poster"),
+                background=item.get("background"),
+                is_poster_working=bool(item.get("poster")),
+                is_add_title_to_poster=item.get("is_add_title_to_poster", False),
+            )
+            series_by_title[series.title] = series
+            new_series.append(series)
 
-        await organize_episodes(series.id)
-        await self.redis.sadd(item["scraped_info_hash_key"], item["info_hash"])
-
-        return item
+        if new_series:
+            await MediaFusionSeriesMetaData.insert_many(new_series)
+            logging.info("Added series %s", ", ".join(s.title for s in new_series))
+        return series_by_title
 
 
 class TVStorePipeline(QueueBasedPipeline):
@@ -168,7 +304,9 @@ class SeriesStorePipeline(QueueBasedPipeline):
             return item
         await crud.save_series_metadata(item)
         if "scraped_info_hash_key" in item:
-            await self.redis.sadd(item["scraped_info_hash_key"], item["info_hash"])
+            await get_scraped_dedupe(item["scraped_info_hash_key"]).add_many(
+                [item["info_hash"]]
+            )
         return item
 
 
@@ -187,5 +325,7 @@ class LiveEventStorePipeline(QueueBasedPipeline):
 
         await crud.save_events_data(item)
         if "scraped_info_hash_key" in item:
-            await self.redis.sadd(item["scraped_info_hash_key"], item["info_hash"])
+            await get_scraped_dedupe(item["scraped_info_hash_key"]).add_many(
+                [item["info_hash"]]
+            )
         return item
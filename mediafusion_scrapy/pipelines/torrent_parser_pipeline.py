@@ -40,7 +40,7 @@ class TorrentDownloadAndParsePipeline:
             )
             return item
 
-        torrent_metadata = torrent.extract_torrent_metadata(
+        torrent_metadata = await torrent.extract_torrent_metadata_async(
             response.body, item.get("parsed_data")
         )
 
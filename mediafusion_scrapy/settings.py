@@ -114,3 +114,10 @@ RETRY_TIMES = 5
 FLARESOLVERR_URL = settings.flaresolverr_url
 
 CLOSESPIDER_TIMEOUT_NO_ITEM = 600  # 10 minutes
+
+# Batched store pipelines: items per batch, max wait to fill a batch,
+# concurrent batch workers and queued items before blocking the engine
+STORE_PIPELINE_BATCH_SIZE = 100
+STORE_PIPELINE_BATCH_TIMEOUT_MS = 500
+STORE_PIPELINE_CONCURRENCY = 4
+STORE_PIPELINE_MAX_PENDING = 1000
@@ -4,7 +4,7 @@ import re
 import scrapy
 
 from utils.config import config_manager
-from db.redis_database import REDIS_SYNC_CLIENT
+from utils.dedupe import get_scraped_dedupe
 
 
 class CommonTamilSpider(scrapy.Spider):
@@ -41,17 +41,14 @@ class CommonTamilSpider(scrapy.Spider):
             return
         self.scrap_catalog_id = scrap_catalog_id
         logging.info(f"Scraping catalog ID: {self.scrap_catalog_id}")
-        self.redis = REDIS_SYNC_CLIENT
         self.scraped_urls_key = f"{self.name}_scraped_urls"
+        self.dedupe = get_scraped_dedupe(self.scraped_urls_key)
         self.catalogs = config_manager.get_scraper_config(self.name, "catalogs")
         self.homepage = config_manager.get_scraper_config(self.name, "homepage")
         self.supported_search_forums = config_manager.get_scraper_config(
             self.name, "supported_search_forums"
         )
 
-    def __del__(self):
-        self.redis.close()
-
     def generate_forum_data(self):
         data = []
         link_prefix = f"{self.homepage}/index.php?/forums/forum/"
@@ -120,51 +117,56 @@ class CommonTamilSpider(scrapy.Spider):
                         },
                     )
 
-    def parse_search_results(self, response):
-        movies = response.css("li[data-role='activityItem']")
-        for movie in movies:
+    async def parse_search_results(self, response):
+        movie_page_links = []
+        for movie in response.css("li[data-role='activityItem']"):
             movie_page_link = movie.css("a[data-linktype='link']::attr(href)").get()
-            if not movie_page_link:
-                continue
-
-            if not self.check_scraped_urls(movie_page_link):
-                yield response.follow(
-                    movie_page_link,
-                    self.parse_movie_page,
-                    meta={
-                        "item": {
-                            "source": self.source,
-                            "webpage_url": movie_page_link,
-                        }
-                    },
-                )
+            if movie_page_link:
+                movie_page_links.append(movie_page_link)
+
+        for movie_page_link in await self.filter_scraped_urls(movie_page_links):
+            yield response.follow(
+                movie_page_link,
+                self.parse_movie_page,
+                meta={
+                    "item": {
+                        "source": self.source,
+                        "webpage_url": movie_page_link,
+                    }
+                },
+            )
 
         # Handling pagination
         next_page_link = response.css("a[rel='next']::attr(href)").get()
         if next_page_link:
             yield response.follow(next_page_link, self.parse_search_results)
 
-    def parse_page_results(self, response):
-        movies = response.css("li[data-rowid]")
-        for movie in movies:
+    async def parse_page_results(self, response):
+        movie_page_links = []
+        for movie in response.css("li[data-rowid]"):
             movie_page_link = movie.css("a[data-ipshover-target]::attr(href)").get()
-            if not movie_page_link:
-                continue
-
-            if not self.check_scraped_urls(movie_page_link):
-                item = response.meta["item"].copy()
-                item["webpage_url"] = movie_page_link
-                yield response.follow(
-                    movie_page_link, self.parse_movie_page, meta={"item": item}
-                )
+            if movie_page_link:
+                movie_page_links.append(movie_page_link)
+
+        for movie_page_link in await self.filter_scraped_urls(movie_page_links):
+            item = response.meta["item"].copy()
+            item["webpage_url"] = movie_page_link
+            yield response.follow(
+                movie_page_link, self.parse_movie_page, meta={"item": item}
+            )
 
-    def check_scraped_urls(self, page_link):
-        if self.redis.sismember(self.scraped_urls_key, page_link):
-            self.logger.info(f"Skipping already scraped URL: {page_link}")
-            return True
-        return False
+    async def filter_scraped_urls(self, page_links: list[str]) -> list[str]:
+        """Return the page links not scraped yet, checking the page in one batch."""
+        is_scraped = await self.dedupe.contains_many(page_links)
+        new_links = []
+        for page_link, already_scraped in zip(page_links, is_scraped):
+            if already_scraped:
+                self.logger.info(f"Skipping already scraped URL: {page_link}")
+            else:
+                new_links.append(page_link)
+        return new_links
 
-    def parse_movie_page(self, response):
+    async def parse_movie_page(self, response):
         item = response.meta["item"].copy()
         poster = response.css(
             "div[data-commenttype='forums'] img::attr(data-src), div[data-commenttype='forums'] img::attr(src)"
@@ -187,7 +189,7 @@ class CommonTamilSpider(scrapy.Spider):
 
         if not torrent_links:
             self.logger.warning(f"No torrents found for {response.url}")
-            self.redis.sadd(self.scraped_urls_key, response.url)
+            await self.dedupe.add_many([response.url])
             return
 
         for torrent_link in torrent_links:
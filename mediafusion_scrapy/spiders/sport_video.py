@@ -3,7 +3,7 @@ from urllib.parse import urlparse
 import scrapy
 
 from utils.config import config_manager
-from db.redis_database import REDIS_SYNC_CLIENT
+from utils.dedupe import get_scraped_dedupe
 
 
 class SportVideoSpider(scrapy.Spider):
@@ -22,17 +22,14 @@ class SportVideoSpider(scrapy.Spider):
     def __init__(self, scrape_all: str = "false", *args, **kwargs):
         super(SportVideoSpider, self).__init__(*args, **kwargs)
         self.scrape_all = scrape_all.lower() == "true"
-        self.redis = REDIS_SYNC_CLIENT
         self.scraped_urls_key = "sport_video_scraped_urls"
-
-    def __del__(self):
-        self.redis.close()
+        self.dedupe = get_scraped_dedupe(self.scraped_urls_key)
 
     def start_requests(self):
         for category, url in self.categories.items():
             yield scrapy.Request(url, self.parse, meta={"category": category})
 
-    def parse(self, response, **kwargs):
+    async def parse(self, response, **kwargs):
         category = response.meta["category"]
         # Parse the current page URL to extract the base path for comparison
         current_category_base = urlparse(response.url).path.rsplit(".", 1)[0]
@@ -49,12 +46,14 @@ class SportVideoSpider(scrapy.Spider):
                         link, self.parse_page, meta={"category": category}
                     )
         # Only scrape the first page
-        yield from self.parse_page(response)
+        async for request in self.parse_page(response):
+            yield request
 
-    def parse_page(self, response):
+    async def parse_page(self, response):
         category = response.meta["category"]
         # Generalized selector for all content blocks
         content_blocks = response.css('div[id^="wb_LayoutGrid"]')
+        page_items = []
         for content in content_blocks:
             # Extract only the first part of the title
             title_words = content.css('div[id^="wb_Text"] strong::text').getall()
@@ -68,33 +67,34 @@ class SportVideoSpider(scrapy.Spider):
             # Extract torrent page link
             torrent_page_link = content.css('div[id^="wb_Shape"] a::attr(href)').get()
             if title and torrent_page_link:
-                torrent_page_link = response.urljoin(torrent_page_link)
-                # Check if URL has been scraped before
-                if self.redis.sismember(self.scraped_urls_key, torrent_page_link):
-                    self.logger.info(
-                        f"Skipping already scraped URL: {torrent_page_link}"
-                    )
-                    continue
-
-                yield response.follow(
-                    torrent_page_link,
-                    self.parse_torrent_page,
-                    meta={
-                        "item": {
-                            "title": title.strip(),
-                            "poster": poster,
-                            "background": poster,
-                            "webpage_url": torrent_page_link,
-                            "parsed_data": {"title": title.strip()},
-                            "source": "sport-video.org.ua",
-                            "is_add_title_to_poster": True,
-                            "catalog": category,
-                            "type": "movie",
-                            "scraped_url_key": self.scraped_urls_key,
-                        }
-                    },
+                page_items.append(
+                    {
+                        "title": title.strip(),
+                        "poster": poster,
+                        "background": poster,
+                        "webpage_url": response.urljoin(torrent_page_link),
+                        "parsed_data": {"title": title.strip()},
+                        "source": "sport-video.org.ua",
+                        "is_add_title_to_poster": True,
+                        "catalog": category,
+                        "type": "movie",
+                        "scraped_url_key": self.scraped_urls_key,
+                    }
                 )
 
+        # Check if the URLs have been scraped before, one batch per page
+        is_scraped = await self.dedupe.contains_many(
+            [item["webpage_url"] for item in page_items]
+        )
+        for item, already_scraped in zip(page_items, is_scraped):
+            if already_scraped:
+                self.logger.info(f"Skipping already scraped URL: {item['webpage_url']}")
+                continue
+
+            yield response.follow(
+                item["webpage_url"], self.parse_torrent_page, meta={"item": item}
+            )
+
     def parse_torrent_page(self, response):
         # Retrieve passed item data
         base_item = response.meta["item"]
@@ -12,7 +12,7 @@ from db.models import TorrentStreams
 from utils.config import config_manager
 from utils.parser import convert_size_to_bytes
 from utils.runtime_const import SPORTS_ARTIFACTS
-from db.redis_database import REDIS_ASYNC_CLIENT
+from utils.dedupe import get_scraped_dedupe
 from utils.torrent import parse_magnet
 
 
@@ -33,10 +33,7 @@ class TgxSpider(scrapy.Spider):
         super(TgxSpider, self).__init__(*args, **kwargs)
         self.scrape_all = scrape_all.lower() == "true"
         self.total_pages = total_pages
-        self.redis = REDIS_ASYNC_CLIENT
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.redis.aclose()
+        self.dedupe = get_scraped_dedupe(self.scraped_info_hash_key)
 
     def start_requests(self):
         for uploader_profile in self.uploader_profiles:
@@ -139,6 +136,7 @@ class TgxSpider(scrapy.Spider):
             self.logger.info(f"Scraping torrents from search query: {response.url}")
 
         # Extract torrents from the page
+        page_torrents = []
         for torrent in response.css("div.tgxtablerow.txlight"):
             torrent_page_relative_link = torrent.css("div#click::attr(data-href)").get()
 
@@ -198,14 +196,25 @@ class TgxSpider(scrapy.Spider):
                 "expected_sources": ["TorrentGalaxy", "Contribution Stream"],
             }
 
-            if await self.redis.sismember(self.scraped_info_hash_key, info_hash):
-                self.logger.info(f"Torrent already scraped: {torrent_name}")
-                await TorrentStreams.find_one({"_id": info_hash}).update(
-                    {"$set": {"seeders": seeders}},
+            page_torrents.append(torrent_data)
+
+        # Check the whole page against the already scraped torrents at once
+        is_scraped = await self.dedupe.contains_many(
+            [torrent_data["info_hash"] for torrent_data in page_torrents]
+        )
+        for torrent_data, already_scraped in zip(page_torrents, is_scraped):
+            if already_scraped:
+                self.logger.info(
+                    f"Torrent already scraped: {torrent_data['torrent_name']}"
+                )
+                await TorrentStreams.find_one(
+                    {"_id": torrent_data["info_hash"]}
+                ).update(
+                    {"$set": {"seeders": torrent_data["seeders"]}},
                 )
             else:
                 yield response.follow(
-                    torrent_page_link,
+                    torrent_data["website"],
                     self.parse_torrent_details,
                     meta={
                         "playwright": True,
@@ -222,7 +231,7 @@ class TgxSpider(scrapy.Spider):
                             ),
                         ],
                         "torrent_data": torrent_data,
-                        "torrent_page_link": torrent_page_link,
+                        "torrent_page_link": torrent_data["website"],
                     },
                 )
 
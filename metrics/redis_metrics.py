@@ -4,6 +4,7 @@ from typing import Dict, Any
 
 import humanize
 from db.redis_database import REDIS_ASYNC_CLIENT, REDIS_SYNC_CLIENT
+from streaming_providers.compact_cache import compact_debrid_cache
 
 
 async def get_redis_metrics() -> Dict[str, Any]:
@@ -135,6 +136,14 @@ async def get_debrid_cache_metrics() -> Dict[str, Any]:
             if cache_size > 0:  # Only include services with cached torrents
                 metrics["services"][service] = {"cached_torrents": cache_size}
 
+        for service in await compact_debrid_cache.get_services():
+            cache_size = await compact_debrid_cache.count(service)
+            if cache_size > 0:
+                service_metrics = metrics["services"].setdefault(
+                    service, {"cached_torrents": 0}
+                )
+                service_metrics["cached_torrents"] += cache_size
+
         # Sort services by cache size
         metrics["services"] = dict(
             sorted(
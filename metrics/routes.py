@@ -6,14 +6,17 @@ import humanize
 from fastapi import APIRouter, Request, Response
 from prometheus_client import Gauge, generate_latest, CONTENT_TYPE_LATEST
 
+from api.middleware import user_data_cache, user_data_decrypt_timer
 from db.config import settings
 from db.crud import fetch_last_run
+from db.local_cache import local_cache
 from db.models import (
     MediaFusionMetaData,
     TorrentStreams,
 )
 from db.redis_database import REDIS_ASYNC_CLIENT
 from metrics.redis_metrics import get_redis_metrics, get_debrid_cache_metrics
+from scrapers.base_scraper import BackgroundScraperManager
 from utils import const
 from utils.runtime_const import TEMPLATES
 
@@ -167,6 +170,30 @@ async def debrid_cache_metrics():
     return await get_debrid_cache_metrics()
 
 
+@metrics_router.get("/background-search")
+async def background_search_metrics(response: Response):
+    """
+    Get queue depth, lease state and hourly throughput of the background search.
+    """
+    response.headers.update(const.NO_CACHE_HEADERS)
+    return await BackgroundScraperManager().get_stats()
+
+
+@metrics_router.get("/local-cache")
+async def local_cache_metrics():
+    """
+    Get hit/miss/eviction statistics of this worker's in-process caches.
+    Prometheus counters for all workers are exported via /prometheus-metrics.
+    """
+    return {
+        "redis_l1": local_cache.stats(),
+        "user_data": {
+            **user_data_cache.stats(),
+            "saved_seconds": round(user_data_decrypt_timer.saved_seconds, 3),
+        },
+    }
+
+
 @metrics_router.get("/torrents/uploaders", tags=["metrics"])
 async def get_torrents_by_uploaders(response: Response):
     response.headers.update(const.NO_CACHE_HEADERS)
@@ -205,7 +232,7 @@ async def get_weekly_top_uploaders(response: Response):
                         {"created_at": {"$gte": start_of_week}},
                         {"uploaded_at": {"$gte": start_of_week}},
                     ],
-                    "is_blocked": {"$ne": True},
+                    "is_blocked": False,
                 }
             },
             {
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from beanie import Document, free_fall_migration
+
+
+class TorrentStreams(Document):
+    id: str
+    meta_id: str
+    is_blocked: Optional[bool] = False
+
+    class Settings:
+        name = "TorrentStreams"
+
+
+class Forward:
+    @free_fall_migration(document_models=[TorrentStreams])
+    async def normalize_blocked_flag(self, session):
+        """
+        Set is_blocked on streams missing it. The stream lookups match
+        is_blocked: False to use the partial stream indexes, streams without
+        the field would be hidden from them.
+        """
+        result = await TorrentStreams.get_motor_collection().update_many(
+            {"is_blocked": {"$nin": [True, False]}}, {"$set": {"is_blocked": False}}
+        )
+        print(f"Set is_blocked on {result.modified_count} streams")
+        print("Forward migration completed successfully")
+
+
+class Backward:
+    @free_fall_migration(document_models=[TorrentStreams])
+    async def keep_blocked_flag(self, session):
+        """is_blocked: False is the model default, there is nothing to revert"""
+        print("Backward migration completed successfully")
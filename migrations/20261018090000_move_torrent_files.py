@@ -0,0 +1,144 @@
+import time
+from datetime import datetime
+
+from beanie import Document, free_fall_migration
+from pydantic import Field
+from pymongo import UpdateOne
+
+BATCH_SIZE = 500
+LATENCY_SAMPLE_SIZE = 200
+
+
+class TorrentStreams(Document):
+    id: str
+    meta_id: str
+
+    class Settings:
+        name = "TorrentStreams"
+
+
+class TorrentFile(Document):
+    id: str
+    content: bytes
+    created_at: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        name = "TorrentFile"
+
+
+async def get_document_size_stats(collection) -> dict:
+    result = await collection.aggregate(
+        [
+            {
+                "$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "avg_size": {"$avg": {"$bsonSize": "$$ROOT"}},
+                    "max_size": {"$max": {"$bsonSize": "$$ROOT"}},
+                    "total_size": {"$sum": {"$bsonSize": "$$ROOT"}},
+                }
+            }
+        ]
+    ).to_list(None)
+    return result[0] if result else {"count": 0, "avg_size": 0, "max_size": 0}
+
+
+async def get_lookup_latency_p95(collection, meta_ids: list[str]) -> float:
+    """p95 latency in ms of the stream lookup query of get_cached_torrent_streams"""
+    latencies = []
+    for meta_id in meta_ids:
+        start = time.perf_counter()
+        await collection.find({"meta_id": meta_id, "is_blocked": False}).to_list(None)
+        latencies.append((time.perf_counter() - start) * 1000)
+    if not latencies:
+        return 0.0
+    latencies.sort()
+    return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+
+async def report(collection, meta_ids: list[str], label: str):
+    stats = await get_document_size_stats(collection)
+    p95 = await get_lookup_latency_p95(collection, meta_ids)
+    print(
+        f"{label}: {stats['count']} streams, avg document size "
+        f"{stats['avg_size'] or 0:.0f} bytes, max {stats['max_size'] or 0} bytes, "
+        f"stream lookup p95 {p95:.1f}ms over {len(meta_ids)} titles"
+    )
+
+
+class Forward:
+    @free_fall_migration(document_models=[TorrentStreams, TorrentFile])
+    async def move_torrent_files(self, session):
+        """Move the torrent_file blobs of TorrentStreams into TorrentFile"""
+        stream_collection = TorrentStreams.get_motor_collection()
+        torrent_file_collection = TorrentFile.get_motor_collection()
+
+        meta_ids = [
+            doc["_id"]
+            for doc in await stream_collection.aggregate(
+                [
+                    {"$sample": {"size": LATENCY_SAMPLE_SIZE}},
+                    {"$group": {"_id": "$meta_id"}},
+                ]
+            ).to_list(None)
+        ]
+        await report(stream_collection, meta_ids, "Before")
+
+        print("Copying torrent files...")
+        moved = 0
+        operations = []
+        async for doc in stream_collection.find(
+            {"torrent_file": {"$type": "binData"}},
+            projection={"torrent_file": 1},
+        ):
+            operations.append(
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {
+                        "$set": {
+                            "content": doc["torrent_file"],
+                            "created_at": datetime.now(),
+                        }
+                    },
+                    upsert=True,
+                )
+            )
+            if len(operations) >= BATCH_SIZE:
+                await torrent_file_collection.bulk_write(operations, ordered=False)
+                moved += len(operations)
+                operations = []
+        if operations:
+            await torrent_file_collection.bulk_write(operations, ordered=False)
+            moved += len(operations)
+        print(f"Copied {moved} torrent files")
+
+        result = await stream_collection.update_many(
+            {"torrent_file": {"$exists": True}}, {"$unset": {"torrent_file": ""}}
+        )
+        print(f"Removed torrent_file from {result.modified_count} streams")
+
+        await report(stream_collection, meta_ids, "After")
+        print("Forward migration completed successfully")
+
+
+class Backward:
+    @free_fall_migration(document_models=[TorrentStreams, TorrentFile])
+    async def restore_torrent_files(self, session):
+        """Copy the torrent files back into TorrentStreams"""
+        torrent_file_collection = TorrentFile.get_motor_collection()
+
+        await torrent_file_collection.aggregate(
+            [
+                {"$project": {"_id": 1, "torrent_file": "$content"}},
+                {
+                    "$merge": {
+                        "into": "TorrentStreams",
+                        "on": "_id",
+                        "whenMatched": "merge",
+                        "whenNotMatched": "discard",
+                    }
+                },
+            ]
+        ).to_list(None)
+        await torrent_file_collection.drop()
+        print("Backward migration completed successfully")
@@ -486,6 +486,96 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     };
 
+    const renderBackgroundSearchMetrics = async () => {
+        const data = await fetchData('/metrics/background-search');
+        removeLoadingElement('backgroundSearchSkeleton');
+
+        document.getElementById('backgroundSearchQueue').textContent = ['movie', 'series']
+            .map(type => `${type}: ${data[type].queued.toLocaleString()} queued, ` +
+                `${data[type].due.toLocaleString()} due, ${data[type].leased} leased, ` +
+                `${data[type].stale_leases} stale`)
+            .join(' | ');
+
+        const ctx = document.getElementById('backgroundSearchChart').getContext('2d');
+        const labels = data.movie.throughput.map(slot => new Date(slot.hour).toLocaleTimeString([], {
+            hour: '2-digit',
+            minute: '2-digit'
+        }));
+
+        new Chart(ctx, {
+            type: 'bar',
+            data: {
+                labels: labels,
+                datasets: [
+                    {
+                        label: 'Movies',
+                        data: data.movie.throughput.map(slot => slot.success),
+                        backgroundColor: 'rgba(54, 162, 235, 0.6)',
+                        stack: 'movie'
+                    },
+                    {
+                        label: 'Movie Errors',
+                        data: data.movie.throughput.map(slot => slot.error),
+                        backgroundColor: 'rgba(255, 99, 132, 0.6)',
+                        stack: 'movie'
+                    },
+                    {
+                        label: 'Series Episodes',
+                        data: data.series.throughput.map(slot => slot.success),
+                        backgroundColor: 'rgba(75, 192, 192, 0.6)',
+                        stack: 'series'
+                    },
+                    {
+                        label: 'Series Errors',
+                        data: data.series.throughput.map(slot => slot.error),
+                        backgroundColor: 'rgba(255, 159, 64, 0.6)',
+                        stack: 'series'
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: {
+                        labels: {
+                            color: '#fff'
+                        }
+                    },
+                    datalabels: {
+                        display: false
+                    }
+                },
+                scales: {
+                    y: {
+                        stacked: true,
+                        beginAtZero: true,
+                        title: {
+                            display: true,
+                            text: 'Items Processed',
+                            color: '#fff'
+                        },
+                        ticks: {
+                            color: '#fff'
+                        },
+                        grid: {
+                            color: 'rgba(255, 255, 255, 0.1)'
+                        }
+                    },
+                    x: {
+                        stacked: true,
+                        ticks: {
+                            color: '#fff'
+                        },
+                        grid: {
+                            display: false
+                        }
+                    }
+                }
+            }
+        });
+    };
+
     const initCharts = () => {
         renderSchedulerDetails();
         renderMetadataCountsChart();
@@ -494,6 +584,7 @@ document.addEventListener('DOMContentLoaded', function () {
         renderTorrentUploadersChart();
         renderWeeklyUploadersChart();
         renderDebridCacheMetrics();
+        renderBackgroundSearchMetrics();
     };
 
     Chart.register(ChartDataLabels);
@@ -1,12 +1,19 @@
 import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import timedelta
-from typing import List
+from typing import Any, AsyncGenerator, Dict, List, Type
 
 import dramatiq
 
 from db.config import settings
-from db.models import MediaFusionMovieMetaData, MediaFusionSeriesMetaData
+from db.models import (
+    MediaFusionMetaData,
+    MediaFusionMovieMetaData,
+    MediaFusionSeriesMetaData,
+    TorrentStreams,
+)
 from scrapers.base_scraper import IndexerBaseScraper, BackgroundScraperManager
 from scrapers.jackett import JackettScraper
 from scrapers.prowlarr import ProwlarrScraper
@@ -14,178 +21,273 @@ from scrapers.prowlarr import ProwlarrScraper
 logger = logging.getLogger(__name__)
 
 
-class BackgroundSearchWorker:
-    def __init__(self):
-        self.manager = BackgroundScraperManager()
-        # Initialize scrapers based on settings
-        self.scrapers: List[IndexerBaseScraper] = []
-        if settings.is_scrap_from_jackett:
-            self.scrapers.append(JackettScraper())
-        if settings.is_scrap_from_prowlarr:
-            self.scrapers.append(ProwlarrScraper())
+class IndexerBudget:
+    """Concurrency and request rate limit of a single indexer"""
 
-    async def process_movie_batch(self):
-        """Process a batch of pending movies with complete scraping"""
-        if not self.scrapers:
-            logger.warning("No scrapers enabled for background search")
-            return
+    def __init__(self, concurrency: int, rate_per_minute: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 60 / rate_per_minute if rate_per_minute else 0
+        self.next_request = 0.0
+        self.lock = asyncio.Lock()
 
-        pending_movies = await self.manager.get_pending_items("movie")
-        logger.info(f"Background search found {len(pending_movies)} movies to process")
+    @asynccontextmanager
+    async def acquire(self):
+        async with self.semaphore:
+            if self.interval:
+                async with self.lock:
+                    now = time.monotonic()
+                    wait = self.next_request - now
+                    self.next_request = max(now, self.next_request) + self.interval
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            yield
 
-        for item in pending_movies:
-            meta_id = item["key"]
-            await self.manager.mark_as_processing(meta_id)
 
-            try:
-                metadata = await MediaFusionMovieMetaData.get(meta_id)
-                if not metadata:
-                    continue
+class IndexerBudgets:
+    """
+    Per-indexer budgets shared by every item of a background search worker,
+    so concurrent items never exceed the limits of any single indexer.
+    """
 
-                # Process each scraper sequentially for complete scraping
-                processed_info_hashes: set[str] = set()
-                for scraper in self.scrapers:
-                    # Get healthy indexers
-                    healthy_indexers = await scraper.get_healthy_indexers()
-                    if not healthy_indexers:
-                        continue
+    def __init__(self):
+        self.budgets: Dict[str, IndexerBudget] = {}
 
-                    # Split indexers into chunks
-                    indexer_chunks = list(
-                        scraper.split_indexers_into_chunks(healthy_indexers, 3)
-                    )
+    def register(self, scraper: IndexerBaseScraper, indexers: List[dict]):
+        """Create budgets for the healthy indexers of a scraper"""
+        for indexer in indexers:
+            self.get(scraper, indexer["id"])
 
-                    # Start metrics collection
-                    scraper.metrics.start()
-                    scraper.metrics.meta_data = metadata
-
-                    # Create generators for title-based search
-                    title_streams_generators = []
-                    for chunk in indexer_chunks:
-                        for query_template in scraper.MOVIE_SEARCH_QUERY_TEMPLATES:
-                            search_query = query_template.format(
-                                title=metadata.title, year=metadata.year
-                            )
-                            title_streams_generators.append(
-                                scraper.scrape_movie_by_title(
-                                    processed_info_hashes,
-                                    metadata,
-                                    search_query=search_query,
-                                    indexers=chunk,
-                                )
-                            )
-                        if settings.scrape_with_aka_titles:
-                            for aka_title in metadata.aka_titles:
-                                title_streams_generators.append(
-                                    scraper.scrape_movie_by_title(
-                                        processed_info_hashes,
-                                        metadata,
-                                        search_query=aka_title,
-                                        indexers=chunk,
-                                    )
-                                )
-
-                    # Process all streams without time limit
-                    try:
-                        async for stream in scraper.process_streams(
-                            *title_streams_generators,
-                            max_process=None,  # No limit for background
-                            max_process_time=None,  # No time limit for background
-                        ):
-                            await scraper.store_streams([stream])
-                    finally:
-                        scraper.metrics.stop()
-                        scraper.metrics.log_summary(scraper.logger)
+    def get(self, scraper: IndexerBaseScraper, indexer_id: Any) -> IndexerBudget:
+        key = f"{scraper.cache_key_prefix}:{indexer_id}"
+        if key not in self.budgets:
+            self.budgets[key] = IndexerBudget(
+                settings.background_search_indexer_concurrency,
+                settings.background_search_indexer_rate_per_minute,
+            )
+        return self.budgets[key]
 
-            except Exception as e:
-                logger.exception(f"Error processing movie {meta_id}: {e}")
-            finally:
-                await self.manager.mark_as_completed(
-                    meta_id, self.manager.movie_hash_key
+    async def fetch_search_results(
+        self, scraper: IndexerBaseScraper, params: dict, indexer_ids: List[Any]
+    ) -> List[Dict[str, Any]]:
+        """Query each indexer separately within its budget"""
+
+        async def fetch(indexer_id):
+            async with self.get(scraper, indexer_id).acquire():
+                return await scraper.fetch_search_results(
+                    params,
+                    indexer_ids=[indexer_id],
+                    timeout=scraper.search_query_timeout,
                 )
 
+        results = await asyncio.gather(*(fetch(i) for i in indexer_ids))
+        return [item for indexer_results in results for item in indexer_results]
+
+
+class BackgroundSearchWorker:
+    def __init__(self):
+        self.manager = BackgroundScraperManager()
+        # Scrapers are created per item, as their metrics and indexer state
+        # belong to a single search
+        self.scraper_classes: List[Type[IndexerBaseScraper]] = []
+        if settings.is_scrap_from_jackett:
+            self.scraper_classes.append(JackettScraper)
+        if settings.is_scrap_from_prowlarr:
+            self.scraper_classes.append(ProwlarrScraper)
+        self.indexer_budgets = IndexerBudgets()
+        # Bounds the items processed at once across movies and series
+        self.item_slots = asyncio.Semaphore(settings.background_search_concurrency)
+
+    async def process_movie_batch(self):
+        """Process a batch of pending movies with complete scraping"""
+        await self.process_batch("movie")
+
     async def process_series_batch(self):
         """Process a batch of pending series episodes with complete scraping"""
-        if not self.scrapers:
+        await self.process_batch("series")
+
+    async def process_batch(self, item_type: str):
+        if not self.scraper_classes:
             logger.warning("No scrapers enabled for background search")
             return
 
-        pending_series = await self.manager.get_pending_items("series")
+        pending_items = await self.manager.claim_items(item_type)
         logger.info(
-            f"Background search found {len(pending_series)} series episodes to process"
+            f"Background search found {len(pending_items)} {item_type} items to process"
         )
+        if not pending_items:
+            return
 
-        for item in pending_series:
-            key = item["key"]
-            meta_id, season, episode = key.split(":")
-            season = int(season)
-            episode = int(episode)
-            await self.manager.mark_as_processing(key)
+        start_time = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.process_item(item_key, item_type) for item_key in pending_items)
+        )
+        duration = time.perf_counter() - start_time
+        items_per_hour = len(pending_items) * 3600 / duration if duration else 0.0
+        logger.info(
+            f"Background search {item_type} batch summary: "
+            f"{len(pending_items)} items in {duration:.1f}s "
+            f"({results.count('success')} succeeded, {results.count('error')} failed, "
+            f"{results.count('missing')} missing), throughput {items_per_hour:.1f} "
+            f"items/hour"
+        )
 
+    async def process_item(self, item_key: str, item_type: str) -> str:
+        async with self.item_slots:
+            start_time = time.perf_counter()
+            result = "success"
             try:
-                metadata = await MediaFusionSeriesMetaData.get(meta_id)
+                if item_type == "movie":
+                    metadata = await MediaFusionMovieMetaData.get(item_key)
+                    season = episode = None
+                else:
+                    meta_id, season, episode = item_key.split(":")
+                    season, episode = int(season), int(episode)
+                    metadata = await MediaFusionSeriesMetaData.get(meta_id)
                 if not metadata:
-                    continue
+                    result = "missing"
+                    await self.manager.remove_item(item_key, item_type)
+                    return result
 
-                # Process each scraper sequentially for complete scraping
+                completed_units = await self.manager.get_completed_units(
+                    item_key, item_type
+                )
+                if completed_units:
+                    logger.info(
+                        f"Resuming {item_type} {item_key}, "
+                        f"{len(completed_units)} search units already done"
+                    )
                 processed_info_hashes: set[str] = set()
-                for scraper in self.scrapers:
+                for scraper_class in self.scraper_classes:
+                    await self.manager.renew_lease(item_key, item_type)
+                    async with scraper_class() as scraper:
+                        await self.run_scraper(
+                            scraper,
+                            item_key,
+                            item_type,
+                            metadata,
+                            season,
+                            episode,
+                            processed_info_hashes,
+                            completed_units,
+                        )
+            except Exception as e:
+                result = "error"
+                logger.exception(f"Error processing {item_type} {item_key}: {e}")
+            finally:
+                if result != "missing":
+                    try:
+                        await self.manager.mark_as_completed(item_key, item_type)
+                    except Exception as e:
+                        logger.error(f"Error completing {item_type} {item_key}: {e}")
+                await self.manager.record_processed(
+                    item_type, result, time.perf_counter() - start_time
+                )
+            return result
 
-                    # Get healthy indexers
-                    healthy_indexers = await scraper.get_healthy_indexers()
-                    if not healthy_indexers:
-                        continue
+    async def run_scraper(
+        self,
+        scraper: IndexerBaseScraper,
+        item_key: str,
+        item_type: str,
+        metadata: MediaFusionMetaData,
+        season: int | None,
+        episode: int | None,
+        processed_info_hashes: set[str],
+        completed_units: set[str],
+    ):
+        """Run the pending search units of one scraper for an item concurrently"""
+        healthy_indexers = await scraper.get_healthy_indexers()
+        if not healthy_indexers:
+            return
+        self.indexer_budgets.register(scraper, healthy_indexers)
+        scraper.indexer_budgets = self.indexer_budgets
 
-                    # Split indexers into chunks
-                    indexer_chunks = list(
-                        scraper.split_indexers_into_chunks(healthy_indexers, 3)
+        scraper.metrics.start()
+        scraper.metrics.meta_data = metadata
+        scraper.metrics.season = season
+        scraper.metrics.episode = episode
+        try:
+            units = []
+            for chunk in scraper.split_indexers_into_chunks(healthy_indexers, 3):
+                chunk_ids = ",".join(str(indexer["id"]) for indexer in chunk)
+                for search_query in self.get_search_queries(
+                    scraper, metadata, item_type, season, episode
+                ):
+                    unit = f"{scraper.cache_key_prefix}:{chunk_ids}:{search_query}"
+                    if unit in completed_units:
+                        continue
+                    if item_type == "movie":
+                        streams_generator = scraper.scrape_movie_by_title(
+                            processed_info_hashes,
+                            metadata,
+                            search_query=search_query,
+                            indexers=chunk,
+                        )
+                    else:
+                        streams_generator = scraper.scrape_series_by_title(
+                            processed_info_hashes,
+                            metadata,
+                            season,
+                            episode,
+                            search_query=search_query,
+                            indexers=chunk,
+                        )
+                    units.append(
+                        self.run_search_unit(
+                            scraper, item_key, item_type, unit, streams_generator
+                        )
                     )
+            await asyncio.gather(*units)
+        finally:
+            scraper.metrics.stop()
+            scraper.metrics.log_summary(scraper.logger)
 
-                    # Start metrics collection
-                    scraper.metrics.start()
-                    scraper.metrics.meta_data = metadata
-                    scraper.metrics.season = season
-                    scraper.metrics.episode = episode
-
-                    # Create generators for title-based search
-                    title_streams_generators = []
-                    for chunk in indexer_chunks:
-                        for query_template in scraper.SERIES_SEARCH_QUERY_TEMPLATES:
-                            search_query = query_template.format(
-                                title=metadata.title, season=season, episode=episode
-                            )
-                            title_streams_generators.append(
-                                scraper.scrape_series_by_title(
-                                    processed_info_hashes,
-                                    metadata,
-                                    season,
-                                    episode,
-                                    search_query=search_query,
-                                    indexers=chunk,
-                                )
-                            )
-
-                    # Process all streams without time limit
-                    try:
-                        async for stream in scraper.process_streams(
-                            *title_streams_generators,
-                            max_process=None,  # No limit for background
-                            max_process_time=None,  # No time limit for background
-                            catalog_type="series",
-                            season=season,
-                            episode=episode,
-                        ):
-                            await scraper.store_streams([stream])
-                    finally:
-                        scraper.metrics.stop()
-                        scraper.metrics.log_summary(scraper.logger)
-
-            except Exception as e:
-                logger.exception(
-                    f"Error processing series {meta_id} S{season}E{episode}: {e}"
+    @staticmethod
+    def get_search_queries(
+        scraper: IndexerBaseScraper,
+        metadata: MediaFusionMetaData,
+        item_type: str,
+        season: int | None,
+        episode: int | None,
+    ) -> List[str]:
+        if item_type == "series":
+            return [
+                query_template.format(
+                    title=metadata.title, season=season, episode=episode
                 )
-            finally:
-                await self.manager.mark_as_completed(key, self.manager.series_hash_key)
+                for query_template in scraper.SERIES_SEARCH_QUERY_TEMPLATES
+            ]
+
+        queries = [
+            query_template.format(title=metadata.title, year=metadata.year)
+            for query_template in scraper.MOVIE_SEARCH_QUERY_TEMPLATES
+        ]
+        if settings.scrape_with_aka_titles:
+            queries.extend(metadata.aka_titles)
+        return queries
+
+    async def run_search_unit(
+        self,
+        scraper: IndexerBaseScraper,
+        item_key: str,
+        item_type: str,
+        unit: str,
+        streams_generator: AsyncGenerator[TorrentStreams, None],
+    ):
+        """
+        Store the streams of one search query on one indexer chunk and persist
+        the unit as done once all of them are stored.
+        """
+        try:
+            async for stream in streams_generator:
+                await scraper.store_streams([stream])
+            await self.manager.mark_unit_completed(item_key, item_type, unit)
+            await self.manager.renew_lease(item_key, item_type)
+        except Exception as e:
+            scraper.metrics.record_error("search_unit_error")
+            scraper.logger.exception(
+                f"Error in background search unit {unit} of {item_key}: {e}"
+            )
 
 
 @dramatiq.actor(
@@ -201,8 +303,9 @@ async def run_background_search(**kwargs):
     await database.init()
     worker = BackgroundSearchWorker()
 
-    # Clean up any stale processing items
-    await worker.manager.cleanup_stale_processing()
+    # Import the legacy queue once and requeue items with expired leases
+    await worker.manager.migrate_legacy_queue()
+    await worker.manager.recover_stale_leases()
 
     # Process movies and series concurrently
     await asyncio.gather(worker.process_movie_batch(), worker.process_series_batch())
@@ -13,8 +13,8 @@ from typing import Dict
 from typing import List
 from typing import Optional
 
-import PTT
 import httpx
+from prometheus_client import Counter as PrometheusCounter, Histogram
 from ratelimit import limits, sleep_and_retry
 from tenacity import retry, stop_after_attempt, wait_exponential
 from torf import Magnet, MagnetError
@@ -31,8 +31,10 @@ from db.models import (
 from db.redis_database import REDIS_ASYNC_CLIENT
 from scrapers import torrent_info
 from scrapers.imdb_data import get_episode_by_date
+from scrapers.indexer_registry import get_indexer_registry
 from utils.network import batch_process_with_circuit_breaker, CircuitBreaker
 from utils.parser import calculate_max_similarity_ratio, is_contain_18_plus_keywords
+from utils.title_parser import parse_title
 from utils.torrent import extract_torrent_metadata, info_hashes_to_torrent_metadata
 
 
@@ -127,10 +129,16 @@ class ScraperMetrics:
     def get_summary(self) -> Dict:
         """Generate a summary of the metrics"""
         duration = (self.end_time or datetime.now()) - self.start_time
+        duration_seconds = duration.total_seconds()
 
         return {
             "scraper_name": self.scraper_name,
-            "duration_seconds": duration.total_seconds(),
+            "duration_seconds": duration_seconds,
+            "streams_per_hour": (
+                self.total_items_processed * 3600 / duration_seconds
+                if duration_seconds
+                else 0.0
+            ),
             "total_items": {
                 "found": self.total_items_found,
                 "processed": self.total_items_processed,
@@ -173,6 +181,7 @@ class ScraperMetrics:
 
         # Duration
         lines.append(f"Duration: {summary['duration_seconds']:.2f} seconds")
+        lines.append(f"Throughput: {summary['streams_per_hour']:.1f} streams/hour")
         lines.append("")
 
         # Items Summary
@@ -609,19 +618,107 @@ class BaseScraper(abc.ABC):
         await REDIS_ASYNC_CLIENT.zremrangebyscore(scraper_prefix, 0, current_time - ttl)
 
 
+# Queue score: the next due timestamp, moved earlier by log2(1 + requests)
+# times the popularity weight so frequently requested titles run first.
+ENQUEUE_SCRIPT = """
+local requests = redis.call('HINCRBY', KEYS[4], ARGV[1], 1)
+local due = redis.call('HGET', KEYS[3], ARGV[1])
+if not due then
+    due = ARGV[2]
+    redis.call('HSET', KEYS[3], ARGV[1], due)
+end
+if redis.call('ZSCORE', KEYS[2], ARGV[1]) then
+    return 0
+end
+local score = tonumber(due) - tonumber(ARGV[3]) * math.log(1 + requests) / math.log(2)
+redis.call('ZADD', KEYS[1], score, ARGV[1])
+return 1
+"""
+
+# Move up to ARGV[3] due items from the queue to the leases with expiry ARGV[2]
+CLAIM_SCRIPT = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[3])
+for _, item in ipairs(items) do
+    redis.call('ZREM', KEYS[1], item)
+    redis.call('ZADD', KEYS[2], ARGV[2], item)
+end
+return items
+"""
+
+# Release the lease and requeue the item for its next due time, halving its
+# request count so past popularity fades
+COMPLETE_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[2])
+local requests = math.floor(tonumber(redis.call('HGET', KEYS[4], ARGV[1]) or 0) / 2)
+redis.call('HSET', KEYS[4], ARGV[1], requests)
+local score = tonumber(ARGV[2]) - tonumber(ARGV[3]) * math.log(1 + requests) / math.log(2)
+redis.call('ZADD', KEYS[1], score, ARGV[1])
+return 1
+"""
+
+# Requeue the items whose lease expired without completion
+RECOVER_SCRIPT = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, item in ipairs(items) do
+    redis.call('ZREM', KEYS[2], item)
+    local due = tonumber(redis.call('HGET', KEYS[3], item) or ARGV[1])
+    local requests = tonumber(redis.call('HGET', KEYS[4], item) or 0)
+    local score = due - tonumber(ARGV[2]) * math.log(1 + requests) / math.log(2)
+    redis.call('ZADD', KEYS[1], score, item)
+end
+return #items
+"""
+
+background_search_items = PrometheusCounter(
+    "background_search_items_total",
+    "Background search items processed, labeled by item type and result",
+    labelnames=["item_type", "result"],
+)
+background_search_duration = Histogram(
+    "background_search_item_seconds",
+    "Time spent on one background search item",
+    labelnames=["item_type"],
+    buckets=(5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
+
+
 class BackgroundScraperManager:
+    """
+    Redis work queue for background title searches. Each item type has a
+    ZSET of queued items scored by popularity-weighted due time and a ZSET of
+    claimed items scored by lease expiry; due times and request counts are
+    kept in hashes. Claims, completions and stale-lease recovery are atomic
+    Lua scripts.
+    """
+
+    item_types = ("movie", "series")
+
     def __init__(self):
         self.movie_hash_key = "background_search:movies"
         self.series_hash_key = "background_search:series"
         self.processing_set_key = "background_search:processing"
-        self.batch_size = 10  # Number of items to process in each batch
+        self.batch_size = settings.background_search_batch_size
+        self.lease_seconds = settings.background_search_lease_seconds
+        self.popularity_weight = settings.background_search_popularity_weight
+        self._enqueue = REDIS_ASYNC_CLIENT.register_script(ENQUEUE_SCRIPT)
+        self._claim = REDIS_ASYNC_CLIENT.register_script(CLAIM_SCRIPT)
+        self._complete = REDIS_ASYNC_CLIENT.register_script(COMPLETE_SCRIPT)
+        self._recover = REDIS_ASYNC_CLIENT.register_script(RECOVER_SCRIPT)
+
+    @staticmethod
+    def get_keys(item_type: str) -> List[str]:
+        """Queue, leases, due times and request counts of an item type."""
+        return [
+            f"background_search:{item_type}:{name}"
+            for name in ("queue", "leases", "due", "requests")
+        ]
 
     async def add_movie_to_queue(self, meta_id: str) -> None:
         """Add a movie to the background search queue"""
-        await REDIS_ASYNC_CLIENT.hset(
-            self.movie_hash_key,
-            meta_id,
-            json.dumps({"last_scrape": None, "added_at": datetime.now().timestamp()}),
+        await self._enqueue(
+            keys=self.get_keys("movie"),
+            args=[meta_id, time.time(), self.popularity_weight],
         )
 
     async def add_series_to_queue(
@@ -629,61 +726,159 @@ class BackgroundScraperManager:
     ) -> None:
         """Add a series episode to the background search queue"""
         key = f"{meta_id}:{season}:{episode}"
-        await REDIS_ASYNC_CLIENT.hset(
-            self.series_hash_key,
-            key,
-            json.dumps({"last_scrape": None, "added_at": datetime.now().timestamp()}),
+        await self._enqueue(
+            keys=self.get_keys("series"),
+            args=[key, time.time(), self.popularity_weight],
         )
 
-    async def get_pending_items(self, item_type: str) -> List[Dict]:
-        """Get items that need to be scraped"""
-        hash_key = self.movie_hash_key if item_type == "movie" else self.series_hash_key
-        cutoff_time = datetime.now() - timedelta(
-            hours=settings.background_search_interval_hours
+    async def claim_items(self, item_type: str) -> List[str]:
+        """Atomically lease the next batch of due items"""
+        now = time.time()
+        items = await self._claim(
+            keys=self.get_keys(item_type)[:2],
+            args=[now, now + self.lease_seconds, self.batch_size],
+        )
+        return [item.decode("utf-8") for item in items]
+
+    async def renew_lease(self, item_key: str, item_type: str) -> None:
+        """Extend the lease of an item that is still being processed"""
+        await REDIS_ASYNC_CLIENT.zadd(
+            self.get_keys(item_type)[1],
+            {item_key: time.time() + self.lease_seconds},
+            xx=True,
         )
 
-        # Get all items
-        all_items = await REDIS_ASYNC_CLIENT.hgetall(hash_key)
-        pending_items = []
-
-        for item_key, item_data in all_items.items():
-            data = json.loads(item_data)
-            last_scrape = data.get("last_scrape")
-
-            # Check if item needs scraping
-            if not last_scrape or datetime.fromtimestamp(last_scrape) < cutoff_time:
-
-                # Check if not currently processing
-                if not await REDIS_ASYNC_CLIENT.sismember(
-                    self.processing_set_key, item_key
-                ):
-                    pending_items.append(
-                        {"key": item_key.decode("utf-8"), "data": data}
-                    )
-
-        return pending_items[: self.batch_size]
+    async def mark_as_completed(self, item_key: str, item_type: str) -> None:
+        """Release the lease and schedule the next search of the item"""
+        next_due = time.time() + settings.background_search_interval_hours * 3600
+        await self._complete(
+            keys=self.get_keys(item_type),
+            args=[item_key, next_due, self.popularity_weight],
+        )
+        await REDIS_ASYNC_CLIENT.delete(self.get_progress_key(item_key, item_type))
 
-    async def mark_as_processing(self, item_key: str) -> None:
-        """Mark an item as currently being processed"""
-        await REDIS_ASYNC_CLIENT.sadd(self.processing_set_key, item_key)
+    @staticmethod
+    def get_progress_key(item_key: str, item_type: str) -> str:
+        return f"background_search:{item_type}:progress:{item_key}"
 
-    async def mark_as_completed(self, item_key: str, hash_key: str) -> None:
-        """Mark an item as completed and update last scrape time"""
-        # Update last scrape time
-        item_data = await REDIS_ASYNC_CLIENT.hget(hash_key, item_key)
-        if item_data:
-            data = json.loads(item_data)
-            data["last_scrape"] = datetime.now().timestamp()
-            await REDIS_ASYNC_CLIENT.hset(hash_key, item_key, json.dumps(data))
+    async def get_completed_units(self, item_key: str, item_type: str) -> set[str]:
+        """Search units already finished for an item by an earlier worker"""
+        units = await REDIS_ASYNC_CLIENT.smembers(
+            self.get_progress_key(item_key, item_type)
+        )
+        return {unit.decode("utf-8") for unit in units}
 
-        # Remove from processing set
-        await REDIS_ASYNC_CLIENT.srem(self.processing_set_key, item_key)
+    async def mark_unit_completed(
+        self, item_key: str, item_type: str, unit: str
+    ) -> None:
+        """Persist a finished search unit so a restarted worker skips it"""
+        progress_key = self.get_progress_key(item_key, item_type)
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            pipe.sadd(progress_key, unit)
+            pipe.expire(progress_key, settings.background_search_interval_hours * 3600)
+            await pipe.execute()
+
+    async def remove_item(self, item_key: str, item_type: str) -> None:
+        """Drop an item whose metadata no longer exists"""
+        queue_key, leases_key, due_key, requests_key = self.get_keys(item_type)
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=True) as pipe:
+            pipe.zrem(queue_key, item_key)
+            pipe.zrem(leases_key, item_key)
+            pipe.hdel(due_key, item_key)
+            pipe.hdel(requests_key, item_key)
+            pipe.delete(self.get_progress_key(item_key, item_type))
+            await pipe.execute()
+
+    async def recover_stale_leases(self) -> int:
+        """Requeue items whose worker died or overran its lease"""
+        recovered = 0
+        for item_type in self.item_types:
+            recovered += await self._recover(
+                keys=self.get_keys(item_type),
+                args=[time.time(), self.popularity_weight],
+            )
+        if recovered:
+            logging.info(f"Recovered {recovered} stale background search leases")
+        return recovered
+
+    async def migrate_legacy_queue(self) -> None:
+        """Move items from the legacy JSON hashes into the work queue"""
+        interval = settings.background_search_interval_hours * 3600
+        for item_type, hash_key in (
+            ("movie", self.movie_hash_key),
+            ("series", self.series_hash_key),
+        ):
+            if not await REDIS_ASYNC_CLIENT.exists(hash_key):
+                continue
+            queue_key, _, due_key, _ = self.get_keys(item_type)
+            due_times = {}
+            async for item_key, item_data in REDIS_ASYNC_CLIENT.hscan_iter(
+                hash_key, count=1000
+            ):
+                last_scrape = json.loads(item_data).get("last_scrape")
+                due_times[item_key] = (
+                    last_scrape + interval if last_scrape else time.time()
+                )
 
-    async def cleanup_stale_processing(self, max_processing_time: int = 3600) -> None:
-        """Clean up items stuck in processing state"""
-        processing_items = await REDIS_ASYNC_CLIENT.smembers(self.processing_set_key)
-        for item_key in processing_items:
-            await REDIS_ASYNC_CLIENT.srem(self.processing_set_key, item_key)
+            items = list(due_times.items())
+            for start in range(0, len(items), 1000):
+                async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+                    for item_key, due in items[start : start + 1000]:
+                        pipe.hsetnx(due_key, item_key, due)
+                        pipe.zadd(queue_key, {item_key: due}, nx=True)
+                    await pipe.execute()
+            await REDIS_ASYNC_CLIENT.delete(hash_key)
+            logging.info(f"Migrated {len(items)} {item_type} background search items")
+        await REDIS_ASYNC_CLIENT.delete(self.processing_set_key)
+
+    async def record_processed(
+        self, item_type: str, result: str, duration: float
+    ) -> None:
+        """Record one processed item for the throughput dashboard"""
+        background_search_items.labels(item_type=item_type, result=result).inc()
+        background_search_duration.labels(item_type=item_type).observe(duration)
+        hour = int(time.time() // 3600 * 3600)
+        throughput_key = f"background_search:{item_type}:throughput"
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            pipe.hincrby(throughput_key, f"{hour}:{result}", 1)
+            pipe.expire(throughput_key, 2 * 24 * 3600)
+            await pipe.execute()
+
+    async def get_stats(self, hours: int = 24) -> Dict[str, Any]:
+        """Queue depth, lease state and hourly throughput per item type"""
+        now = time.time()
+        current_hour = int(now // 3600 * 3600)
+        hour_slots = [current_hour - i * 3600 for i in reversed(range(hours))]
+        stats = {}
+        for item_type in self.item_types:
+            queue_key, leases_key, _, _ = self.get_keys(item_type)
+            async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+                pipe.zcard(queue_key)
+                pipe.zcount(queue_key, "-inf", now)
+                pipe.zcard(leases_key)
+                pipe.zcount(leases_key, "-inf", now)
+                pipe.hgetall(f"background_search:{item_type}:throughput")
+                queued, due, leased, stale, throughput = await pipe.execute()
+
+            hourly = {slot: {"success": 0, "error": 0} for slot in hour_slots}
+            for field, count in throughput.items():
+                hour, result = field.decode("utf-8").split(":")
+                if int(hour) in hourly:
+                    hourly[int(hour)][result] = int(count)
+            stats[item_type] = {
+                "queued": queued,
+                "due": due,
+                "leased": leased,
+                "stale_leases": stale,
+                "throughput": [
+                    {
+                        "hour": datetime.fromtimestamp(slot).isoformat(),
+                        **counts,
+                    }
+                    for slot, counts in hourly.items()
+                ],
+            }
+        return stats
 
 
 class MaxProcessLimitReached(Exception):
@@ -756,8 +951,10 @@ class IndexerBaseScraper(BaseScraper, abc.ABC):
         super().__init__(cache_key_prefix=cache_key_prefix, logger_name=__name__)
         self.base_url = base_url
         self.indexer_status = {}
-        self.indexer_circuit_breakers = {}
+        self.indexer_registry = get_indexer_registry(cache_key_prefix)
         self.background_scraper_manager = BackgroundScraperManager()
+        # Per-indexer budgets shared across items, set by the background worker
+        self.indexer_budgets = None
 
     async def _scrape_and_parse(
         self,
@@ -926,18 +1123,77 @@ class IndexerBaseScraper(BaseScraper, abc.ABC):
                 metadata.id, season, episode
             )
 
-    @abc.abstractmethod
     async def get_healthy_indexers(self) -> List[dict]:
-        """Get list of healthy indexer IDs"""
+        """Get healthy indexers from the shared registry, best first"""
+        try:
+            healthy_indexers = await self.indexer_registry.get_healthy_indexers(
+                self.fetch_indexers
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to determine healthy indexers: {e}")
+            return []
+
+        self.indexer_status = {
+            indexer["id"]: {
+                "is_healthy": True,
+                "name": indexer["name"],
+                "description": indexer.get("description", ""),
+                "privacy": indexer.get("privacy"),
+            }
+            for indexer in healthy_indexers
+        }
+        self.logger.info(f"Found {len(healthy_indexers)} healthy indexers")
+        return healthy_indexers
+
+    @abc.abstractmethod
+    async def fetch_indexers(self) -> List[dict]:
+        """Fetch the configured indexers with their capabilities"""
         pass
 
     @abc.abstractmethod
-    async def fetch_search_results(
-        self, params: dict, indexer_ids: List[int], timeout: Optional[int] = None
+    async def search_indexer(
+        self, params: dict, indexer_id: Any, timeout: int
     ) -> List[Dict[str, Any]]:
-        """Fetch search results from the indexer"""
+        """Fetch search results from a single indexer"""
         pass
 
+    async def fetch_search_results(
+        self, params: dict, indexer_ids: List[Any], timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch search results from the indexers with circuit breaker handling"""
+        results = []
+        timeout = timeout or self.search_query_timeout
+
+        for indexer_id in indexer_ids:
+            indexer_status = self.indexer_status.get(indexer_id, {})
+            if not indexer_status.get("is_healthy", False):
+                continue
+
+            indexer_name = indexer_status.get("name", f"ID:{indexer_id}")
+            start_time = time.perf_counter()
+            try:
+                indexer_results = await self.search_indexer(params, indexer_id, timeout)
+            except Exception as e:
+                self.logger.error(f"Error searching indexer {indexer_name}: {str(e)}")
+                self.metrics.record_indexer_error(indexer_name, str(e))
+                state = await self.indexer_registry.record_result(
+                    indexer_id, indexer_name, False, time.perf_counter() - start_time
+                )
+                if state == "OPEN":
+                    self.logger.warning(
+                        f"Circuit breaker opened for indexer {indexer_name}"
+                    )
+                    indexer_status["is_healthy"] = False
+                continue
+
+            await self.indexer_registry.record_result(
+                indexer_id, indexer_name, True, time.perf_counter() - start_time
+            )
+            self.metrics.record_indexer_success(indexer_name, len(indexer_results))
+            results.extend(indexer_results)
+
+        return results
+
     @abc.abstractmethod
     async def build_search_params(
         self,
@@ -1188,9 +1444,14 @@ class IndexerBaseScraper(BaseScraper, abc.ABC):
 
         # Use only the IDs from filtered indexers
         indexer_ids = [indexer["id"] for indexer in filtered_indexers]
-        search_results = await self.fetch_search_results(
-            params, indexer_ids=indexer_ids, timeout=self.search_query_timeout
-        )
+        if self.indexer_budgets:
+            search_results = await self.indexer_budgets.fetch_search_results(
+                self, params, indexer_ids
+            )
+        else:
+            search_results = await self.fetch_search_results(
+                params, indexer_ids=indexer_ids, timeout=self.search_query_timeout
+            )
 
         self.metrics.record_found_items(len(search_results))
         self.logger.info(
@@ -1470,7 +1731,7 @@ class IndexerBaseScraper(BaseScraper, abc.ABC):
     @staticmethod
     def parse_title_data(title: str) -> dict:
         """Parse torrent title using PTT"""
-        parsed = PTT.parse_title(title, True)
+        parsed = parse_title(title, True)
         return {"torrent_name": title, **parsed}
 
     def validate_category_with_title(
@@ -0,0 +1,236 @@
+"""
+Shared registry of Prowlarr/Jackett indexers.
+
+The indexer list with its capabilities is cached in Redis for
+`indexer_registry_ttl` seconds and refreshed in the background afterwards,
+so searches don't query the indexer manager every time. Circuit breaker state
+and a rolling window of search latencies and outcomes are kept per indexer
+in Redis as well, shared by the API workers, dramatiq actors and scrapers.
+Healthy indexers are ordered by their configured priority and then by their
+recent latency and success rate, so slow or flaky indexers are searched last.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from prometheus_client import Histogram
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+KEY_PREFIX = "indexer_registry:"
+REFRESH_LOCK_SECONDS = 30
+
+# Circuit breaker settings, shared by every process
+FAILURE_THRESHOLD = 3
+RECOVERY_TIMEOUT = 300
+HALF_OPEN_ATTEMPTS = 1
+
+indexer_search_duration = Histogram(
+    "indexer_search_seconds",
+    "Search latency per indexer, labeled by scraper, indexer and result",
+    labelnames=["scraper", "indexer", "result"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+
+# Update the circuit breaker of an indexer with a search outcome and add the
+# outcome to its rolling window. Returns the resulting breaker state.
+RECORD_RESULT_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'CLOSED'
+if ARGV[2] == '1' then
+    if state == 'HALF-OPEN' then
+        local successes = redis.call('HINCRBY', KEYS[1], 'successes', 1)
+        if successes >= tonumber(ARGV[5]) then
+            redis.call('DEL', KEYS[1])
+            state = 'CLOSED'
+        end
+    elseif redis.call('EXISTS', KEYS[1]) == 1 then
+        redis.call('HSET', KEYS[1], 'failures', 0)
+    end
+else
+    local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+    redis.call('HSET', KEYS[1], 'last_failure', ARGV[1], 'successes', 0)
+    if failures >= tonumber(ARGV[4]) then
+        redis.call('HSET', KEYS[1], 'state', 'OPEN')
+        state = 'OPEN'
+    end
+end
+redis.call('EXPIRE', KEYS[1], 86400)
+redis.call('LPUSH', KEYS[2], ARGV[3] .. ':' .. ARGV[2])
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[6]) - 1)
+redis.call('EXPIRE', KEYS[2], 86400)
+return state
+"""
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class IndexerRegistry:
+    def __init__(self, scraper_name: str):
+        self.scraper_name = scraper_name
+        self.snapshot_key = f"{KEY_PREFIX}{scraper_name}:indexers"
+        self._record_result = REDIS_ASYNC_CLIENT.register_script(RECORD_RESULT_SCRIPT)
+
+    def breaker_key(self, indexer_id: Any) -> str:
+        return f"{KEY_PREFIX}{self.scraper_name}:breaker:{indexer_id}"
+
+    def samples_key(self, indexer_id: Any) -> str:
+        return f"{KEY_PREFIX}{self.scraper_name}:samples:{indexer_id}"
+
+    async def get_healthy_indexers(
+        self, fetch_indexers: Callable[[], Awaitable[List[dict]]]
+    ) -> List[dict]:
+        """Indexers whose circuit breaker accepts requests, best first"""
+        indexers = await self.get_indexers(fetch_indexers)
+        if not indexers:
+            return []
+
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            for indexer in indexers:
+                pipe.hgetall(self.breaker_key(indexer["id"]))
+                pipe.lrange(self.samples_key(indexer["id"]), 0, -1)
+            responses = await pipe.execute()
+
+        now = time.time()
+        healthy_indexers = []
+        for i, indexer in enumerate(indexers):
+            breaker, samples = responses[2 * i], responses[2 * i + 1]
+            if not await self.is_accepting_requests(indexer, breaker, now):
+                continue
+            indexer["health"] = self.get_health(samples)
+            healthy_indexers.append(indexer)
+
+        healthy_indexers.sort(
+            key=lambda x: (x.get("priority", 25), x["health"]["cost"])
+        )
+        return healthy_indexers
+
+    async def is_accepting_requests(
+        self, indexer: dict, breaker: Dict[bytes, bytes], now: float
+    ) -> bool:
+        if breaker.get(b"state") != b"OPEN":
+            return True
+        if now - float(breaker.get(b"last_failure", 0)) < RECOVERY_TIMEOUT:
+            logging.debug(
+                "Skipping indexer %s, circuit breaker is OPEN", indexer["name"]
+            )
+            return False
+        # Let a few requests through to test the recovery
+        await REDIS_ASYNC_CLIENT.hset(
+            self.breaker_key(indexer["id"]),
+            mapping={"state": "HALF-OPEN", "failures": 0, "successes": 0},
+        )
+        return True
+
+    @staticmethod
+    def get_health(samples: List[bytes]) -> Dict[str, float]:
+        """Latency percentiles and success rate of the rolling window"""
+        outcomes = [sample.decode("utf-8").split(":") for sample in samples]
+        latencies = [float(ms) for ms, success in outcomes if success == "1"]
+        success_rate = (
+            sum(success == "1" for _, success in outcomes) / len(outcomes)
+            if outcomes
+            else 1.0
+        )
+        p90 = percentile(latencies, 0.9)
+        return {
+            "samples": len(outcomes),
+            "success_rate": success_rate,
+            "latency_p50_ms": percentile(latencies, 0.5),
+            "latency_p90_ms": p90,
+            # Expected time per useful response; new indexers get tried first
+            "cost": p90 / max(success_rate, 0.1),
+        }
+
+    async def get_indexers(
+        self, fetch_indexers: Callable[[], Awaitable[List[dict]]]
+    ) -> List[dict]:
+        """Cached indexer snapshot, refreshed in the background once stale"""
+        try:
+            cached = await REDIS_ASYNC_CLIENT.get(self.snapshot_key)
+        except Exception as e:
+            logging.error(f"Error reading indexer registry: {e}")
+            cached = None
+
+        if cached:
+            snapshot = json.loads(cached)
+            if time.time() - snapshot["fetched_at"] >= settings.indexer_registry_ttl:
+                await self.schedule_refresh(fetch_indexers)
+            return snapshot["indexers"]
+        return await self.refresh(fetch_indexers)
+
+    async def refresh(
+        self, fetch_indexers: Callable[[], Awaitable[List[dict]]]
+    ) -> List[dict]:
+        indexers = await fetch_indexers()
+        # Don't cache failed fetches, the next search retries them
+        if indexers:
+            await REDIS_ASYNC_CLIENT.set(
+                self.snapshot_key,
+                json.dumps({"indexers": indexers, "fetched_at": time.time()}),
+                ex=settings.indexer_registry_ttl + settings.indexer_registry_stale_ttl,
+            )
+        return indexers
+
+    async def schedule_refresh(
+        self, fetch_indexers: Callable[[], Awaitable[List[dict]]]
+    ) -> None:
+        if not await REDIS_ASYNC_CLIENT.set(
+            f"{self.snapshot_key}:refresh", 1, nx=True, ex=REFRESH_LOCK_SECONDS
+        ):
+            return
+
+        async def refresh():
+            try:
+                await self.refresh(fetch_indexers)
+            except Exception as e:
+                logging.error(f"Error refreshing {self.scraper_name} indexers: {e}")
+
+        task = asyncio.create_task(refresh())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def record_result(
+        self, indexer_id: Any, indexer_name: str, success: bool, duration: float
+    ) -> str:
+        """Record a search outcome and return the indexer's breaker state"""
+        indexer_search_duration.labels(
+            scraper=self.scraper_name,
+            indexer=indexer_name,
+            result="success" if success else "error",
+        ).observe(duration)
+        try:
+            state = await self._record_result(
+                keys=[self.breaker_key(indexer_id), self.samples_key(indexer_id)],
+                args=[
+                    time.time(),
+                    int(success),
+                    round(duration * 1000),
+                    FAILURE_THRESHOLD,
+                    HALF_OPEN_ATTEMPTS,
+                    settings.indexer_stats_window,
+                ],
+            )
+        except Exception as e:
+            logging.error(f"Error recording indexer result: {e}")
+            return "CLOSED"
+        return state.decode("utf-8") if isinstance(state, bytes) else state
+
+
+_registries: Dict[str, IndexerRegistry] = {}
+
+
+def get_indexer_registry(scraper_name: str) -> IndexerRegistry:
+    if scraper_name not in _registries:
+        _registries[scraper_name] = IndexerRegistry(scraper_name)
+    return _registries[scraper_name]
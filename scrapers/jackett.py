@@ -11,7 +11,6 @@ from db.models import (
     MediaFusionMetaData,
 )
 from scrapers.base_scraper import IndexerBaseScraper
-from utils.network import CircuitBreaker
 from utils.runtime_const import JACKETT_SEARCH_TTL
 
 
@@ -90,7 +89,7 @@ class JackettScraper(IndexerBaseScraper):
         """Scrape and parse Jackett indexers for torrent streams"""
         return await super()._scrape_and_parse(metadata, catalog_type, season, episode)
 
-    async def get_healthy_indexers(self) -> List[dict]:
+    async def fetch_indexers(self) -> List[dict]:
         """Fetch and return list of healthy Jackett indexers with their capabilities"""
         try:
             response = await self.http_client.get(
@@ -163,94 +162,29 @@ class JackettScraper(IndexerBaseScraper):
                     "search_capabilities": search_caps,
                 }
 
-                # Initialize circuit breaker
-                self.indexer_circuit_breakers[indexer_id] = CircuitBreaker(
-                    failure_threshold=3,
-                    recovery_timeout=300,
-                    half_open_attempts=1,
-                )
-
-                # Store indexer status
-                self.indexer_status[indexer_id] = {
-                    "is_healthy": True,  # If it's in the list, it's configured and healthy
-                    "name": title,
-                    "description": description,
-                }
-
                 healthy_indexers.append(indexer_info)
 
-            self.logger.info(f"Found {len(healthy_indexers)} healthy indexers")
             return healthy_indexers
 
         except Exception as e:
             self.logger.error(f"Failed to determine healthy indexers: {e}")
             return []
 
-    async def fetch_search_results(
-        self,
-        params: dict,
-        indexer_ids: List[int],
-        timeout: Optional[int] = None,
+    async def search_indexer(
+        self, params: dict, indexer_id: str, timeout: int
     ) -> List[Dict[str, Any]]:
-        """Fetch search results from Jackett indexers with circuit breaker handling"""
-        results = []
-        timeout = timeout or self.search_query_timeout
-
-        for indexer_id in indexer_ids:
-            indexer_status = self.indexer_status.get(indexer_id, {})
-            if not indexer_status.get("is_healthy", False):
-                continue
-
-            circuit_breaker = self.indexer_circuit_breakers.get(indexer_id)
-            if not circuit_breaker:
-                continue
-
-            indexer_name = indexer_status.get("name", f"ID:{indexer_id}")
-
-            if circuit_breaker.is_closed():
-                try:
-                    search_params = {
-                        **params,
-                        "Tracker[]": [indexer_id],
-                        "apikey": settings.jackett_api_key,
-                    }
-                    response = await self.http_client.get(
-                        f"{self.base_url}{self.search_url}",
-                        params=search_params,
-                        timeout=timeout,
-                    )
-                    response.raise_for_status()
-                    indexer_results = response.json().get("Results", [])
-
-                    circuit_breaker.record_success()
-                    self.metrics.record_indexer_success(
-                        indexer_name, len(indexer_results)
-                    )
-                    results.extend(indexer_results)
-
-                except Exception as e:
-                    error_msg = f"Error searching indexer {indexer_name}: {str(e)}"
-                    self.logger.error(error_msg)
-
-                    circuit_breaker.record_failure()
-                    self.metrics.record_indexer_error(indexer_name, str(e))
-
-                    if not circuit_breaker.is_closed():
-                        self.logger.warning(
-                            f"Circuit breaker opened for indexer {indexer_name}. "
-                            f"Status: {circuit_breaker.get_status()}"
-                        )
-                        indexer_status["is_healthy"] = False
-                        self.indexer_status[indexer_id] = indexer_status
-            else:
-                self.logger.debug(
-                    f"Skipping indexer {indexer_name} - circuit breaker is {circuit_breaker.state}"
-                )
-                self.metrics.record_indexer_error(
-                    indexer_name, f"Circuit breaker {circuit_breaker.state}"
-                )
-
-        return results
+        """Fetch search results from a Jackett indexer"""
+        response = await self.http_client.get(
+            f"{self.base_url}{self.search_url}",
+            params={
+                **params,
+                "Tracker[]": [indexer_id],
+                "apikey": settings.jackett_api_key,
+            },
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.json().get("Results", [])
 
     async def build_search_params(
         self,
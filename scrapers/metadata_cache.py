@@ -0,0 +1,143 @@
+"""
+Redis-backed cache of IMDb/TMDB lookups made by the MetadataFetcher.
+
+The cache is shared by the API, the dramatiq workers and the Scrapy processes.
+Keys are built from normalized lookup parameters, so release names of the same
+title resolve to a single entry. Lookups that found nothing are cached as
+well, with a shorter TTL. Past its TTL an entry is still served for
+`metadata_cache_stale_ttl` seconds while one process refreshes it in the
+background.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from prometheus_client import Counter
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+KEY_PREFIX = "metadata_lookup:"
+REFRESH_LOCK_SECONDS = 60
+
+metadata_cache_requests = Counter(
+    "metadata_lookup_cache_requests_total",
+    "Metadata lookup cache requests, labeled by method and result",
+    labelnames=["method", "result"],
+)
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def normalize_value(value: Any) -> str:
+    if isinstance(value, str):
+        return " ".join(value.casefold().split())
+    return str(value)
+
+
+def _encode(value: Any):
+    # Keep dates and datetimes of episode data round-trippable
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode(value: dict):
+    if len(value) == 1:
+        if "$datetime" in value:
+            return datetime.fromisoformat(value["$datetime"])
+        if "$date" in value:
+            return date.fromisoformat(value["$date"])
+    return value
+
+
+class MetadataLookupCache:
+    def __init__(self):
+        self.ttl = settings.metadata_cache_ttl
+        self.negative_ttl = settings.metadata_cache_negative_ttl
+        self.stale_ttl = settings.metadata_cache_stale_ttl
+
+    @staticmethod
+    def get_key(method: str, **kwargs) -> str:
+        """Cache key of the normalized lookup parameters"""
+        key_string = ",".join(
+            f"{k}:{normalize_value(v)}"
+            for k, v in sorted(kwargs.items())
+            if v is not None
+        )
+        return f"{KEY_PREFIX}{method}:{hashlib.md5(key_string.encode()).hexdigest()}"
+
+    async def get_or_fetch(
+        self,
+        method: str,
+        fetch: Callable[[], Awaitable[tuple[Optional[Dict[str, Any]], bool]]],
+        **kwargs,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result of a lookup, calling `fetch` on a miss.
+        `fetch` returns the result and whether it is final, as a lookup that
+        failed with an error is not cached as a negative result.
+        """
+        key = self.get_key(method, **kwargs)
+        try:
+            cached = await REDIS_ASYNC_CLIENT.get(key)
+        except Exception as e:
+            logging.error(f"Error reading metadata lookup cache: {e}")
+            cached = None
+
+        if cached:
+            entry = json.loads(cached, object_hook=_decode)
+            ttl = self.ttl if entry["data"] else self.negative_ttl
+            if time.time() - entry["fetched_at"] < ttl:
+                metadata_cache_requests.labels(method=method, result="hit").inc()
+            else:
+                metadata_cache_requests.labels(method=method, result="stale").inc()
+                await self.schedule_refresh(key, fetch)
+            return entry["data"]
+
+        metadata_cache_requests.labels(method=method, result="miss").inc()
+        data, is_final = await fetch()
+        if data or is_final:
+            await self.store(key, data)
+        return data
+
+    async def store(self, key: str, data: Optional[Dict[str, Any]]) -> None:
+        ttl = self.ttl if data else self.negative_ttl
+        try:
+            await REDIS_ASYNC_CLIENT.set(
+                key,
+                json.dumps({"data": data, "fetched_at": time.time()}, default=_encode),
+                ex=ttl + self.stale_ttl,
+            )
+        except Exception as e:
+            logging.error(f"Error writing metadata lookup cache: {e}")
+
+    async def schedule_refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[tuple[Optional[Dict[str, Any]], bool]]],
+    ) -> None:
+        """Refresh a stale entry in the background, once across processes"""
+        if not await REDIS_ASYNC_CLIENT.set(
+            f"{key}:refresh", 1, nx=True, ex=REFRESH_LOCK_SECONDS
+        ):
+            return
+
+        async def refresh():
+            try:
+                data, is_final = await fetch()
+                if data or is_final:
+                    await self.store(key, data)
+            except Exception as e:
+                logging.error(f"Error refreshing metadata lookup {key}: {e}")
+
+        task = asyncio.create_task(refresh())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
@@ -8,7 +8,6 @@ from db.config import settings
 from db.enums import TorrentType
 from db.models import TorrentStreams, MediaFusionMetaData
 from scrapers.base_scraper import IndexerBaseScraper
-from utils.network import CircuitBreaker
 from utils.runtime_const import PROWLARR_SEARCH_TTL
 
 
@@ -97,7 +96,7 @@ class ProwlarrScraper(IndexerBaseScraper):
     def get_created_at(self, item: dict) -> datetime:
         return datetime.fromisoformat(item.get("publishDate"))
 
-    async def get_healthy_indexers(self) -> List[dict]:
+    async def fetch_indexers(self) -> List[dict]:
         """Fetch and return list of healthy Prowlarr indexers with their capabilities"""
         try:
             # Fetch both indexer configurations and their current status
@@ -187,96 +186,26 @@ class ProwlarrScraper(IndexerBaseScraper):
                     "priority": indexer.get("priority", 25),
                 }
 
-                # Initialize circuit breaker
-                self.indexer_circuit_breakers[indexer_id] = CircuitBreaker(
-                    failure_threshold=3,
-                    recovery_timeout=300,
-                    half_open_attempts=1,
-                )
-
-                # Store indexer status
-                self.indexer_status[indexer_id] = {
-                    "is_healthy": True,
-                    "name": indexer_info["name"],
-                    "description": indexer_info["description"],
-                    "privacy": indexer_info["privacy"],
-                }
-
                 healthy_indexers.append(indexer_info)
 
-            # Sort indexers by priority
-            healthy_indexers.sort(key=lambda x: x["priority"])
-
-            self.logger.info(f"Found {len(healthy_indexers)} healthy indexers")
             return healthy_indexers
 
         except Exception as e:
             self.logger.error(f"Failed to determine healthy indexers: {e}")
             return []
 
-    async def fetch_search_results(
-        self,
-        params: dict,
-        indexer_ids: List[str],
-        timeout: Optional[int] = None,
+    async def search_indexer(
+        self, params: dict, indexer_id: int, timeout: int
     ) -> List[Dict[str, Any]]:
-        """Fetch search results from Prowlarr indexers"""
-        results = []
-        timeout = timeout or self.search_query_timeout
-
-        for indexer_id in indexer_ids:
-            indexer_status = self.indexer_status.get(indexer_id, {})
-            if not indexer_status.get("is_healthy", False):
-                continue
-
-            circuit_breaker = self.indexer_circuit_breakers.get(indexer_id)
-            if not circuit_breaker:
-                continue
-
-            indexer_name = indexer_status.get("name", f"ID:{indexer_id}")
-
-            if circuit_breaker.is_closed():
-                try:
-                    search_params = {**params, "indexerIds": [indexer_id]}
-                    response = await self.http_client.get(
-                        f"{self.base_url}/api/v1/search",
-                        params=search_params,
-                        headers=self.headers,
-                        timeout=timeout,
-                    )
-                    response.raise_for_status()
-                    indexer_results = response.json()
-
-                    # Record success
-                    circuit_breaker.record_success()
-                    self.metrics.record_indexer_success(
-                        indexer_name, len(indexer_results)
-                    )
-                    results.extend(indexer_results)
-
-                except Exception as e:
-                    error_msg = f"Error searching indexer {indexer_name}: {str(e)}"
-                    self.logger.error(error_msg)
-
-                    circuit_breaker.record_failure()
-                    self.metrics.record_indexer_error(indexer_name, str(e))
-
-                    if not circuit_breaker.is_closed():
-                        self.logger.warning(
-                            f"Circuit breaker opened for indexer {indexer_name}. "
-                            f"Status: {circuit_breaker.get_status()}"
-                        )
-                        indexer_status["is_healthy"] = False
-                        self.indexer_status[indexer_id] = indexer_status
-            else:
-                self.logger.debug(
-                    f"Skipping indexer {indexer_name} - circuit breaker is {circuit_breaker.state}"
-                )
-                self.metrics.record_indexer_error(
-                    indexer_name, f"Circuit breaker {circuit_breaker.state}"
-                )
-
-        return results
+        """Fetch search results from a Prowlarr indexer"""
+        response = await self.http_client.get(
+            f"{self.base_url}/api/v1/search",
+            params={**params, "indexerIds": [indexer_id]},
+            headers=self.headers,
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def build_search_params(
         self,
@@ -23,8 +23,10 @@ from db.crud import (
     update_meta_stream,
 )
 from db.enums import TorrentType
+from db.local_cache import invalidate_local_cache
 from db.models import TorrentStreams, EpisodeFile, MediaFusionMetaData
 from db.redis_database import REDIS_ASYNC_CLIENT
+from db.title_index import metadata_title_index
 from mediafusion_scrapy.task import run_spider
 from scrapers.scraper_tasks import meta_fetcher
 from scrapers.tmdb_data import get_tmdb_data
@@ -506,6 +508,7 @@ async def add_torrent(
 
     # Cleanup redis caching for quick access
     await REDIS_ASYNC_CLIENT.delete(*stream_cache_keys)
+    await invalidate_local_cache(*stream_cache_keys)
 
     # Send Telegram notification
     if settings.telegram_bot_token:
@@ -696,6 +699,7 @@ async def migrate_id(migrate_data: schemas.MigrateID):
     await MediaFusionMetaData.get_motor_collection().delete_one(
         {"_id": migrate_data.mediafusion_id}
     )
+    metadata_title_index.remove(migrate_data.mediafusion_id)
     await update_meta_stream(migrate_data.imdb_id)
 
     # Send notification
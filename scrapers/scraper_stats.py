@@ -0,0 +1,113 @@
+"""
+Contribution and latency statistics of the live search scrapers.
+
+Every live search records, per scraper, how long it took and how many
+streams it found that no other scraper returned in the same run. The recent
+runs are kept in Redis, shared by every API worker. Scrapers that usually miss
+the live search deadline and rarely add unique streams are demoted: they
+still run for every live search, but in the background only, so their
+results are stored without holding up the response. They are promoted back
+once their statistics improve.
+"""
+
+import logging
+from typing import Dict, Iterable, List
+
+from prometheus_client import Counter, Histogram
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+KEY_PREFIX = "scraper_stats:"
+MIN_SAMPLES = 10
+
+live_scraper_duration = Histogram(
+    "live_scraper_seconds",
+    "Live search latency per scraper, labeled by scraper and result",
+    labelnames=["scraper", "result"],
+    buckets=(0.5, 1, 2.5, 5, 10, 15, 20, 30, 60),
+)
+live_scraper_streams = Counter(
+    "live_scraper_streams_total",
+    "Streams returned by live search scrapers, labeled by scraper and kind",
+    labelnames=["scraper", "kind"],
+)
+
+
+def get_key(scraper_name: str) -> str:
+    return f"{KEY_PREFIX}{scraper_name}"
+
+
+async def record_run(results: Dict[str, dict]):
+    """
+    Record a live search run. `results` maps scraper names to their duration,
+    success, streams and unique_streams counts and whether they were on time.
+    """
+    async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+        for name, result in results.items():
+            if not result["success"]:
+                outcome = "error"
+            elif result["on_time"]:
+                outcome = "on_time"
+            else:
+                outcome = "late"
+            live_scraper_duration.labels(scraper=name, result=outcome).observe(
+                result["duration"]
+            )
+            live_scraper_streams.labels(scraper=name, kind="returned").inc(
+                result["streams"]
+            )
+            live_scraper_streams.labels(scraper=name, kind="unique").inc(
+                result["unique_streams"]
+            )
+            pipe.lpush(
+                get_key(name),
+                f"{round(result['duration'] * 1000)}:{result['unique_streams']}:"
+                f"{int(result['on_time'])}",
+            )
+            pipe.ltrim(get_key(name), 0, settings.live_search_stats_window - 1)
+            pipe.expire(get_key(name), 7 * 86400)
+        try:
+            await pipe.execute()
+        except Exception as e:
+            logging.error(f"Error recording scraper stats: {e}")
+
+
+def get_summary(samples: List[bytes]) -> Dict[str, float]:
+    runs = [sample.decode("utf-8").split(":") for sample in samples]
+    if not runs:
+        return {"samples": 0, "on_time_rate": 1.0, "avg_unique_streams": 0.0}
+    return {
+        "samples": len(runs),
+        "on_time_rate": sum(on_time == "1" for _, _, on_time in runs) / len(runs),
+        "avg_unique_streams": sum(int(unique) for _, unique, _ in runs) / len(runs),
+    }
+
+
+def is_demoted(summary: Dict[str, float]) -> bool:
+    return (
+        summary["samples"] >= MIN_SAMPLES
+        and summary["on_time_rate"] < 0.5
+        and summary["avg_unique_streams"] < settings.live_search_demote_min_unique
+    )
+
+
+async def get_demoted_scrapers(scraper_names: Iterable[str]) -> set[str]:
+    """Scrapers that should only run in the background"""
+    scraper_names = list(scraper_names)
+    if not settings.live_search_demote_min_unique or not scraper_names:
+        return set()
+    try:
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            for name in scraper_names:
+                pipe.lrange(get_key(name), 0, -1)
+            responses = await pipe.execute()
+    except Exception as e:
+        logging.error(f"Error reading scraper stats: {e}")
+        return set()
+
+    return {
+        name
+        for name, samples in zip(scraper_names, responses)
+        if is_demoted(get_summary(samples))
+    }
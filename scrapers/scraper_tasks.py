@@ -1,20 +1,22 @@
 import asyncio
-import hashlib
 import logging
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import time
+from collections import Counter
+from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Awaitable, Callable
 
 import dramatiq
 
 from db.config import settings
 from db.models import TorrentStreams, MediaFusionMetaData
+from scrapers import scraper_stats
 from scrapers.base_scraper import BaseScraper
 from scrapers.bt4g import BT4GScraper
 from scrapers.imdb_data import get_imdb_title_data, search_imdb, search_multiple_imdb
 from scrapers.jackett import JackettScraper
 from scrapers.mediafusion import MediafusionScraper
+from scrapers.metadata_cache import MetadataLookupCache
 from scrapers.prowlarr import ProwlarrScraper
 from scrapers.tmdb_data import (
     get_tmdb_data_by_imdb,
@@ -51,52 +53,141 @@ CACHED_DATA = [
 ]
 
 
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def run_scraper(
+    scraper_cls: type[BaseScraper],
+    metadata: MediaFusionMetaData,
+    catalog_type: str,
+    season: int = None,
+    episode: int = None,
+) -> tuple[list[TorrentStreams], float, bool]:
+    """Run one scraper and return its streams, duration and success"""
+    start_time = time.perf_counter()
+    try:
+        streams = await scraper_cls().scrape_and_parse(
+            metadata, catalog_type, season, episode
+        )
+        success = True
+        logging.info(
+            f"Successfully scraped {len(streams)} streams from {scraper_cls.__name__}"
+        )
+    except Exception as exc:
+        streams, success = [], False
+        logging.error(f"Error in scraper {scraper_cls.__name__}: {str(exc)}")
+    return streams, time.perf_counter() - start_time, success
+
+
 async def run_scrapers(
     metadata: MediaFusionMetaData,
     catalog_type: str,
     season: int = None,
     episode: int = None,
+    on_late_streams: Callable[[set[TorrentStreams]], Awaitable] = None,
 ) -> set[TorrentStreams]:
-    """Run all enabled scrapers and return unique streams"""
-    all_streams = []
-    failed_scrapers = []
-
-    async with asyncio.TaskGroup() as tg:
-        # Create tasks for enabled scrapers
-        tasks = [
-            tg.create_task(
-                scraper_cls().scrape_and_parse(metadata, catalog_type, season, episode),
-                name=f"{scraper_cls.__name__}",
-            )
-            for is_enabled, scraper_cls in SCRAPERS
-            if is_enabled
-        ]
-
-    # Process results after all tasks complete
-    for task in tasks:
-        try:
-            streams = task.result()
-            all_streams.extend(streams)
-            logging.info(
-                f"Successfully scraped {len(streams)} streams from {task.get_name()}"
-            )
-        except Exception as exc:
-            # Log the error and keep track of failed scrapers
-            failed_scrapers.append(task.get_name())
-            logging.error(f"Error in scraper {task.get_name()}: {str(exc)}")
+    """
+    Run all enabled scrapers and return the unique streams found within the
+    live search deadline. Scrapers still running at the deadline, and demoted
+    scrapers, finish in the background and their streams are passed to
+    `on_late_streams`.
+    """
+    scraper_classes = [
+        scraper_cls for is_enabled, scraper_cls in SCRAPERS if is_enabled
+    ]
+    demoted = await scraper_stats.get_demoted_scrapers(
+        scraper_cls.__name__ for scraper_cls in scraper_classes
+    )
+    if demoted:
+        logging.info(f"Running demoted scrapers in the background: {demoted}")
 
-    # Log summary of failures if any occurred
-    if failed_scrapers:
-        logging.error(f"Failed scrapers: {', '.join(failed_scrapers)}")
+    tasks = {
+        scraper_cls.__name__: asyncio.create_task(
+            run_scraper(scraper_cls, metadata, catalog_type, season, episode),
+            name=scraper_cls.__name__,
+        )
+        for scraper_cls in scraper_classes
+    }
+    live_tasks = [task for name, task in tasks.items() if name not in demoted]
+    done = set()
+    if live_tasks:
+        done, _ = await asyncio.wait(live_tasks, timeout=settings.live_search_deadline)
+
+    all_streams = []
+    for task in done:
+        all_streams.extend(task.result()[0])
+    late_scrapers = [name for name, task in tasks.items() if task not in done]
+    if late_scrapers:
+        logging.info(f"Scrapers past the live search deadline: {late_scrapers}")
 
     unique_streams = set(all_streams)
     logging.info(
         f"Successfully scraped {len(all_streams)} total streams "
         f"({len(unique_streams)} unique) for {metadata.title}"
     )
+
+    task = asyncio.create_task(
+        finish_scrapers(tasks, unique_streams, metadata, on_late_streams)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
     return unique_streams
 
 
+async def finish_scrapers(
+    tasks: Dict[str, asyncio.Task],
+    returned_streams: set[TorrentStreams],
+    metadata: MediaFusionMetaData,
+    on_late_streams: Callable[[set[TorrentStreams]], Awaitable] = None,
+):
+    """Wait for the late scrapers, hand over their streams and record stats"""
+    await asyncio.wait(tasks.values())
+    results = {name: task.result() for name, task in tasks.items()}
+
+    failed_scrapers = [name for name, (_, _, success) in results.items() if not success]
+    if failed_scrapers:
+        logging.error(f"Failed scrapers: {', '.join(failed_scrapers)}")
+
+    late_streams = {
+        stream
+        for streams, _, _ in results.values()
+        for stream in streams
+        if stream not in returned_streams
+    }
+    if late_streams:
+        logging.info(
+            f"Scraped {len(late_streams)} streams past the deadline for {metadata.title}"
+        )
+        try:
+            if on_late_streams:
+                await on_late_streams(late_streams)
+            else:
+                from db.crud import store_new_torrent_streams
+
+                await store_new_torrent_streams(late_streams)
+        except Exception as exc:
+            logging.error(f"Error storing late scraped streams: {exc}")
+
+    # A stream's contribution is unique when no other scraper found it
+    stream_counts = Counter(
+        stream.id for streams, _, _ in results.values() for stream in set(streams)
+    )
+    await scraper_stats.record_run(
+        {
+            name: {
+                "duration": duration,
+                "success": success,
+                "on_time": success and duration <= settings.live_search_deadline,
+                "streams": len(streams),
+                "unique_streams": sum(
+                    stream_counts[stream.id] == 1 for stream in set(streams)
+                ),
+            }
+            for name, (streams, duration, success) in results.items()
+        }
+    )
+
+
 @dramatiq.actor(
     time_limit=5 * 60 * 1000,  # 5 minutes
     priority=20,
@@ -147,59 +238,10 @@ class MetadataConfig:
         return sources + [fallback]
 
 
-@dataclass
-class CacheEntry:
-    data: Dict[str, Any]
-    expires_at: datetime
-
-
-class MetadataCache:
-    def __init__(self, ttl_minutes: int = 30):
-        self.cache: Dict[str, CacheEntry] = {}
-        self.ttl = timedelta(minutes=ttl_minutes)
-
-    def _generate_key(self, **kwargs) -> str:
-        """Generate a cache key from the search parameters"""
-        # Sort kwargs to ensure consistent key generation
-        sorted_items = sorted(
-            (k, str(v)) for k, v in kwargs.items() if v is not None and k != "self"
-        )
-        key_string = ",".join(f"{k}:{v}" for k, v in sorted_items)
-        return hashlib.md5(key_string.encode()).hexdigest()
-
-    def get(self, **kwargs) -> Optional[Dict[str, Any]]:
-        """Get cached data if it exists and is not expired"""
-        key = self._generate_key(**kwargs)
-        if key in self.cache:
-            entry = self.cache[key]
-            if datetime.now() < entry.expires_at:
-                return entry.data
-            else:
-                # Clean up expired entry
-                del self.cache[key]
-        return None
-
-    def set(self, data: Dict[str, Any], **kwargs) -> None:
-        """Cache the data with expiration time"""
-        if not data:  # Don't cache empty results
-            return
-        key = self._generate_key(**kwargs)
-        self.cache[key] = CacheEntry(data=data, expires_at=datetime.now() + self.ttl)
-
-    def clear_expired(self) -> None:
-        """Remove all expired entries from the cache"""
-        now = datetime.now()
-        expired_keys = [
-            key for key, entry in self.cache.items() if now >= entry.expires_at
-        ]
-        for key in expired_keys:
-            del self.cache[key]
-
-
 class MetadataFetcher:
-    def __init__(self, cache_ttl_minutes: int = 30):
+    def __init__(self):
         self.config = MetadataConfig(MetadataSource(settings.metadata_primary_source))
-        self.cache = MetadataCache(ttl_minutes=cache_ttl_minutes)
+        self.cache = MetadataLookupCache()
 
     async def get_metadata(
         self,
@@ -210,18 +252,20 @@ class MetadataFetcher:
         """
         Main method to fetch metadata using configured sources and fallback logic.
         """
-        # Check cache first
-        cached_data = self.cache.get(
-            method="get_metadata",
+        return await self.cache.get_or_fetch(
+            "get_metadata",
+            lambda: self._fetch_metadata(title_id, media_type, source_type),
             title_id=title_id,
             media_type=media_type,
             source_type=source_type,
         )
-        if cached_data:
-            logger.info(f"Cache hit for metadata: {title_id}")
-            return cached_data
 
+    async def _fetch_metadata(
+        self, title_id: str, media_type: str, source_type: str
+    ) -> tuple[Optional[Dict[str, Any]], bool]:
+        """Fetch metadata from the sources, and whether no source failed"""
         metadata = None
+        is_final = True
         sources = self.config.get_source_order()
 
         for source in sources:
@@ -246,21 +290,14 @@ class MetadataFetcher:
                     logger.info(
                         f"Successfully fetched metadata from {source.value} for {title_id}: {metadata['title']}"
                     )
-                    # Cache the successful result
-                    self.cache.set(
-                        metadata,
-                        method="get_metadata",
-                        title_id=title_id,
-                        media_type=media_type,
-                        source_type=source_type,
-                    )
                     break
 
             except Exception as e:
+                is_final = False
                 logger.exception(f"Error fetching from {source.value}: {e}")
                 continue
 
-        return metadata
+        return metadata, is_final
 
     async def search_metadata(
         self,
@@ -282,19 +319,25 @@ class MetadataFetcher:
             except (ValueError, IndexError):
                 pass
 
-        # Check cache first
-        cached_data = self.cache.get(
-            method="search_metadata",
+        return await self.cache.get_or_fetch(
+            "search_metadata",
+            lambda: self._search_metadata(title, year, media_type, created_year),
             title=title,
             year=year,
             media_type=media_type,
             created_year=created_year,
         )
-        if cached_data:
-            logger.info(f"Cache hit for search: {title}")
-            return cached_data
 
+    async def _search_metadata(
+        self,
+        title: str,
+        year: Optional[int],
+        media_type: Optional[str],
+        created_year: Optional[int],
+    ) -> tuple[Optional[Dict[str, Any]], bool]:
+        """Search the sources, and whether no source failed"""
         metadata = None
+        is_final = True
         sources = self.config.get_source_order()
 
         for source in sources:
@@ -312,26 +355,14 @@ class MetadataFetcher:
                     logger.info(
                         f"Successfully searched metadata from {source.value}: {title}:{metadata['imdb_id']}"
                     )
-                    # Cache the successful result
-                    self.cache.set(
-                        metadata,
-                        method="search_metadata",
-                        title=title,
-                        year=year,
-                        media_type=media_type,
-                        created_year=created_year,
-                    )
                     break
 
             except Exception as e:
+                is_final = False
                 logger.error(f"Error searching in {source.value}: {e}")
                 continue
 
-        return metadata
-
-    def clear_expired_cache(self) -> None:
-        """Clear expired cache entries"""
-        self.cache.clear_expired()
+        return metadata, is_final
 
     async def search_multiple_results(
         self,
@@ -388,5 +419,4 @@ class MetadataFetcher:
         return imdb_candidates + tmdb_candidates
 
 
-# Create a singleton instance with 30-minute cache TTL
-meta_fetcher = MetadataFetcher(cache_ttl_minutes=30)
+meta_fetcher = MetadataFetcher()
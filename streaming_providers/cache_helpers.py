@@ -1,6 +1,7 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 from urllib.parse import urljoin
 
 import dramatiq
@@ -9,6 +10,7 @@ import httpx
 from db.config import settings
 from db.redis_database import REDIS_ASYNC_CLIENT
 from db.schemas import StreamingProvider
+from streaming_providers.compact_cache import compact_debrid_cache, current_day
 
 # Constants
 CACHE_KEY_PREFIX = "debrid_cache:"
@@ -55,16 +57,24 @@ async def store_cached_info_hashes(
 
     try:
         # Store in local Redis
-        cache_key = f"{CACHE_KEY_PREFIX}{service}"
-        timestamp = int(
-            (datetime.now(tz=timezone.utc) + timedelta(days=EXPIRY_DAYS)).timestamp()
-        )
+        if settings.debrid_cache_compact_layout:
+            expiry_day = current_day() + EXPIRY_DAYS
+            await compact_debrid_cache.store(
+                service, {hash_: expiry_day for hash_ in info_hashes}
+            )
+        else:
+            cache_key = f"{CACHE_KEY_PREFIX}{service}"
+            timestamp = int(
+                (
+                    datetime.now(tz=timezone.utc) + timedelta(days=EXPIRY_DAYS)
+                ).timestamp()
+            )
 
-        # Create mapping of info_hash to expiry timestamp
-        cache_data = {hash_: timestamp for hash_ in info_hashes}
+            # Create mapping of info_hash to expiry timestamp
+            cache_data = {hash_: timestamp for hash_ in info_hashes}
 
-        # Store all hashes with their expiry timestamps in one operation
-        await REDIS_ASYNC_CLIENT.hset(cache_key, mapping=cache_data)
+            # Store all hashes with their expiry timestamps in one operation
+            await REDIS_ASYNC_CLIENT.hset(cache_key, mapping=cache_data)
 
         # Submit to MediaFusion
         if settings.sync_debrid_cache_streams:
@@ -76,74 +86,125 @@ async def store_cached_info_hashes(
         logging.error(f"Error storing cached info hashes for {service}: {e}")
 
 
-async def get_cached_status(
-    streaming_provider: StreamingProvider, info_hashes: List[str]
+# Keep references to fire-and-forget tasks until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _run_in_background(coroutine) -> asyncio.Task:
+    task = asyncio.create_task(coroutine)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def get_local_cached_status(
+    service: str, info_hashes: List[str]
 ) -> Dict[str, bool]:
     """
-    Get cached status for multiple info hashes from both local Redis and MediaFusion.
-    If a hash isn't found in Redis or is expired, checks MediaFusion Public Host.
+    Look up info hashes in the local Redis cache. Expired entries are reported
+    as not cached and removed in the background.
+    """
+    if settings.debrid_cache_compact_layout:
+        return await compact_debrid_cache.get_status(service, info_hashes)
+
+    cache_key = f"{CACHE_KEY_PREFIX}{service}"
+    current_time = int(datetime.now(tz=timezone.utc).timestamp())
+
+    # Get all timestamps in one operation
+    timestamps = await REDIS_ASYNC_CLIENT.hmget(cache_key, info_hashes)
+
+    result = {}
+    expired_hashes = []
+    for info_hash, timestamp_bytes in zip(info_hashes, timestamps):
+        if timestamp_bytes is None:
+            result[info_hash] = False
+            continue
+
+        try:
+            result[info_hash] = int(timestamp_bytes) > current_time
+        except (ValueError, TypeError):
+            result[info_hash] = False
+        if not result[info_hash]:
+            expired_hashes.append(info_hash)
+
+    # Clean up expired entries without holding up the lookup
+    if expired_hashes:
+        _run_in_background(REDIS_ASYNC_CLIENT.hdel(cache_key, *expired_hashes))
+
+    return result
+
+
+async def iter_cached_status(
+    streaming_provider: StreamingProvider,
+    info_hashes: List[str],
+    deadline: float | None = None,
+) -> AsyncIterator[Dict[str, bool]]:
+    """
+    Resolve cached status from local Redis, then from MediaFusion Public Host
+    for the hashes Redis doesn't know, yielding each source's results as soon
+    as they arrive. The public host lookup keeps running after `deadline` so
+    the hashes it learns about are still stored for the next request.
 
     Args:
         streaming_provider: The streaming provider object
         info_hashes: List of info hashes to check
+        deadline: Seconds to wait for the public host, defaults to settings
 
-    Returns:
+    Yields:
         Dict[str, bool]: Maps info_hash to cached status
     """
     if not info_hashes:
-        return {}
+        return
 
     service = get_cache_service_name(streaming_provider)
+    deadline = settings.debrid_cache_status_deadline if deadline is None else deadline
 
     try:
-        # First check local Redis cache
-        cache_key = f"{CACHE_KEY_PREFIX}{service}"
-        current_time = int(datetime.now(tz=timezone.utc).timestamp())
+        local_status = await get_local_cached_status(service, info_hashes)
+    except Exception as e:
+        logging.error(f"Error getting cached status for {service}: {e}")
+        local_status = {}
+    yield local_status
+
+    unknown_hashes = [hash_ for hash_ in info_hashes if not local_status.get(hash_)]
+    if not (
+        unknown_hashes
+        and settings.sync_debrid_cache_streams
+        and settings.mediafusion_url
+    ):
+        return
+    mediafusion_lookup = _run_in_background(
+        mediafusion_client.fetch_cache_status(streaming_provider, unknown_hashes)
+    )
+    try:
+        yield await asyncio.wait_for(
+            asyncio.shield(mediafusion_lookup), timeout=deadline
+        )
+    except asyncio.TimeoutError:
+        logging.warning(
+            f"MediaFusion cache status for {service} missed the {deadline}s deadline"
+        )
 
-        # Get all timestamps in one operation
-        timestamps = await REDIS_ASYNC_CLIENT.hmget(cache_key, info_hashes)
 
-        # Process results and identify which hashes need MediaFusion check
-        result = {}
-        expired_hashes = []
-        mediafusion_check_needed = []
-
-        for info_hash, timestamp_bytes in zip(info_hashes, timestamps):
-            if timestamp_bytes is None:
-                mediafusion_check_needed.append(info_hash)
-                continue
-
-            try:
-                expiry_time = int(timestamp_bytes)
-                if expiry_time > current_time:
-                    result[info_hash] = True
-                else:
-                    expired_hashes.append(info_hash)
-                    mediafusion_check_needed.append(info_hash)
-            except (ValueError, TypeError):
-                expired_hashes.append(info_hash)
-                mediafusion_check_needed.append(info_hash)
-
-        # Clean up expired entries if any found
-        if expired_hashes:
-            await REDIS_ASYNC_CLIENT.hdel(cache_key, *expired_hashes)
-
-        # Check MediaFusion for any hashes not found in Redis or expired
-        if mediafusion_check_needed and settings.sync_debrid_cache_streams:
-            mediafusion_results = await mediafusion_client.fetch_cache_status(
-                streaming_provider, mediafusion_check_needed
-            )
-            result.update(mediafusion_results)
-        else:
-            # If MediaFusion isn't available, mark all uncached hashes as False
-            for hash_ in mediafusion_check_needed:
-                result[hash_] = False
+async def get_cached_status(
+    streaming_provider: StreamingProvider, info_hashes: List[str]
+) -> Dict[str, bool]:
+    """
+    Get cached status for multiple info hashes from both local Redis and MediaFusion.
 
-        return result
+    Args:
+        streaming_provider: The streaming provider object
+        info_hashes: List of info hashes to check
 
-    except Exception as e:
-        logging.error(f"Error getting cached status for {service}: {e}")
-        return {hash_: False for hash_ in info_hashes}
+    Returns:
+        Dict[str, bool]: Maps info_hash to cached status
+    """
+    result = {hash_: False for hash_ in info_hashes}
+    async for cached_status in iter_cached_status(streaming_provider, info_hashes):
+        result.update(
+            (hash_, True) for hash_, is_cached in cached_status.items() if is_cached
+        )
+    return result
 
 
 async def cleanup_service_cache(service: str) -> None:
@@ -204,6 +265,10 @@ async def cleanup_expired_cache(**kwargs):
             service_name = service.decode("utf-8").replace(CACHE_KEY_PREFIX, "")
             logging.info(f"Cleaning up cache for {service_name}")
             await cleanup_service_cache(service_name)
+
+        for service_name in await compact_debrid_cache.get_services():
+            logging.info(f"Cleaning up compact cache for {service_name}")
+            await compact_debrid_cache.cleanup(service_name)
     except Exception as e:
         logging.error(f"Error during cache cleanup: {e}")
 
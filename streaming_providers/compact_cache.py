@@ -0,0 +1,164 @@
+"""
+Compact Redis layout for the per-provider debrid cache.
+
+The legacy layout keeps a single `debrid_cache:<service>` hash mapping the
+40 char hex info hash to an expiry timestamp. With millions of entries that
+hash uses the hashtable encoding and cleanup has to HSCAN all of it. The
+compact layout stores:
+
+- `debrid_cache_v2:<service>:<bucket>`: raw 20 byte info hash -> expiry day,
+  spread over `debrid_cache_buckets` hashes so each stays listpack encoded.
+- `debrid_cache_v2:<service>:expiry:<day>`: the buckets written with that
+  expiry day, so cleanup only visits the buckets of the expired days.
+- `debrid_cache_v2:<service>:expiry_days` and `debrid_cache_v2:services`:
+  the pending expiry days and the services using this layout.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+KEY_PREFIX = "debrid_cache_v2:"
+SERVICES_KEY = f"{KEY_PREFIX}services"
+PIPELINE_CHUNK_SIZE = 1000
+
+# Remove the entries of a bucket that expired on or before ARGV[1]
+CLEANUP_BUCKET_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[1])
+local expired = {}
+for i = 1, #entries, 2 do
+    if tonumber(entries[i + 1]) <= tonumber(ARGV[1]) then
+        table.insert(expired, entries[i])
+    end
+end
+for i = 1, #expired, 1000 do
+    redis.call('HDEL', KEYS[1], unpack(expired, i, math.min(i + 999, #expired)))
+end
+return #expired
+"""
+
+
+def current_day() -> int:
+    """Days since the epoch, the unit of expiry in the compact layout."""
+    return int(time.time() // 86400)
+
+
+def encode_info_hash(info_hash: str) -> bytes | None:
+    try:
+        raw = bytes.fromhex(info_hash)
+    except ValueError:
+        return None
+    return raw if len(raw) == 20 else None
+
+
+class CompactDebridCache:
+    """Bucketed, binary-keyed debrid cache store with day-bucketed expiry."""
+
+    def __init__(self, buckets: int):
+        self.buckets = buckets
+        self._cleanup_script = REDIS_ASYNC_CLIENT.register_script(CLEANUP_BUCKET_SCRIPT)
+
+    def bucket_key(self, service: str, bucket: int) -> str:
+        return f"{KEY_PREFIX}{service}:{bucket}"
+
+    def bucket_of(self, raw_hash: bytes) -> int:
+        return int.from_bytes(raw_hash[:4], "big") % self.buckets
+
+    def _group_by_bucket(
+        self, info_hashes: Iterable[str]
+    ) -> Dict[int, List[tuple[str, bytes]]]:
+        buckets = defaultdict(list)
+        for info_hash in info_hashes:
+            if raw := encode_info_hash(info_hash):
+                buckets[self.bucket_of(raw)].append((info_hash, raw))
+        return buckets
+
+    async def store(self, service: str, expiry_days: Dict[str, int]) -> None:
+        """Store info hashes with their expiry day."""
+        grouped = defaultdict(lambda: defaultdict(dict))
+        for info_hash, expiry_day in expiry_days.items():
+            if raw := encode_info_hash(info_hash):
+                grouped[expiry_day][self.bucket_of(raw)][raw] = expiry_day
+
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            pipe.sadd(SERVICES_KEY, service)
+            for expiry_day, buckets in grouped.items():
+                pipe.sadd(f"{KEY_PREFIX}{service}:expiry_days", expiry_day)
+                pipe.sadd(f"{KEY_PREFIX}{service}:expiry:{expiry_day}", *buckets)
+                for bucket, mapping in buckets.items():
+                    pipe.hset(self.bucket_key(service, bucket), mapping=mapping)
+            await pipe.execute()
+
+    async def get_status(self, service: str, info_hashes: List[str]) -> Dict[str, bool]:
+        """Look up info hashes with one pipelined HMGET per touched bucket."""
+        result = {info_hash: False for info_hash in info_hashes}
+        grouped = list(self._group_by_bucket(info_hashes).items())
+        if not grouped:
+            return result
+
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            for bucket, entries in grouped:
+                pipe.hmget(
+                    self.bucket_key(service, bucket), [raw for _, raw in entries]
+                )
+            responses = await pipe.execute()
+
+        today = current_day()
+        for (_, entries), expiry_days in zip(grouped, responses):
+            for (info_hash, _), expiry_day in zip(entries, expiry_days):
+                if expiry_day is not None:
+                    result[info_hash] = int(expiry_day) > today
+        return result
+
+    async def cleanup(self, service: str) -> int:
+        """Remove the entries of every expired day, bucket by bucket."""
+        today = current_day()
+        days_key = f"{KEY_PREFIX}{service}:expiry_days"
+        expired_days = sorted(
+            int(day) for day in await REDIS_ASYNC_CLIENT.smembers(days_key)
+        )
+        removed = 0
+        for day in expired_days:
+            if day > today:
+                break
+            expiry_key = f"{KEY_PREFIX}{service}:expiry:{day}"
+            buckets = [int(b) for b in await REDIS_ASYNC_CLIENT.smembers(expiry_key)]
+            for start in range(0, len(buckets), PIPELINE_CHUNK_SIZE):
+                async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+                    for bucket in buckets[start : start + PIPELINE_CHUNK_SIZE]:
+                        await self._cleanup_script(
+                            keys=[self.bucket_key(service, bucket)],
+                            args=[day],
+                            client=pipe,
+                        )
+                    removed += sum(await pipe.execute())
+            await REDIS_ASYNC_CLIENT.delete(expiry_key)
+            await REDIS_ASYNC_CLIENT.srem(days_key, day)
+
+        if removed:
+            logging.info(f"Cleaned up {removed} expired entries for {service}")
+        return removed
+
+    async def count(self, service: str) -> int:
+        total = 0
+        for start in range(0, self.buckets, PIPELINE_CHUNK_SIZE):
+            async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+                for bucket in range(
+                    start, min(start + PIPELINE_CHUNK_SIZE, self.buckets)
+                ):
+                    pipe.hlen(self.bucket_key(service, bucket))
+                total += sum(await pipe.execute())
+        return total
+
+    async def get_services(self) -> List[str]:
+        return sorted(
+            service.decode("utf-8")
+            for service in await REDIS_ASYNC_CLIENT.smembers(SERVICES_KEY)
+        )
+
+
+compact_debrid_cache = CompactDebridCache(settings.debrid_cache_buckets)
@@ -3,13 +3,64 @@ from datetime import datetime, timezone
 from typing import Any, Optional
 from os.path import basename
 
-import PTT
-
 from db.models import TorrentStreams, EpisodeFile
 from streaming_providers.exceptions import ProviderException
+from utils.title_parser import parse_title, parse_many
 from utils.validation_helper import is_video_file
 
 
+async def parse_file_episodes(
+    files: list[dict], name_key: str, torrent_name: Optional[str] = None
+) -> list[tuple[int, Optional[int], Optional[int], dict]]:
+    """
+    Parse the video files of a torrent in one batch and return their file
+    index, season and episode numbers and parsed data. Files without their own
+    season or episode number inherit it from a torrent name with a single one.
+    """
+    video_files = [
+        (index, file[name_key])
+        for index, file in enumerate(files)
+        if is_video_file(file[name_key])
+    ]
+    # Parsed inline, playback requests shouldn't start or queue on the pool
+    parsed_titles = await parse_many(
+        [name for _, name in video_files] + ([torrent_name] if torrent_name else []),
+        use_pool=False,
+    )
+    title_parsed_data = parsed_titles.pop() if torrent_name else {}
+    title_seasons = title_parsed_data.get("seasons") or []
+    title_episodes = title_parsed_data.get("episodes") or []
+
+    file_episodes = []
+    for (index, _), parsed_data in zip(video_files, parsed_titles):
+        seasons = parsed_data.get("seasons") or (
+            title_seasons if len(title_seasons) == 1 else []
+        )
+        episodes = parsed_data.get("episodes") or (
+            title_episodes if len(title_episodes) == 1 else []
+        )
+        file_episodes.append(
+            (
+                index,
+                seasons[0] if seasons else None,
+                episodes[0] if episodes else None,
+                parsed_data,
+            )
+        )
+    return file_episodes
+
+
+def build_episode_file_index(
+    file_episodes: list[tuple[int, Optional[int], Optional[int], dict]],
+) -> dict[tuple[int, int], int]:
+    """Map each (season, episode) to the first file index holding it."""
+    episode_file_index = {}
+    for index, season_number, episode_number, _ in file_episodes:
+        if season_number is not None and episode_number is not None:
+            episode_file_index.setdefault((season_number, episode_number), index)
+    return episode_file_index
+
+
 async def select_file_index_from_torrent(
     torrent_info: dict[str, Any],
     filename: Optional[str],
@@ -29,15 +80,18 @@ async def select_file_index_from_torrent(
                 return index
 
     if season and episode:
-        # Select the file with the matching episode number
-        for index, file in enumerate(files):
-            if not is_video_file(file[name_key]):
-                continue
-            season_parsed_data = PTT.parse_title(file[name_key])
-            found_season = season_parsed_data.get("seasons")
-            if (
-                found_season and season in found_season
-            ) or episode in season_parsed_data.get("episodes"):
+        # Select the file with the matching season and episode number
+        file_episodes = await parse_file_episodes(files, name_key)
+        episode_file_index = build_episode_file_index(file_episodes)
+        if (season, episode) in episode_file_index:
+            return episode_file_index[(season, episode)]
+
+        # Fall back to files matching either the season or the episode
+        for index, _, _, parsed_data in file_episodes:
+            found_season = parsed_data.get("seasons")
+            if (found_season and season in found_season) or episode in parsed_data.get(
+                "episodes"
+            ):
                 return index
         raise ProviderException(
             "No matching file available for this torrent", "no_matching_file.mp4"
@@ -78,37 +132,22 @@ async def update_torrent_streams_metadata(
         logging.info(f"Updated {torrent_stream.id} metadata")
 
     else:
-        title_parsed_data = PTT.parse_title(torrent_stream.torrent_name)
-        episodes = []
-        for idx, file in enumerate(files_data):
-            file_parsed_data = PTT.parse_title(file[name_key])
-            season_number = file_parsed_data.get("seasons") or None
-            if (
-                season_number is None
-                and title_parsed_data.get("seasons")
-                and len(title_parsed_data["seasons"]) == 1
-            ):
-                season_number = title_parsed_data["seasons"][0]
-            episode_number = file_parsed_data.get("episodes") or None
-            if (
-                episode_number is None
-                and title_parsed_data.get("episodes")
-                and len(title_parsed_data["episodes"]) == 1
-            ):
-                episode_number = title_parsed_data["episodes"][0]
-
-            if not season_number or not episode_number:
-                continue
-
-            episodes.append(
-                EpisodeFile(
-                    season_number=season_number,
-                    episode_number=episode_number,
-                    filename=basename(file[name_key]),
-                    size=file[size_key],
-                    file_index=idx if is_index_trustable else None,
-                )
+        # Store the season and episode of every file, so later playbacks
+        # resolve their file from episode_files without parsing
+        file_episodes = await parse_file_episodes(
+            files_data, name_key, torrent_stream.torrent_name
+        )
+        episodes = [
+            EpisodeFile(
+                season_number=season_number,
+                episode_number=episode_number,
+                filename=basename(files_data[idx][name_key]),
+                size=files_data[idx][size_key],
+                file_index=idx if is_index_trustable else None,
             )
+            for idx, season_number, episode_number, _ in file_episodes
+            if season_number and episode_number
+        ]
 
         if not episodes:
             return
@@ -15,6 +15,7 @@ from fastapi.responses import RedirectResponse
 
 from db import crud, schemas
 from db.config import settings
+from db.enums import TorrentType
 from db.schemas import (
     CacheStatusResponse,
     CacheStatusRequest,
@@ -98,6 +99,9 @@ async def get_or_create_video_url(
     Retrieves or generates the video URL based on stream data and user info.
     """
     magnet_link = torrent.convert_info_hash_to_magnet(info_hash, stream.announce_list)
+    if stream.torrent_type != TorrentType.PUBLIC and not stream.torrent_file:
+        # Private torrents are added to the provider from their .torrent file
+        stream.torrent_file = await crud.get_torrent_file(info_hash)
     episodes = stream.get_episodes(season, episode)
     if not filename:
         episode_data = episodes[0] if episodes else None
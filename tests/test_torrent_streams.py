@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from beanie import init_beanie
+from beanie.odm.utils.dump import get_dict
+
+from db.models import TorrentFile, TorrentStreams
+
+
+def init_db():
+    client = mongomock_motor.AsyncMongoMockClient()
+    return init_beanie(
+        database=client.mediafusion,
+        document_models=[TorrentStreams, TorrentFile],
+        skip_indexes=True,
+    )
+
+
+def build_stream(**kwargs) -> TorrentStreams:
+    return TorrentStreams(
+        id="0123456789abcdef0123456789abcdef01234567",
+        meta_id="tt0111161",
+        torrent_name="The.Shawshank.Redemption.1994.1080p.BluRay.x264",
+        size=1024,
+        announce_list=[],
+        languages=["English"],
+        source="Contribution Stream",
+        catalog=["contribution_stream"],
+        torrent_type="private",
+        **kwargs,
+    )
+
+
+def test_bulk_insert_document_has_no_torrent_file():
+    async def run():
+        await init_db()
+        return get_dict(build_stream(torrent_file=b"abc"), to_db=True)
+
+    assert "torrent_file" not in asyncio.run(run())
+
+
+def test_saved_stream_has_no_torrent_file():
+    async def run():
+        await init_db()
+        stream = build_stream(torrent_file=b"abc")
+        await stream.save()
+        assert stream.torrent_file == b"abc"
+        return await TorrentStreams.get_motor_collection().find_one({"_id": stream.id})
+
+    stored = asyncio.run(run())
+    assert stored is not None
+    assert "torrent_file" not in stored
@@ -0,0 +1,79 @@
+"""
+Single pass bencode decoder for torrent files.
+
+Decodes into the same structure as bencodepy (bytes keys and strings, ints,
+lists and dicts) and records the byte span of the top level `info` value, so
+the info hash is the SHA1 of the original bytes instead of a re-encoded copy.
+"""
+
+import hashlib
+
+DIGITS = b"0123456789"
+
+
+class BencodeError(ValueError):
+    pass
+
+
+class TorrentDecoder:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.info_span: tuple[int, int] | None = None
+
+    def decode(self):
+        # Trailing bytes after the top level value are ignored
+        value, _ = self.decode_value(0, depth=0)
+        return value
+
+    def decode_value(self, position: int, depth: int):
+        content = self.content
+        token = content[position : position + 1]
+
+        if token == b"i":
+            end = content.index(b"e", position)
+            return int(content[position + 1 : end]), end + 1
+
+        if token == b"l":
+            values = []
+            position += 1
+            while content[position : position + 1] != b"e":
+                value, position = self.decode_value(position, depth + 1)
+                values.append(value)
+            return values, position + 1
+
+        if token == b"d":
+            values = {}
+            position += 1
+            while content[position : position + 1] != b"e":
+                key, position = self.decode_string(position)
+                value_start = position
+                values[key], position = self.decode_value(position, depth + 1)
+                if depth == 0 and key == b"info":
+                    self.info_span = (value_start, position)
+            return values, position + 1
+
+        if token and token in DIGITS:
+            return self.decode_string(position)
+
+        raise BencodeError(f"Invalid token {token!r} at position {position}")
+
+    def decode_string(self, position: int) -> tuple[bytes, int]:
+        colon = self.content.index(b":", position)
+        start = colon + 1
+        end = start + int(self.content[position:colon])
+        if end > len(self.content):
+            raise BencodeError("String exceeds the data length")
+        return self.content[start:end], end
+
+
+def decode_torrent(content: bytes) -> tuple[dict, str]:
+    """Decode a torrent file and return it with its lowercase hex info hash."""
+    decoder = TorrentDecoder(content)
+    try:
+        torrent_data = decoder.decode()
+    except (ValueError, RecursionError) as e:
+        raise BencodeError(f"Invalid bencoded data: {e}") from e
+    if not isinstance(torrent_data, dict) or decoder.info_span is None:
+        raise BencodeError("Torrent has no info dictionary")
+    start, end = decoder.info_span
+    return torrent_data, hashlib.sha1(content[start:end]).hexdigest()
@@ -0,0 +1,191 @@
+"""
+"Already scraped" dedupe for spider URLs and info hashes.
+
+Each dedupe keeps a Bloom filter sized for `scraped_dedupe_capacity` entries
+at `scraped_dedupe_error_rate` false positives, so memory stays fixed no
+matter how long a spider has been running. By default the filter lives in
+process and is mirrored to a Redis bitmap: it is loaded once when the spider
+starts, lookups for a whole page of links are answered from memory, and new
+entries set their bits in Redis with one pipelined round trip per batch. With
+`scraped_dedupe_use_redisbloom` the RedisBloom module is used instead, one
+BF.MEXISTS / BF.MADD call per batch.
+
+Entries of the legacy Redis sets are imported the first time a filter is
+created, after which those sets are no longer written to.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+from typing import Iterable
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+KEY_PREFIX = "scraped_dedupe:"
+
+
+class BloomFilter:
+    """Pure-Python Bloom filter backed by a bytearray."""
+
+    def __init__(self, capacity: int, error_rate: float, bits: bytes | None = None):
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        num_bytes = (self.size + 7) // 8
+        if bits and len(bits) <= num_bytes:
+            self.bits = bytearray(bits.ljust(num_bytes, b"\0"))
+        else:
+            self.bits = bytearray(num_bytes)
+
+    def positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(item)
+        )
+
+    def add(self, item: str) -> list[int]:
+        """Add an item and return its bit positions."""
+        positions = self.positions(item)
+        for position in positions:
+            self.bits[position >> 3] |= 1 << (position & 7)
+        return positions
+
+    def estimated_count(self) -> int:
+        set_bits = int.from_bytes(self.bits, "little").bit_count()
+        if set_bits >= self.size:
+            return self.capacity
+        return round(-self.size / self.hash_count * math.log(1 - set_bits / self.size))
+
+
+class ScrapedDedupe:
+    """Batch membership checks for the items a spider already scraped."""
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int | None = None,
+        error_rate: float | None = None,
+        legacy_set_key: str | None = None,
+    ):
+        self.name = name
+        self.capacity = capacity or settings.scraped_dedupe_capacity
+        self.error_rate = error_rate or settings.scraped_dedupe_error_rate
+        self.legacy_set_key = legacy_set_key
+        self.use_redisbloom = settings.scraped_dedupe_use_redisbloom
+        self.bloom: BloomFilter | None = None
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def redis_key(self) -> str:
+        # A sizing change starts a new filter instead of misreading the old one
+        return f"{KEY_PREFIX}{self.name}:{self.capacity}:{self.error_rate}"
+
+    async def load(self):
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if self.use_redisbloom:
+                await self._reserve_redisbloom()
+            else:
+                bits = await REDIS_ASYNC_CLIENT.get(self.redis_key)
+                self.bloom = BloomFilter(self.capacity, self.error_rate, bits)
+                if bits is None:
+                    await self._import_legacy_set()
+                elif self.bloom.estimated_count() > self.capacity:
+                    logging.warning(
+                        "Dedupe %s holds more than %s entries, false positives "
+                        "exceed %s",
+                        self.name,
+                        self.capacity,
+                        self.error_rate,
+                    )
+            self._loaded = True
+
+    async def _reserve_redisbloom(self):
+        if await REDIS_ASYNC_CLIENT.exists(self.redis_key):
+            return
+        await REDIS_ASYNC_CLIENT.execute_command(
+            "BF.RESERVE", self.redis_key, self.error_rate, self.capacity
+        )
+        await self._import_legacy_set()
+
+    async def _import_legacy_set(self):
+        if not self.legacy_set_key:
+            return
+        batch = []
+        imported = 0
+        async for member in REDIS_ASYNC_CLIENT.sscan_iter(
+            self.legacy_set_key, count=1000
+        ):
+            batch.append(member.decode("utf-8"))
+            if len(batch) >= 1000:
+                await self._add(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            await self._add(batch)
+            imported += len(batch)
+        logging.info(
+            "Imported %s entries from %s into dedupe %s",
+            imported,
+            self.legacy_set_key,
+            self.name,
+        )
+
+    async def contains_many(self, items: list[str]) -> list[bool]:
+        """Membership of a whole batch of items, in order."""
+        if not items:
+            return []
+        await self.load()
+        if self.use_redisbloom:
+            found = await REDIS_ASYNC_CLIENT.execute_command(
+                "BF.MEXISTS", self.redis_key, *items
+            )
+            return [bool(value) for value in found]
+        return [item in self.bloom for item in items]
+
+    async def contains(self, item: str) -> bool:
+        return (await self.contains_many([item]))[0]
+
+    async def add_many(self, items: Iterable[str]):
+        items = list(items)
+        if not items:
+            return
+        await self.load()
+        await self._add(items)
+
+    async def _add(self, items: list[str]):
+        if self.use_redisbloom:
+            await REDIS_ASYNC_CLIENT.execute_command("BF.MADD", self.redis_key, *items)
+            return
+
+        positions = set()
+        for item in items:
+            positions.update(self.bloom.add(item))
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            for position in positions:
+                # SETBIT counts bits from the most significant bit of each byte
+                pipe.setbit(self.redis_key, (position & ~7) | (7 - (position & 7)), 1)
+            await pipe.execute()
+
+
+# Spiders and pipelines of one crawl share the same in-memory filter
+_scraped_dedupes: dict[str, ScrapedDedupe] = {}
+
+
+def get_scraped_dedupe(key: str) -> ScrapedDedupe:
+    """Dedupe replacing the legacy Redis set stored under `key`."""
+    if key not in _scraped_dedupes:
+        _scraped_dedupes[key] = ScrapedDedupe(key, legacy_set_key=key)
+    return _scraped_dedupes[key]
@@ -0,0 +1,84 @@
+"""
+Migrate the legacy `debrid_cache:<service>` hashes to the compact layout.
+
+Usage: python -m utils.migrate_debrid_cache [--delete-legacy] [--debug]
+
+Expired entries are dropped. Enable `debrid_cache_compact_layout` once the
+migration has run, then run it again with --delete-legacy to copy the entries
+stored in the meantime and remove the legacy hashes.
+"""
+
+import asyncio
+import logging
+import sys
+from typing import Dict
+
+from db.redis_database import REDIS_ASYNC_CLIENT
+from streaming_providers.cache_helpers import CACHE_KEY_PREFIX
+from streaming_providers.compact_cache import compact_debrid_cache, current_day
+
+BATCH_SIZE = 1000
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+async def migrate_service(service: str, delete_legacy: bool) -> Dict[str, int]:
+    metrics = {"total": 0, "migrated": 0, "expired": 0, "invalid": 0}
+    cache_key = f"{CACHE_KEY_PREFIX}{service}"
+    today = current_day()
+    cursor = 0
+
+    while True:
+        cursor, data = await REDIS_ASYNC_CLIENT.hscan(
+            cache_key, cursor, count=BATCH_SIZE
+        )
+        expiry_days = {}
+        for info_hash, timestamp in data.items():
+            metrics["total"] += 1
+            try:
+                expiry_day = int(timestamp) // 86400
+            except (ValueError, TypeError):
+                metrics["invalid"] += 1
+                continue
+            if expiry_day <= today:
+                metrics["expired"] += 1
+                continue
+            expiry_days[info_hash.decode("utf-8")] = expiry_day
+
+        if expiry_days:
+            await compact_debrid_cache.store(service, expiry_days)
+            metrics["migrated"] += len(expiry_days)
+
+        if cursor == 0:
+            break
+
+    if delete_legacy:
+        await REDIS_ASYNC_CLIENT.unlink(cache_key)
+    return metrics
+
+
+async def main(delete_legacy: bool = False, log_level: str = "INFO"):
+    logger.setLevel(log_level)
+    logger.info(
+        f"Migrating debrid cache to the compact layout with "
+        f"delete_legacy={delete_legacy}, buckets={compact_debrid_cache.buckets}"
+    )
+
+    keys = await REDIS_ASYNC_CLIENT.keys(f"{CACHE_KEY_PREFIX}*")
+    for key in keys:
+        service = key.decode("utf-8").replace(CACHE_KEY_PREFIX, "")
+        summary = await migrate_service(service, delete_legacy)
+        logger.info(f"{service}: {summary}")
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            delete_legacy="--delete-legacy" in sys.argv,
+            log_level="DEBUG" if "--debug" in sys.argv else "INFO",
+        )
+    )
@@ -1,9 +1,11 @@
 import asyncio
 import functools
+import hashlib
 import json
 import logging
 import math
 import re
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from os.path import basename
 from typing import Optional, List, Any
@@ -13,11 +15,12 @@ from thefuzz import fuzz
 
 from db.config import settings
 from db.enums import TorrentType
+from db.local_cache import local_cache
 from db.models import TorrentStreams, TVStreams
-from db.schemas import Stream, UserData, SortingOption
+from db.schemas import Stream, UserData
 from streaming_providers import mapper
 from streaming_providers.cache_helpers import (
-    get_cached_status,
+    iter_cached_status,
     store_cached_info_hashes,
 )
 from utils import const
@@ -27,28 +30,199 @@ from utils.network import encode_mediaflow_proxy_url
 from utils.runtime_const import TRACKERS, MANIFEST_TEMPLATE, ADULT_PARSER
 from utils.validation_helper import validate_m3u8_or_mpd_url_with_cache
 
+MIN_CREATED_AT_TIMESTAMP = datetime.min.replace(tzinfo=timezone.utc).timestamp()
+SECRET_STR_PLACEHOLDER = "__MF_SECRET_STR__"
+
+
+@dataclass(frozen=True, eq=False)
+class StreamPreferencePlan:
+    """
+    Compiled form of the UserData fields that drive stream filtering & sorting.
+    Built once per distinct configuration and shared across requests.
+    """
+
+    resolutions: frozenset
+    qualities: frozenset
+    language_ranks: dict
+    sort_options: tuple[tuple[str, int], ...]
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_preference_plan(
+    selected_resolutions: tuple,
+    quality_filter: tuple,
+    language_sorting: tuple,
+    sorting_priority: tuple,
+) -> StreamPreferencePlan:
+    language_ranks = {}
+    for rank, language in enumerate(language_sorting):
+        language_ranks.setdefault(language, rank)
+
+    return StreamPreferencePlan(
+        resolutions=frozenset(selected_resolutions),
+        qualities=frozenset(
+            quality
+            for group in quality_filter
+            for quality in const.QUALITY_GROUPS[group]
+        ),
+        language_ranks=language_ranks,
+        sort_options=tuple(
+            (key, 1 if direction == "asc" else -1)
+            for key, direction in sorting_priority
+        ),
+    )
+
+
+def get_preference_plan(user_data: UserData) -> StreamPreferencePlan:
+    return _compile_preference_plan(
+        tuple(user_data.selected_resolutions),
+        tuple(user_data.quality_filter),
+        tuple(user_data.language_sorting),
+        tuple(
+            (option.key, option.direction)
+            for option in user_data.torrent_sorting_priority
+        ),
+    )
+
+
+class StreamView:
+    """
+    Per-request view over a TorrentStreams document. Holds the request specific
+    attributes (cache status, normalized fields) and delegates everything else
+    to the underlying document, so the document itself is never copied or mutated.
+    """
+
+    __slots__ = (
+        "stream",
+        "cached",
+        "filtered_resolution",
+        "filtered_quality",
+        "filtered_languages",
+        "language_rank",
+    )
+
+    def __init__(
+        self,
+        stream: TorrentStreams,
+        filtered_resolution: str | None,
+        filtered_quality: str | None,
+        filtered_languages: list[str | None],
+        language_rank: int,
+    ):
+        self.stream = stream
+        self.cached = False
+        self.filtered_resolution = filtered_resolution
+        self.filtered_quality = filtered_quality
+        self.filtered_languages = filtered_languages
+        self.language_rank = language_rank
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "stream":
+            raise AttributeError(name)
+        return getattr(self.stream, name)
+
+    def __eq__(self, other):
+        return self.stream == getattr(other, "stream", other)
+
+    def __hash__(self):
+        return hash(self.stream)
+
+
+def _created_at_timestamp(created_at: Any) -> float:
+    if isinstance(created_at, datetime):
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at.timestamp()
+    if isinstance(created_at, (int, float)):
+        return created_at
+    return MIN_CREATED_AT_TIMESTAMP
+
+
+def _build_sort_column(
+    key: str, multiplier: int, streams: list[StreamView]
+) -> list[Any]:
+    match key:
+        case "cached":
+            return [multiplier * (1 if stream.cached else 0) for stream in streams]
+        case "resolution":
+            ranking = const.RESOLUTION_RANKING
+            return [
+                multiplier * ranking.get(stream.filtered_resolution, 0)
+                for stream in streams
+            ]
+        case "quality":
+            ranking = const.QUALITY_RANKING
+            return [
+                multiplier * ranking.get(stream.filtered_quality, 0)
+                for stream in streams
+            ]
+        case "size":
+            return [multiplier * stream.size for stream in streams]
+        case "seeders":
+            return [multiplier * (stream.seeders or 0) for stream in streams]
+        case "created_at":
+            return [
+                multiplier * _created_at_timestamp(stream.created_at)
+                for stream in streams
+            ]
+        case "language":
+            return [multiplier * -stream.language_rank for stream in streams]
+        case _:
+            column = []
+            for stream in streams:
+                if key in stream.model_fields_set:
+                    value = getattr(stream, key, 0)
+                    column.append(multiplier * (value if value is not None else 0))
+                else:
+                    column.append(0)
+            return column
+
+
+async def update_provider_cache_status(
+    streaming_provider,
+    streams: list[StreamView],
+    user_data: UserData,
+    user_ip: str | None,
+    stremio_video_id: str,
+):
+    """Check the given streams with the provider and store the cached ones."""
+    service = streaming_provider.service
+    cache_update_function = mapper.CACHE_UPDATE_FUNCTIONS.get(service)
+    if not streams or not cache_update_function:
+        return
+
+    try:
+        service_name = await cache_update_function(
+            streams=streams,
+            user_data=user_data,
+            user_ip=user_ip,
+            stremio_video_id=stremio_video_id,
+        )
+        # Store only the cached ones in Redis
+        cached_info_hashes = [stream.id for stream in streams if stream.cached]
+        if cached_info_hashes:
+            await store_cached_info_hashes(
+                streaming_provider,
+                cached_info_hashes,
+                service_name,
+            )
+    except Exception as error:
+        logging.exception(f"Failed to update cache status for {service}: {error}")
+
 
 async def filter_and_sort_streams(
     streams: list[TorrentStreams],
     user_data: UserData,
     stremio_video_id: str,
     user_ip: str | None = None,
-) -> tuple[list[TorrentStreams], dict]:
-    # Convert to sets for faster lookups
-    selected_resolutions_set = set(user_data.selected_resolutions)
-    quality_filter_set = set(
-        quality
-        for group in user_data.quality_filter
-        for quality in const.QUALITY_GROUPS[group]
-    )
-    language_filter_set = set(user_data.language_sorting)
+) -> tuple[list[StreamView], dict]:
+    plan = get_preference_plan(user_data)
+    streaming_provider = user_data.streaming_provider
 
     valid_resolutions = const.SUPPORTED_RESOLUTIONS
     valid_qualities = const.SUPPORTED_QUALITIES
     valid_languages = const.SUPPORTED_LANGUAGES
 
-    # Step 1: Filter streams and add normalized attributes
-    filtered_streams = []
     filtered_reasons = {
         "Requires Streaming Provider": 0,
         "Requires Private Tracker Support": 0,
@@ -60,104 +234,115 @@ async def filter_and_sort_streams(
         "No Cached Streams": 0,
     }
 
-    for stream in streams:
-        # Skip private torrents if streaming provider is not supported
-        if stream.torrent_type != TorrentType.PUBLIC:
-            if not user_data.streaming_provider:
-                filtered_reasons["Requires Streaming Provider"] += 1
-                continue
-            if (
-                stream.torrent_type != TorrentType.WEB_SEED
-                and user_data.streaming_provider.service
-                not in const.SUPPORTED_PRIVATE_TRACKER_STREAMING_PROVIDERS
-            ):
-                filtered_reasons["Requires Private Tracker Support"] += 1
-                continue
-        # Create a copy of the stream model to avoid modifying the original
-        stream = stream.model_copy()
-        # Add normalized attributes as dynamic properties
-        stream.filtered_resolution = (
-            stream.resolution if stream.resolution in valid_resolutions else None
-        )
-        stream.filtered_quality = (
-            stream.quality if stream.quality in valid_qualities else None
+    # Step 1: Skip private torrents if streaming provider is not supported
+    if not streaming_provider:
+        candidates = [
+            stream for stream in streams if stream.torrent_type == TorrentType.PUBLIC
+        ]
+        filtered_reasons["Requires Streaming Provider"] = len(streams) - len(candidates)
+    elif (
+        streaming_provider.service
+        not in const.SUPPORTED_PRIVATE_TRACKER_STREAMING_PROVIDERS
+    ):
+        candidates = [
+            stream
+            for stream in streams
+            if stream.torrent_type in (TorrentType.PUBLIC, TorrentType.WEB_SEED)
+        ]
+        filtered_reasons["Requires Private Tracker Support"] = len(streams) - len(
+            candidates
         )
-        stream.filtered_languages = [
-            lang for lang in stream.languages if lang in valid_languages
+    else:
+        candidates = list(streams)
+
+    # Step 2: Build a columnar snapshot of the normalized attributes and apply
+    # each filter over the whole column, in the same order as the reasons above.
+    resolution_column = [
+        stream.resolution if stream.resolution in valid_resolutions else None
+        for stream in candidates
+    ]
+    indices = [
+        i for i in range(len(candidates)) if resolution_column[i] in plan.resolutions
+    ]
+    filtered_reasons["Resolution Not Selected"] = len(candidates) - len(indices)
+
+    max_size = user_data.max_size
+    remaining = len(indices)
+    indices = [i for i in indices if not candidates[i].size > max_size]
+    filtered_reasons["Size Limit Exceeded"] = remaining - len(indices)
+
+    quality_column = {}
+    for i in indices:
+        quality = candidates[i].quality
+        quality_column[i] = quality if quality in valid_qualities else None
+    remaining = len(indices)
+    indices = [i for i in indices if quality_column[i] in plan.qualities]
+    filtered_reasons["Quality Not Selected"] = remaining - len(indices)
+
+    language_ranks = plan.language_ranks
+    languages_column = {}
+    language_rank_column = {}
+    for i in indices:
+        filtered_languages = [
+            lang for lang in candidates[i].languages if lang in valid_languages
         ] or [None]
-        stream.cached = False
-
-        if stream.filtered_resolution not in selected_resolutions_set:
-            filtered_reasons["Resolution Not Selected"] += 1
-            continue
-
-        if stream.size > user_data.max_size:
-            filtered_reasons["Size Limit Exceeded"] += 1
-            continue
-
-        if stream.filtered_quality not in quality_filter_set:
-            filtered_reasons["Quality Not Selected"] += 1
-            continue
-
-        if not any(lang in language_filter_set for lang in stream.filtered_languages):
-            filtered_reasons["Language Not Selected"] += 1
-            continue
-
-        if is_contain_18_plus_keywords(stream.torrent_name):
-            filtered_reasons["Strict 18+ Keyword Filter"] += 1
-            continue
-
-        filtered_streams.append(stream)
+        languages_column[i] = filtered_languages
+        language_rank_column[i] = min(
+            (
+                language_ranks[lang]
+                for lang in filtered_languages
+                if lang in language_ranks
+            ),
+            default=None,
+        )
+    remaining = len(indices)
+    indices = [i for i in indices if language_rank_column[i] is not None]
+    filtered_reasons["Language Not Selected"] = remaining - len(indices)
+
+    remaining = len(indices)
+    indices = [
+        i
+        for i in indices
+        if not is_contain_18_plus_keywords(candidates[i].torrent_name)
+    ]
+    filtered_reasons["Strict 18+ Keyword Filter"] = remaining - len(indices)
+
+    filtered_streams = [
+        StreamView(
+            candidates[i],
+            resolution_column[i],
+            quality_column[i],
+            languages_column[i],
+            language_rank_column[i],
+        )
+        for i in indices
+    ]
 
     if not filtered_streams:
         return filtered_streams, filtered_reasons
 
-    # Step 2: Update cache status based on provider
-    if user_data.streaming_provider:
-        service = user_data.streaming_provider.service
-        info_hashes = [stream.id for stream in filtered_streams]
+    # Step 3: Update cache status based on provider
+    if streaming_provider:
+        streams_by_hash = {stream.id: stream for stream in filtered_streams}
 
-        # First check Redis cache
-        cached_statuses = await get_cached_status(
-            user_data.streaming_provider, info_hashes
+        # Local Redis answers first, the public host follows within its deadline
+        async for cached_statuses in iter_cached_status(
+            streaming_provider, list(streams_by_hash)
+        ):
+            for info_hash, is_cached in cached_statuses.items():
+                if is_cached and info_hash in streams_by_hash:
+                    streams_by_hash[info_hash].cached = True
+
+        # Only ask the provider about the streams neither cache confirmed
+        await update_provider_cache_status(
+            streaming_provider,
+            [stream for stream in filtered_streams if not stream.cached],
+            user_data,
+            user_ip,
+            stremio_video_id,
         )
 
-        # Update streams with cached status from Redis
-        uncached_streams = []
-        for stream in filtered_streams:
-            if cached_statuses.get(stream.id, False):
-                stream.cached = True
-            else:
-                stream.cached = False
-                uncached_streams.append(stream)
-
-        # For streams not found in Redis cache, use provider's cache check
-        if uncached_streams:
-            cache_update_function = mapper.CACHE_UPDATE_FUNCTIONS.get(service)
-            if cache_update_function:
-                try:
-                    service_name = await cache_update_function(
-                        streams=uncached_streams,
-                        user_data=user_data,
-                        user_ip=user_ip,
-                        stremio_video_id=stremio_video_id,
-                    )
-                    # Store only the cached ones in Redis
-                    cached_info_hashes = [
-                        stream.id for stream in uncached_streams if stream.cached
-                    ]
-                    if cached_info_hashes:
-                        await store_cached_info_hashes(
-                            user_data.streaming_provider,
-                            cached_info_hashes,
-                            service_name,
-                        )
-                except Exception as error:
-                    logging.exception(
-                        f"Failed to update cache status for {service}: {error}"
-                    )
-
-        if user_data.streaming_provider.only_show_cached_streams:
+        if streaming_provider.only_show_cached_streams:
             cached_filtered_streams = [
                 stream for stream in filtered_streams if stream.cached
             ]
@@ -166,68 +351,25 @@ async def filter_and_sort_streams(
                 return filtered_streams, filtered_reasons
             filtered_streams = cached_filtered_streams
 
-    # Step 3: Dynamically sort streams based on user preferences
-    def dynamic_sort_key(torrent_stream: TorrentStreams) -> tuple:
-        def key_value(sorting_option: SortingOption) -> Any:
-            key = sorting_option.key
-            multiplier = 1 if sorting_option.direction == "asc" else -1
-
-            match key:
-                case "cached":
-                    return multiplier * (1 if torrent_stream.cached else 0)
-                case "resolution":
-                    return multiplier * const.RESOLUTION_RANKING.get(
-                        torrent_stream.filtered_resolution, 0
-                    )
-                case "quality":
-                    return multiplier * const.QUALITY_RANKING.get(
-                        torrent_stream.filtered_quality, 0
-                    )
-                case "size":
-                    return multiplier * torrent_stream.size
-                case "seeders":
-                    return multiplier * (torrent_stream.seeders or 0)
-                case "created_at":
-                    created_at = torrent_stream.created_at
-                    if isinstance(created_at, datetime):
-                        if created_at.tzinfo is None:
-                            created_at = created_at.replace(tzinfo=timezone.utc)
-                        return multiplier * created_at.timestamp()
-                    elif isinstance(created_at, (int, float)):
-                        return multiplier * created_at
-                    else:
-                        return (
-                            multiplier
-                            * datetime.min.replace(tzinfo=timezone.utc).timestamp()
-                        )
-                case "language":
-                    return multiplier * -min(
-                        (
-                            user_data.language_sorting.index(lang)
-                            for lang in torrent_stream.filtered_languages
-                            if lang in language_filter_set
-                        ),
-                        default=len(user_data.language_sorting),
-                    )
-                case _ if key in torrent_stream.model_fields_set:
-                    value = getattr(torrent_stream, key, 0)
-                    return multiplier * (value if value is not None else 0)
-                case _:
-                    return 0
-
-        return tuple(key_value(option) for option in user_data.torrent_sorting_priority)
-
+    # Step 4: Sort streams with a single key array built from the compiled plan
     try:
-        # Sort streams based on the dynamic key
-        dynamically_sorted_streams = sorted(filtered_streams, key=dynamic_sort_key)
-
+        sort_columns = [
+            _build_sort_column(key, multiplier, filtered_streams)
+            for key, multiplier in plan.sort_options
+        ]
+        if sort_columns:
+            sort_keys = list(zip(*sort_columns))
+            order = sorted(range(len(filtered_streams)), key=sort_keys.__getitem__)
+            dynamically_sorted_streams = [filtered_streams[i] for i in order]
+        else:
+            dynamically_sorted_streams = filtered_streams
     except Exception:
         logging.exception(
-            f"torrent_sorting_priority: {user_data.torrent_sorting_priority}: sort data: {[dynamic_sort_key(stream) for stream in filtered_streams]}"
+            f"torrent_sorting_priority: {user_data.torrent_sorting_priority}: sort options: {plan.sort_options}"
         )
         dynamically_sorted_streams = filtered_streams
 
-    # Step 4: Limit streams per resolution based on user preference, after dynamic sorting
+    # Step 5: Limit streams per resolution based on user preference, after dynamic sorting
     limited_streams = []
     streams_count_per_resolution = {}
     for stream in dynamically_sorted_streams:
@@ -239,6 +381,191 @@ async def filter_and_sort_streams(
     return limited_streams, filtered_reasons
 
 
+@dataclass(frozen=True)
+class StreamDisplayOptions:
+    """The UserData fields that affect how a torrent stream is rendered."""
+
+    addon_name: str
+    show_full_torrent_name: bool
+    show_language_country_flag: bool
+    has_streaming_provider: bool
+
+    @functools.cached_property
+    def fingerprint(self) -> str:
+        return hashlib.blake2b(repr(self).encode(), digest_size=8).hexdigest()
+
+
+class RenderedStream:
+    """
+    A stream rendered to its final Stremio JSON. The user's secret_str is only
+    spliced into the streaming provider URL when the response is written.
+    """
+
+    __slots__ = ("fragment", "secret_str", "_fields")
+
+    def __init__(self, fragment: str, secret_str: str | None):
+        self.fragment = fragment
+        self.secret_str = secret_str
+        self._fields = None
+
+    def to_json(self) -> str:
+        return self.fragment.replace(SECRET_STR_PLACEHOLDER, self.secret_str or "")
+
+    def __getattr__(self, name: str) -> Any:
+        # Rarely used outside the stream response (e.g. the download page),
+        # the fragment is parsed on the first access only
+        if name in Stream.model_fields:
+            if self._fields is None:
+                self._fields = json.loads(self.to_json())
+            return self._fields.get(name)
+        raise AttributeError(name)
+
+
+def render_streams_json(streams: list[Stream | RenderedStream]) -> str:
+    """Serialize a stream response without re-validating rendered streams."""
+    return '{"streams":[%s]}' % ",".join(
+        (
+            stream.to_json()
+            if isinstance(stream, RenderedStream)
+            else stream.model_dump_json(exclude_none=True)
+        )
+        for stream in streams
+    )
+
+
+def render_stream_fragments(
+    stream_data: TorrentStreams,
+    display: StreamDisplayOptions,
+    season: int | None,
+    episode: int | None,
+    is_series: bool,
+) -> list[str]:
+    """Render the Stremio stream JSON of each matching file of a torrent."""
+    episode_variants = (
+        stream_data.get_episodes(season, episode) if is_series else [None]
+    )
+    if is_series and not episode_variants:
+        return []
+
+    fragments = []
+    for episode_data in episode_variants:
+        if episode_data:
+            file_name = episode_data.filename
+            file_index = episode_data.file_index
+        else:
+            file_name = stream_data.filename
+            file_index = stream_data.file_index
+
+        # make sure file_name is basename
+        file_name = basename(file_name) if file_name else None
+
+        if display.show_full_torrent_name:
+            torrent_name = (
+                f"{stream_data.torrent_name}/{episode_data.title or episode_data.filename or ''}"
+                if episode_data
+                else stream_data.torrent_name
+            )
+            torrent_name = "📂 " + torrent_name.replace(".torrent", "").replace(
+                ".", " "
+            )
+        else:
+            torrent_name = None
+
+        # Compute quality_detail
+        quality_detail = " ".join(
+            filter(
+                None,
+                [
+                    f"🎨 {'|'.join(stream_data.hdr)}" if stream_data.hdr else None,
+                    f"📺 {stream_data.quality}" if stream_data.quality else None,
+                    f"🎞️ {stream_data.codec}" if stream_data.codec else None,
+                    (
+                        f"🎵 {'|'.join(stream_data.audio)}"
+                        if stream_data.audio
+                        else None
+                    ),
+                ],
+            )
+        )
+
+        resolution = stream_data.resolution.upper() if stream_data.resolution else "N/A"
+        streaming_provider_status = "⚡️" if stream_data.cached else "⏳"
+        seeders_info = (
+            f"👤 {stream_data.seeders}" if stream_data.seeders is not None else None
+        )
+        if episode_data and episode_data.size:
+            file_size = episode_data.size
+            size_info = f"{convert_bytes_to_readable(file_size)} / {convert_bytes_to_readable(stream_data.size)}"
+        else:
+            file_size = stream_data.size
+            size_info = convert_bytes_to_readable(file_size)
+
+        if display.show_language_country_flag:
+            languages = filter(
+                None,
+                set(
+                    [
+                        const.LANGUAGE_COUNTRY_FLAGS.get(lang)
+                        for lang in stream_data.languages
+                    ]
+                ),
+            )
+        else:
+            languages = stream_data.languages
+
+        languages = f"🌐 {' + '.join(languages)}" if stream_data.languages else None
+        source_info = f"🔗 {stream_data.source}"
+        if stream_data.uploader:
+            source_info += f" 🧑‍💻 {stream_data.uploader}"
+
+        description = "\n".join(
+            filter(
+                None,
+                [
+                    torrent_name if display.show_full_torrent_name else quality_detail,
+                    " ".join(filter(None, [size_info, seeders_info])),
+                    languages,
+                    source_info,
+                ],
+            )
+        )
+
+        stream_details = {
+            "name": f"{display.addon_name} {resolution} {streaming_provider_status}",
+            "description": description,
+            "behaviorHints": {
+                "bingeGroup": f"{settings.addon_name.replace(' ', '-')}-{quality_detail}-{resolution}",
+                "filename": file_name or stream_data.torrent_name,
+                "videoSize": file_size,
+            },
+        }
+
+        if display.has_streaming_provider:
+            stream_details["url"] = (
+                f"{settings.host_url}/streaming_provider/{SECRET_STR_PLACEHOLDER}"
+                f"/stream/{stream_data.id}"
+            )
+            if episode_data:
+                stream_details["url"] += f"/{season}/{episode}"
+            if file_name:
+                stream_details["url"] += f"/{quote(file_name)}"
+            stream_details["behaviorHints"]["notWebReady"] = True
+        else:
+            stream_details["infoHash"] = stream_data.id
+            if file_index is not None:
+                stream_details["fileIdx"] = file_index
+            stream_details["sources"] = [
+                f"tracker:{tracker}"
+                for tracker in (stream_data.announce_list or TRACKERS)
+            ] + [f"dht:{stream_data.id}"]
+
+        fragments.append(
+            json.dumps(stream_details, ensure_ascii=False, separators=(",", ":"))
+        )
+
+    return fragments
+
+
 async def parse_stream_data(
     streams: list[TorrentStreams],
     user_data: UserData,
@@ -247,7 +574,7 @@ async def parse_stream_data(
     episode: int = None,
     user_ip: str | None = None,
     is_series: bool = False,
-) -> list[Stream]:
+) -> list[Stream | RenderedStream]:
     if not streams:
         return []
 
@@ -281,142 +608,51 @@ async def parse_stream_data(
         ]
 
     # Precompute constant values
-    show_full_torrent_name = user_data.show_full_torrent_name
     has_streaming_provider = user_data.streaming_provider is not None
     download_via_browser = (
         has_streaming_provider and user_data.streaming_provider.download_via_browser
     )
+    if (
+        has_streaming_provider
+        and user_data.mediaflow_config
+        and user_data.mediaflow_config.proxy_debrid_streams
+    ):
+        addon_name += " 🕵🏼‍♂️"
 
-    base_proxy_url_template = ""
-    if has_streaming_provider:
-        if (
-            user_data.mediaflow_config
-            and user_data.mediaflow_config.proxy_debrid_streams
-        ):
-            addon_name += " 🕵🏼‍♂️"
+    display = StreamDisplayOptions(
+        addon_name=addon_name,
+        show_full_torrent_name=user_data.show_full_torrent_name,
+        show_language_country_flag=user_data.show_language_country_flag,
+        has_streaming_provider=has_streaming_provider,
+    )
 
-        base_proxy_url_template = (
-            f"{settings.host_url}/streaming_provider/{secret_str}/stream/{{}}"
-        )
+    # Rendered fragments are cached under the stream cache key, so storing new
+    # streams for this title invalidates them together with the stream list.
+    render_key = f"torrent_streams:{stremio_video_id}:render:{display.fingerprint}"
+    fragments = local_cache.get(render_key)
+    if fragments is None:
+        fragments = {}
+    new_fragments = False
 
     stream_list = []
     for stream_data in streams:
-        episode_variants = (
-            stream_data.get_episodes(season, episode) if is_series else [None]
-        )
-        if is_series and not episode_variants:
-            continue
-
-        for episode_data in episode_variants:
-            if episode_data:
-                file_name = episode_data.filename
-                file_index = episode_data.file_index
-            else:
-                file_name = stream_data.filename
-                file_index = stream_data.file_index
-
-            # make sure file_name is basename
-            file_name = basename(file_name) if file_name else None
-
-            if show_full_torrent_name:
-                torrent_name = (
-                    f"{stream_data.torrent_name}/{episode_data.title or episode_data.filename or ''}"
-                    if episode_data
-                    else stream_data.torrent_name
-                )
-                torrent_name = "📂 " + torrent_name.replace(".torrent", "").replace(
-                    ".", " "
-                )
-            else:
-                torrent_name = None
-
-            # Compute quality_detail
-            quality_detail = " ".join(
-                filter(
-                    None,
-                    [
-                        f"🎨 {'|'.join(stream_data.hdr)}" if stream_data.hdr else None,
-                        f"📺 {stream_data.quality}" if stream_data.quality else None,
-                        f"🎞️ {stream_data.codec}" if stream_data.codec else None,
-                        (
-                            f"🎵 {'|'.join(stream_data.audio)}"
-                            if stream_data.audio
-                            else None
-                        ),
-                    ],
-                )
-            )
-
-            resolution = (
-                stream_data.resolution.upper() if stream_data.resolution else "N/A"
-            )
-            streaming_provider_status = "⚡️" if stream_data.cached else "⏳"
-            seeders_info = (
-                f"👤 {stream_data.seeders}" if stream_data.seeders is not None else None
+        fragment_key = (stream_data.id, stream_data.cached)
+        stream_fragments = fragments.get(fragment_key)
+        if stream_fragments is None:
+            stream_fragments = fragments[fragment_key] = render_stream_fragments(
+                stream_data, display, season, episode, is_series
             )
-            if episode_data and episode_data.size:
-                file_size = episode_data.size
-                size_info = f"{convert_bytes_to_readable(file_size)} / {convert_bytes_to_readable(stream_data.size)}"
-            else:
-                file_size = stream_data.size
-                size_info = convert_bytes_to_readable(file_size)
-
-            if user_data.show_language_country_flag:
-                languages = filter(
-                    None,
-                    set(
-                        [
-                            const.LANGUAGE_COUNTRY_FLAGS.get(lang)
-                            for lang in stream_data.languages
-                        ]
-                    ),
-                )
-            else:
-                languages = stream_data.languages
-
-            languages = f"🌐 {' + '.join(languages)}" if stream_data.languages else None
-            source_info = f"🔗 {stream_data.source}"
-            if stream_data.uploader:
-                source_info += f" 🧑‍💻 {stream_data.uploader}"
-
-            description = "\n".join(
-                filter(
-                    None,
-                    [
-                        torrent_name if show_full_torrent_name else quality_detail,
-                        " ".join(filter(None, [size_info, seeders_info])),
-                        languages,
-                        source_info,
-                    ],
-                )
-            )
-
-            stream_details = {
-                "name": f"{addon_name} {resolution} {streaming_provider_status}",
-                "description": description,
-                "behaviorHints": {
-                    "bingeGroup": f"{settings.addon_name.replace(' ', '-')}-{quality_detail}-{resolution}",
-                    "filename": file_name or stream_data.torrent_name,
-                    "videoSize": file_size,
-                },
-            }
-
-            if has_streaming_provider:
-                stream_details["url"] = base_proxy_url_template.format(stream_data.id)
-                if episode_data:
-                    stream_details["url"] += f"/{season}/{episode}"
-                if file_name:
-                    stream_details["url"] += f"/{quote(file_name)}"
-                stream_details["behaviorHints"]["notWebReady"] = True
-            else:
-                stream_details["infoHash"] = stream_data.id
-                stream_details["fileIdx"] = file_index
-                stream_details["sources"] = [
-                    f"tracker:{tracker}"
-                    for tracker in (stream_data.announce_list or TRACKERS)
-                ] + [f"dht:{stream_data.id}"]
+            new_fragments = True
+        stream_list.extend(
+            RenderedStream(fragment, secret_str) for fragment in stream_fragments
+        )
 
-            stream_list.append(Stream(**stream_details))
+    if new_fragments:
+        local_cache.set(
+            render_key,
+            fragments,
+            sum(len(fragment) for items in fragments.values() for fragment in items),
+        )
 
     if stream_list and download_via_browser:
         download_url = f"{settings.host_url}/download/{secret_str}/{'series' if is_series else 'movie'}/{streams[0].meta_id}"
@@ -0,0 +1,98 @@
+"""
+Request coalescing ("single-flight") for expensive lookups.
+
+Concurrent calls for the same key share one execution: within a worker they
+await the same task, across workers the first caller holds a Redis lock while
+the others wait for its completion message and then read the shared result
+from the cache, instead of polling the lock.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+from prometheus_client import Counter
+
+from db.redis_database import REDIS_ASYNC_CLIENT
+from utils.lock import acquire_redis_lock, release_redis_lock
+
+T = TypeVar("T")
+
+singleflight_calls = Counter(
+    "singleflight_calls_total",
+    "Coalesced calls, labeled by flight name and caller role",
+    labelnames=["flight", "role"],
+)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key within this process."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(func())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._forget(key, flight))
+            singleflight_calls.labels(flight=self.name, role="leader").inc()
+        else:
+            singleflight_calls.labels(flight=self.name, role="follower").inc()
+
+        # A cancelled caller must not cancel the work other callers wait on.
+        return await asyncio.shield(flight)
+
+    def _forget(self, key: str, flight: asyncio.Future):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+async def _wait_for_message(pubsub):
+    async for message in pubsub.listen():
+        if message["type"] == "message":
+            return
+
+
+async def redis_single_flight(
+    lock_key: str,
+    compute: Callable[[], Awaitable[T]],
+    load: Callable[[], Awaitable[T | None]],
+    name: str,
+    timeout: int = 60,
+) -> T:
+    """
+    Coalesce a call across workers. The lock owner runs `compute`, which is
+    expected to store its result where `load` can read it. Other workers wait
+    for the owner to finish (at most `timeout` seconds) and return `load()`,
+    falling back to `compute` themselves if nothing was stored.
+    """
+    acquired, lock = await acquire_redis_lock(lock_key, timeout=timeout)
+    if acquired:
+        try:
+            return await compute()
+        finally:
+            await release_redis_lock(lock)
+            await REDIS_ASYNC_CLIENT.publish(lock_key, b"done")
+
+    singleflight_calls.labels(flight=name, role="remote_follower").inc()
+    pubsub = REDIS_ASYNC_CLIENT.pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(lock_key)
+        # The owner may have finished before we subscribed.
+        if await REDIS_ASYNC_CLIENT.exists(lock_key):
+            await asyncio.wait_for(_wait_for_message(pubsub), timeout)
+    except asyncio.TimeoutError:
+        logging.warning("Timed out waiting for %s owner", lock_key)
+    except Exception as e:
+        logging.error("Error waiting for %s owner: %s", lock_key, e)
+    finally:
+        await pubsub.aclose()
+
+    result = await load()
+    if result is None:
+        singleflight_calls.labels(flight=name, role="fallback").inc()
+        result = await compute()
+    return result
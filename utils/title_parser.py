@@ -0,0 +1,173 @@
+"""
+Memoized PTT title parsing.
+
+The same torrent names and filenames are parsed over and over by scrapers,
+pipelines and playback. Results are kept in a bounded per-process LRU and,
+with `ptt_redis_cache` enabled, in Redis so every process shares them.
+`parse_title` only uses the LRU and can be called from sync code;
+`parse_many` also uses Redis and parses large batches of misses in the
+torrent parsing process pool.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+
+import PTT
+from prometheus_client import Counter, Histogram
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+KEY_PREFIX = "ptt_parse:"
+
+ptt_parse_requests = Counter(
+    "ptt_parse_requests_total",
+    "PTT title parse requests, labeled by where the result came from",
+    labelnames=["result"],
+)
+ptt_parse_duration = Histogram(
+    "ptt_parse_seconds",
+    "Time spent parsing titles with PTT on cache misses",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+_parsed_titles: OrderedDict[tuple[str, bool], dict] = OrderedDict()
+
+
+def _copy(parsed: dict) -> dict:
+    # Callers mutate the returned lists, keep the cached ones intact
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in parsed.items()
+    }
+
+
+def _remember(title: str, translate_languages: bool, parsed: dict):
+    _parsed_titles[(title, translate_languages)] = parsed
+    _parsed_titles.move_to_end((title, translate_languages))
+    while len(_parsed_titles) > settings.ptt_cache_size:
+        _parsed_titles.popitem(last=False)
+
+
+def _parse(title: str, translate_languages: bool) -> dict:
+    start = time.perf_counter()
+    parsed = PTT.parse_title(title, translate_languages)
+    ptt_parse_duration.observe(time.perf_counter() - start)
+    return parsed
+
+
+def _parse_batch(titles: list[str], translate_languages: bool) -> list[dict]:
+    return [PTT.parse_title(title, translate_languages) for title in titles]
+
+
+def parse_title(title: str, translate_languages: bool = False) -> dict:
+    """PTT.parse_title backed by the in-process LRU."""
+    cache_key = (title, translate_languages)
+    if (parsed := _parsed_titles.get(cache_key)) is not None:
+        _parsed_titles.move_to_end(cache_key)
+        ptt_parse_requests.labels(result="hit").inc()
+        return _copy(parsed)
+
+    ptt_parse_requests.labels(result="miss").inc()
+    parsed = _parse(title, translate_languages)
+    _remember(title, translate_languages, parsed)
+    return _copy(parsed)
+
+
+def get_redis_key(title: str, translate_languages: bool) -> str:
+    return f"{KEY_PREFIX}{int(translate_languages)}:{title}"
+
+
+async def _get_from_redis(
+    titles: list[str], translate_languages: bool
+) -> dict[str, dict]:
+    try:
+        values = await REDIS_ASYNC_CLIENT.mget(
+            [get_redis_key(title, translate_languages) for title in titles]
+        )
+    except Exception as e:
+        logging.error(f"Error reading PTT parse cache: {e}")
+        return {}
+    return {title: json.loads(value) for title, value in zip(titles, values) if value}
+
+
+async def _store_in_redis(parsed_titles: dict[str, dict], translate_languages: bool):
+    try:
+        async with REDIS_ASYNC_CLIENT.pipeline(transaction=False) as pipe:
+            for title, parsed in parsed_titles.items():
+                pipe.set(
+                    get_redis_key(title, translate_languages),
+                    json.dumps(parsed),
+                    ex=settings.ptt_redis_cache_ttl,
+                )
+            await pipe.execute()
+    except Exception as e:
+        logging.error(f"Error writing PTT parse cache: {e}")
+
+
+async def _parse_misses(
+    titles: list[str], translate_languages: bool, use_pool: bool
+) -> list[dict]:
+    if (
+        not use_pool
+        or not settings.torrent_parse_workers
+        or len(titles) < settings.ptt_process_pool_threshold
+    ):
+        return [_parse(title, translate_languages) for title in titles]
+
+    from utils.torrent import get_parse_executor
+
+    start = time.perf_counter()
+    parsed = await asyncio.get_running_loop().run_in_executor(
+        get_parse_executor(), _parse_batch, titles, translate_languages
+    )
+    ptt_parse_duration.observe((time.perf_counter() - start) / len(titles))
+    return parsed
+
+
+async def parse_many(
+    titles: list[str], translate_languages: bool = False, use_pool: bool = True
+) -> list[dict]:
+    """
+    Parse a batch of titles, in order, through the LRU and Redis caches.
+    Large batches of misses go to the parse process pool unless `use_pool` is
+    off, as on request paths that shouldn't wait for the pool.
+    """
+    results: dict[str, dict] = {}
+    for title in titles:
+        if (parsed := _parsed_titles.get((title, translate_languages))) is not None:
+            _parsed_titles.move_to_end((title, translate_languages))
+            results[title] = parsed
+    ptt_parse_requests.labels(result="hit").inc(
+        sum(title in results for title in titles)
+    )
+
+    misses = list(dict.fromkeys(title for title in titles if title not in results))
+    if misses and settings.ptt_redis_cache:
+        found = await _get_from_redis(misses, translate_languages)
+        ptt_parse_requests.labels(result="redis_hit").inc(len(found))
+        for title, parsed in found.items():
+            _remember(title, translate_languages, parsed)
+        results.update(found)
+        misses = [title for title in misses if title not in found]
+
+    if misses:
+        ptt_parse_requests.labels(result="miss").inc(len(misses))
+        parsed_misses = dict(
+            zip(misses, await _parse_misses(misses, translate_languages, use_pool))
+        )
+        for title, parsed in parsed_misses.items():
+            _remember(title, translate_languages, parsed)
+        results.update(parsed_misses)
+        if settings.ptt_redis_cache:
+            await _store_in_redis(parsed_misses, translate_languages)
+
+    return [_copy(results[title]) for title in titles]
+
+
+async def parse_title_async(title: str, translate_languages: bool = False) -> dict:
+    """Parse a single title through the LRU and Redis caches."""
+    return (await parse_many([title], translate_languages))[0]
@@ -1,14 +1,15 @@
-import hashlib
+import asyncio
+import functools
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timezone
 from os.path import basename
-from typing import Awaitable, Iterable, AsyncIterator, Optional, TypeVar, OrderedDict
+from typing import Awaitable, Iterable, AsyncIterator, Optional, TypeVar
 from urllib.parse import quote
 
-import PTT
 import anyio
-import bencodepy
 import httpx
 from anyio import (
     create_task_group,
@@ -21,8 +22,10 @@ from torf import Magnet, MagnetError
 
 import utils.runtime_const
 from db.config import settings
+from utils.bencode import decode_torrent
 from utils.parser import is_contain_18_plus_keywords
 from utils.runtime_const import TRACKERS
+from utils.title_parser import parse_title
 from utils.validation_helper import is_video_file
 
 # remove logging from demagnetize
@@ -33,12 +36,8 @@ def extract_torrent_metadata(
     content: bytes, parsed_data: dict = None, is_raise_error: bool = False
 ) -> dict:
     try:
-        torrent_data: OrderedDict = bencodepy.decode(content)
+        torrent_data, info_hash = decode_torrent(content)
         info = torrent_data[b"info"]
-        info_encoded = bencodepy.encode(info)
-        m = hashlib.sha1()
-        m.update(info_encoded)
-        info_hash = m.hexdigest()
 
         # Extract file size, file list, and announce list
         files = info[b"files"] if b"files" in info else [info]
@@ -65,7 +64,7 @@ def extract_torrent_metadata(
         if parsed_data:
             metadata.update(parsed_data)
         else:
-            metadata.update(PTT.parse_title(torrent_name, True))
+            metadata.update(parse_title(torrent_name, True))
 
         if is_contain_18_plus_keywords(torrent_name):
             logging.warning(
@@ -94,7 +93,7 @@ def extract_torrent_metadata(
             if "sample" in filename.lower():
                 logging.warning(f"Skipping sample file: {filename}")
                 continue
-            episode_parsed_data = PTT.parse_title(filename)
+            episode_parsed_data = parse_title(filename)
             seasons.update(episode_parsed_data.get("seasons", []))
             episodes.update(episode_parsed_data.get("episodes", []))
             season_number = (
@@ -159,6 +158,34 @@ def extract_torrent_metadata(
         return {}
 
 
+_parse_executor: ProcessPoolExecutor | None = None
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    global _parse_executor
+    if _parse_executor is None:
+        # Spawned workers don't inherit the event loop or open connections
+        _parse_executor = ProcessPoolExecutor(
+            max_workers=settings.torrent_parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_executor
+
+
+async def extract_torrent_metadata_async(
+    content: bytes, parsed_data: dict = None, is_raise_error: bool = False
+) -> dict:
+    """Run extract_torrent_metadata in the torrent parsing process pool."""
+    if not settings.torrent_parse_workers:
+        return extract_torrent_metadata(content, parsed_data, is_raise_error)
+    return await asyncio.get_running_loop().run_in_executor(
+        get_parse_executor(),
+        functools.partial(
+            extract_torrent_metadata, content, parsed_data, is_raise_error
+        ),
+    )
+
+
 def convert_info_hash_to_magnet(info_hash: str, trackers: list[str]) -> str:
     magnet_link = f"magnet:?xt=urn:btih:{info_hash}"
     for tracker in set(trackers) or TRACKERS: